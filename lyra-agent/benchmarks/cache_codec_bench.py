@@ -0,0 +1,149 @@
+"""
+Micro-benchmark: cache entry encode/decode + model rehydration.
+
+Compares the original JSON path (json.dumps / json.loads + JiraTicket(**t)) with the
+compressed codec, which validates models straight from the stored JSON bytes
+(src.cache.codec.decode_models), on a synthetic release query result of tickets with
+long comment threads. Reference rows: decoding to dicts first and validating those
+(codec.rehydrate) and no-validation model_construct (rebuilding nested models in
+Python costs more than letting pydantic-core validate the whole list).
+
+Usage:
+    python -m benchmarks.cache_codec_bench [--tickets 300] [--comments 20] [--rounds 10]
+"""
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from pydantic import HttpUrl
+from src.cache import codec
+from src.schemas.data_models import JiraTicket, JiraComment
+
+
+WORDS = (
+    "release api config default migrate deprecate endpoint latency cache retry token "
+    "schema field customer upgrade rollback flag timeout pagination webhook auth index "
+    "agreed blocked review merged tested docs breaking change performance regression"
+).split()
+
+
+def sentence(rng: random.Random, n_words: int) -> str:
+    """Random prose so compression ratios stay realistic."""
+    return " ".join(rng.choice(WORDS) for _ in range(n_words)) + "."
+
+
+def make_tickets(n_tickets: int, n_comments: int) -> list:
+    """Build dumped tickets shaped like a release query result."""
+    rng = random.Random(42)
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    tickets = []
+    for i in range(n_tickets):
+        comments = [
+            JiraComment(
+                id=str(j),
+                author=f"Engineer {j % 7}",
+                body=sentence(rng, 60),
+                created=base + timedelta(hours=j),
+                updated=base + timedelta(hours=j, minutes=5)
+            )
+            for j in range(n_comments)
+        ]
+        ticket = JiraTicket(
+            id=str(10000 + i),
+            key=f"DEV-{i}",
+            summary=f"Feature {i}: improve release pipeline",
+            description=sentence(rng, 120),
+            status="Done",
+            priority="Major",
+            issue_type="Story",
+            assignee="Assignee",
+            reporter="Reporter",
+            created=base,
+            updated=base + timedelta(days=i % 30),
+            fix_versions=["v2.1"],
+            components=["core", "api"],
+            labels=["release-notes"],
+            comments=comments,
+            linked_issues=[f"DEV-{i + 1}"],
+            url=f"https://jira.example.com/browse/DEV-{i}"
+        )
+        tickets.append(ticket.model_dump(mode='json'))
+    return tickets
+
+
+def parse(value: Optional[str]) -> Optional[datetime]:
+    """Parse a dumped datetime."""
+    return datetime.fromisoformat(value.replace('Z', '+00:00')) if value else value
+
+
+def construct_ticket(data: dict) -> JiraTicket:
+    """Unvalidated rebuild of a dumped ticket (reference only)."""
+    values = dict(data)
+    values["comments"] = [
+        JiraComment.model_construct(**{**c, "created": parse(c["created"]), "updated": parse(c["updated"])})
+        for c in data["comments"]
+    ]
+    for name in ("created", "updated", "resolved"):
+        values[name] = parse(values[name])
+    values["url"] = HttpUrl(values["url"])
+    return JiraTicket.model_construct(**values)
+
+
+def bench(label: str, fn, rounds: int) -> float:
+    """Best-of-N wall time in milliseconds."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    print(f"  {label:<38} {best:9.2f} ms")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tickets", type=int, default=300)
+    parser.add_argument("--comments", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+    
+    data = make_tickets(args.tickets, args.comments)
+    json_blob = json.dumps(data).encode()
+    codec_blob = codec.encode(data)
+    
+    print(f"{args.tickets} tickets x {args.comments} comments (zstd={'yes' if codec.zstandard else 'no'})")
+    print(f"  size: json {len(json_blob) / 1024:.1f} KiB, codec {len(codec_blob) / 1024:.1f} KiB "
+          f"({len(codec_blob) / len(json_blob):.0%})")
+    
+    print("write")
+    bench("json.dumps", lambda: json.dumps(data).encode(), args.rounds)
+    bench("codec.encode", lambda: codec.encode(data), args.rounds)
+    
+    print("read")
+    old = bench(
+        "json.loads + JiraTicket(**t)",
+        lambda: [JiraTicket(**t) for t in json.loads(json_blob)],
+        args.rounds
+    )
+    new = bench(
+        "codec.decode_models",
+        lambda: codec.decode_models(codec_blob, JiraTicket),
+        args.rounds
+    )
+    bench(
+        "codec.decode + codec.rehydrate",
+        lambda: codec.rehydrate(JiraTicket, codec.decode(codec_blob)),
+        args.rounds
+    )
+    bench(
+        "codec.decode + model_construct",
+        lambda: [construct_ticket(t) for t in codec.decode(codec_blob)],
+        args.rounds
+    )
+    print(f"read speedup: {old / new:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
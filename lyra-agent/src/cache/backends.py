@@ -0,0 +1,624 @@
+"""
+Pluggable storage backends for the tool response cache.
+
+Two backends are available:
+- ``json``: one JSON file per key under ``<cache_dir>/<namespace>/`` (legacy layout)
+- ``sqlite``: a single WAL-mode SQLite file shared by all tools, with a size cap,
+  LRU eviction and bulk TTL purge. Safe to use from several threads and processes.
+  Values are stored in the compact binary format from ``src.cache.codec``.
+
+Every entry records the tool method that produced it and a set of tags (``ticket:DEV-1``,
+``repo:org/name``, ``release:v2.1``) so entries can be listed and invalidated selectively.
+"""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Optional, Any, Dict, Iterable, List, Type
+import atexit
+import fnmatch
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from pydantic import BaseModel
+from src.cache.codec import decode, decode_models, encode, rehydrate
+from src.config.settings import settings
+from src.utils.logger import logger
+from src.utils.sqlite import ThreadLocalSQLite
+
+
+@dataclass
+class CacheEntry:
+    """A single cached value with its write timestamp, stored size and metadata."""
+    data: Any
+    timestamp: float
+    size: int = 0
+    meta: Dict[str, Any] = field(default_factory=dict)
+    
+    def age(self) -> float:
+        """Seconds since the entry was written."""
+        return time.time() - self.timestamp
+    
+    def load(self, model: Optional[Type[BaseModel]] = None) -> Any:
+        """The cached value, built as model(s) when model is given."""
+        return self.data if model is None else rehydrate(model, self.data)
+
+
+class EncodedCacheEntry(CacheEntry):
+    """
+    Entry read as codec-encoded bytes.
+    
+    data is decoded on first access; load() builds models straight from the bytes.
+    """
+    
+    def __init__(self, encoded: bytes, timestamp: float, size: int = 0, meta: Optional[Dict[str, Any]] = None):
+        self.encoded = encoded
+        self.timestamp = timestamp
+        self.size = size
+        self.meta = meta if meta is not None else {}
+    
+    @cached_property
+    def data(self) -> Any:
+        return decode(self.encoded)
+    
+    def load(self, model: Optional[Type[BaseModel]] = None) -> Any:
+        return self.data if model is None else decode_models(self.encoded, model)
+
+
+@dataclass
+class EntryInfo:
+    """Metadata of a stored entry, as shown by `lyra cache ls`."""
+    namespace: str
+    key: str
+    method: str
+    size: int
+    created: float
+    hits: int = 0
+    tags: List[str] = field(default_factory=list)
+
+
+def method_from_key(key: str) -> str:
+    """Tool method encoded in a cache key ("<method>.<schema>.<digest>"); empty for legacy keys."""
+    return key.split(".", 1)[0] if "." in key else ""
+
+
+class CacheBackend(ABC):
+    """Storage interface used by BaseTool. Expiry policy is left to the caller."""
+    
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+    
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry for key, or None if absent."""
+        pass
+    
+    @abstractmethod
+    def set(
+        self,
+        key: str,
+        data: Any,
+        meta: Optional[Dict[str, Any]] = None,
+        tags: Optional[Iterable[str]] = None
+    ) -> int:
+        """Store data (with optional metadata and tags) under key. Returns the stored size in bytes."""
+        pass
+    
+    @abstractmethod
+    def delete(self, key: str):
+        """Remove key if present."""
+        pass
+    
+    @abstractmethod
+    def purge_expired(self, ttl: int) -> int:
+        """Delete all entries older than ttl seconds. Returns number removed."""
+        pass
+    
+    @abstractmethod
+    def clear(self) -> int:
+        """Delete all entries in this namespace. Returns number removed."""
+        pass
+    
+    @abstractmethod
+    def list_entries(
+        self,
+        method: Optional[str] = None,
+        tag: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[EntryInfo]:
+        """
+        List entries in this namespace, newest first.
+        
+        Args:
+            method: Only entries written by this tool method
+            tag: Only entries carrying a matching tag (shell-style wildcards allowed)
+            limit: Maximum number of entries
+        """
+        pass
+    
+    @abstractmethod
+    def purge(
+        self,
+        method: Optional[str] = None,
+        tag: Optional[str] = None,
+        older_than: Optional[float] = None
+    ) -> int:
+        """Delete entries matching all given filters (see list_entries). Returns number removed."""
+        pass
+    
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-method totals: method, entries, bytes, hits, oldest, newest."""
+        totals: Dict[str, Dict[str, Any]] = {}
+        for info in self.list_entries():
+            row = totals.setdefault(info.method, {
+                "method": info.method, "entries": 0, "bytes": 0, "hits": 0,
+                "oldest": info.created, "newest": info.created
+            })
+            row["entries"] += 1
+            row["bytes"] += info.size
+            row["hits"] += info.hits
+            row["oldest"] = min(row["oldest"], info.created)
+            row["newest"] = max(row["newest"], info.created)
+        return sorted(totals.values(), key=lambda row: row["method"])
+    
+    def record_lookup(self, method: str, hit: bool):
+        """Count a cache lookup for per-method hit ratios. No-op unless the backend persists them."""
+        pass
+    
+    def lookup_history(self, days: int = 7) -> List[Dict[str, Any]]:
+        """Daily lookup counters: day, method, hits, misses. Empty if not persisted."""
+        return []
+
+
+class JsonFileCacheBackend(CacheBackend):
+    """One JSON file per key. Kept for compatibility with existing cache trees."""
+    
+    def __init__(self, namespace: str, cache_dir: Optional[str] = None):
+        super().__init__(namespace)
+        self.cache_dir = Path(cache_dir or settings.cache_dir) / namespace
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+    
+    def get(self, key: str) -> Optional[CacheEntry]:
+        cache_file = self._path(key)
+        if not cache_file.exists():
+            return None
+        
+        with open(cache_file, 'r') as f:
+            cached = json.load(f)
+        return CacheEntry(
+            data=cached['data'],
+            timestamp=cached['timestamp'],
+            size=cache_file.stat().st_size,
+            meta=cached.get('meta', {})
+        )
+    
+    def set(
+        self,
+        key: str,
+        data: Any,
+        meta: Optional[Dict[str, Any]] = None,
+        tags: Optional[Iterable[str]] = None
+    ) -> int:
+        # Write to a temp file and rename so readers never see a partial entry
+        payload = json.dumps({
+            'timestamp': time.time(),
+            'data': data,
+            'meta': meta or {},
+            'method': method_from_key(key),
+            'tags': sorted(set(tags or ()))
+        })
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(payload)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        return len(payload)
+    
+    def delete(self, key: str):
+        self._path(key).unlink(missing_ok=True)
+    
+    def purge_expired(self, ttl: int) -> int:
+        cutoff = time.time() - ttl
+        removed = 0
+        for cache_file in self.cache_dir.glob("*.json"):
+            try:
+                with open(cache_file, 'r') as f:
+                    timestamp = json.load(f)['timestamp']
+                if timestamp < cutoff:
+                    cache_file.unlink(missing_ok=True)
+                    removed += 1
+            except Exception as e:
+                logger.warning(f"Removing unreadable cache file {cache_file.name}: {e}")
+                cache_file.unlink(missing_ok=True)
+                removed += 1
+        return removed
+    
+    def clear(self) -> int:
+        removed = 0
+        for cache_file in self.cache_dir.glob("*.json"):
+            cache_file.unlink(missing_ok=True)
+            removed += 1
+        return removed
+    
+    def _scan(self, method: Optional[str], tag: Optional[str], older_than: Optional[float]):
+        """Yield (path, EntryInfo) for readable entries matching the filters."""
+        for cache_file in self.cache_dir.glob("*.json"):
+            try:
+                with open(cache_file, 'r') as f:
+                    cached = json.load(f)
+            except Exception:
+                continue
+            info = EntryInfo(
+                namespace=self.namespace,
+                key=cache_file.stem,
+                method=cached.get('method', ''),
+                size=cache_file.stat().st_size,
+                created=cached['timestamp'],
+                tags=cached.get('tags', [])
+            )
+            if method is not None and info.method != method:
+                continue
+            if tag is not None and not any(fnmatch.fnmatchcase(t, tag) for t in info.tags):
+                continue
+            if older_than is not None and info.created >= older_than:
+                continue
+            yield cache_file, info
+    
+    def list_entries(
+        self,
+        method: Optional[str] = None,
+        tag: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[EntryInfo]:
+        # Per-entry hit counts would mean rewriting the file on every read, so they stay 0 here
+        entries = sorted(
+            (info for _, info in self._scan(method, tag, None)),
+            key=lambda info: info.created,
+            reverse=True
+        )
+        return entries[:limit] if limit else entries
+    
+    def purge(
+        self,
+        method: Optional[str] = None,
+        tag: Optional[str] = None,
+        older_than: Optional[float] = None
+    ) -> int:
+        removed = 0
+        for cache_file, _ in list(self._scan(method, tag, older_than)):
+            cache_file.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Single-file SQLite cache shared by all tools.
+    
+    Entries are namespaced per tool. The database runs in WAL mode so readers never
+    block the writer, and every thread (and process) gets its own connection.
+    When the total stored size exceeds ``max_size_bytes``, the least recently used
+    entries are evicted until the cache is back under ``EVICT_TARGET`` of the cap.
+    
+    Besides the entries it keeps their tags, a per-entry hit count and daily
+    lookup counters per tool method (buffered in memory and flushed in batches).
+    """
+    
+    DB_NAME = "cache.db"
+    EVICT_TARGET = 0.9
+    EVICT_CHECK_EVERY = 64  # writes between size checks
+    LOOKUP_FLUSH_EVERY = 100  # buffered lookups between counter flushes
+    
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS cache_entries (
+            namespace TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            created REAL NOT NULL,
+            accessed REAL NOT NULL,
+            meta TEXT NOT NULL DEFAULT '{}',
+            method TEXT NOT NULL DEFAULT '',
+            hits INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (namespace, key)
+        );
+        CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache_entries(accessed);
+        CREATE INDEX IF NOT EXISTS idx_cache_created ON cache_entries(created);
+        
+        CREATE TABLE IF NOT EXISTS cache_tags (
+            namespace TEXT NOT NULL,
+            key TEXT NOT NULL,
+            tag TEXT NOT NULL,
+            PRIMARY KEY (namespace, key, tag)
+        );
+        CREATE INDEX IF NOT EXISTS idx_cache_tags_tag ON cache_tags(tag);
+        
+        -- Covers DELETE, eviction and purge; INSERT OR REPLACE clears tags explicitly
+        CREATE TRIGGER IF NOT EXISTS cache_entries_drop_tags AFTER DELETE ON cache_entries
+        BEGIN
+            DELETE FROM cache_tags WHERE namespace = old.namespace AND key = old.key;
+        END;
+        
+        CREATE TABLE IF NOT EXISTS cache_lookups (
+            namespace TEXT NOT NULL,
+            method TEXT NOT NULL,
+            day TEXT NOT NULL,
+            hits INTEGER NOT NULL DEFAULT 0,
+            misses INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (namespace, method, day)
+        );
+    """
+    
+    def __init__(
+        self,
+        namespace: str,
+        db_path: Optional[str] = None,
+        max_size_bytes: Optional[int] = None
+    ):
+        super().__init__(namespace)
+        self.db_path = Path(db_path) if db_path else Path(settings.cache_dir) / self.DB_NAME
+        self.max_size_bytes = (
+            max_size_bytes if max_size_bytes is not None
+            else settings.cache_max_size_mb * 1024 * 1024
+        )
+        self._db = ThreadLocalSQLite(self.db_path, self._SCHEMA)
+        self._writes_since_check = 0
+        self._lookups_lock = threading.Lock()
+        self._lookups: Dict[tuple, List[int]] = {}
+        self._pending_lookups = 0
+        atexit.register(self.flush_lookups)
+    
+    def _conn(self) -> sqlite3.Connection:
+        """Return this thread's connection."""
+        return self._db.conn()
+    
+    def get(self, key: str) -> Optional[CacheEntry]:
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT value, created, size, meta FROM cache_entries "
+            "WHERE namespace = ? AND key = ?",
+            (self.namespace, key)
+        ).fetchone()
+        if row is None:
+            return None
+        
+        conn.execute(
+            "UPDATE cache_entries SET accessed = ?, hits = hits + 1 WHERE namespace = ? AND key = ?",
+            (time.time(), self.namespace, key)
+        )
+        return EncodedCacheEntry(row[0], timestamp=row[1], size=row[2], meta=json.loads(row[3]))
+    
+    def set(
+        self,
+        key: str,
+        data: Any,
+        meta: Optional[Dict[str, Any]] = None,
+        tags: Optional[Iterable[str]] = None
+    ) -> int:
+        value = encode(data)
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries "
+                "(namespace, key, value, size, created, accessed, meta, method) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.namespace, key, value, len(value), now, now,
+                 json.dumps(meta or {}), method_from_key(key))
+            )
+            conn.execute(
+                "DELETE FROM cache_tags WHERE namespace = ? AND key = ?", (self.namespace, key)
+            )
+            conn.executemany(
+                "INSERT INTO cache_tags (namespace, key, tag) VALUES (?, ?, ?)",
+                [(self.namespace, key, tag) for tag in sorted(set(tags or ()))]
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        
+        self._writes_since_check += 1
+        if self._writes_since_check >= self.EVICT_CHECK_EVERY:
+            self._writes_since_check = 0
+            self.evict()
+        return len(value)
+    
+    def delete(self, key: str):
+        self._conn().execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+            (self.namespace, key)
+        )
+    
+    def purge_expired(self, ttl: int) -> int:
+        return self.purge(older_than=time.time() - ttl)
+    
+    def clear(self) -> int:
+        return self.purge()
+    
+    def _where(
+        self,
+        method: Optional[str],
+        tag: Optional[str],
+        older_than: Optional[float]
+    ) -> tuple:
+        """WHERE clause and parameters for the list/purge filters."""
+        clauses, params = ["namespace = ?"], [self.namespace]
+        if method is not None:
+            clauses.append("method = ?")
+            params.append(method)
+        if tag is not None:
+            clauses.append(
+                "key IN (SELECT key FROM cache_tags WHERE namespace = ? AND tag GLOB ?)"
+            )
+            params.extend([self.namespace, tag])
+        if older_than is not None:
+            clauses.append("created < ?")
+            params.append(older_than)
+        return " AND ".join(clauses), params
+    
+    def list_entries(
+        self,
+        method: Optional[str] = None,
+        tag: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[EntryInfo]:
+        where, params = self._where(method, tag, None)
+        conn = self._conn()
+        rows = conn.execute(
+            f"SELECT key, method, size, created, hits FROM cache_entries WHERE {where} "
+            f"ORDER BY created DESC LIMIT ?",
+            (*params, limit or -1)
+        ).fetchall()
+        
+        tags: Dict[str, List[str]] = {}
+        if rows:
+            tag_rows = conn.execute(
+                f"SELECT key, tag FROM cache_tags WHERE namespace = ? AND key IN "
+                f"(SELECT key FROM cache_entries WHERE {where}) ORDER BY tag",
+                (self.namespace, *params)
+            )
+            for key, entry_tag in tag_rows:
+                tags.setdefault(key, []).append(entry_tag)
+        
+        return [
+            EntryInfo(
+                namespace=self.namespace, key=key, method=entry_method, size=size,
+                created=created, hits=hits, tags=tags.get(key, [])
+            )
+            for key, entry_method, size, created, hits in rows
+        ]
+    
+    def purge(
+        self,
+        method: Optional[str] = None,
+        tag: Optional[str] = None,
+        older_than: Optional[float] = None
+    ) -> int:
+        where, params = self._where(method, tag, older_than)
+        cursor = self._conn().execute(f"DELETE FROM cache_entries WHERE {where}", params)
+        return cursor.rowcount
+    
+    def stats(self) -> List[Dict[str, Any]]:
+        rows = self._conn().execute(
+            "SELECT method, COUNT(*), SUM(size), SUM(hits), MIN(created), MAX(created) "
+            "FROM cache_entries WHERE namespace = ? GROUP BY method ORDER BY method",
+            (self.namespace,)
+        )
+        return [
+            {"method": method, "entries": entries, "bytes": size, "hits": hits,
+             "oldest": oldest, "newest": newest}
+            for method, entries, size, hits, oldest, newest in rows
+        ]
+    
+    def record_lookup(self, method: str, hit: bool):
+        day = time.strftime("%Y-%m-%d")
+        with self._lookups_lock:
+            counts = self._lookups.setdefault((method, day), [0, 0])
+            counts[0 if hit else 1] += 1
+            self._pending_lookups += 1
+            flush = self._pending_lookups >= self.LOOKUP_FLUSH_EVERY
+        if flush:
+            self.flush_lookups()
+    
+    def flush_lookups(self):
+        """Write buffered lookup counters to the database."""
+        with self._lookups_lock:
+            pending, self._lookups = self._lookups, {}
+            self._pending_lookups = 0
+        if not pending:
+            return
+        
+        try:
+            self._conn().executemany(
+                "INSERT INTO cache_lookups (namespace, method, day, hits, misses) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (namespace, method, day) DO UPDATE SET "
+                "hits = hits + excluded.hits, misses = misses + excluded.misses",
+                [(self.namespace, method, day, hits, misses)
+                 for (method, day), (hits, misses) in pending.items()]
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Could not record cache lookup stats: {e}")
+    
+    def lookup_history(self, days: int = 7) -> List[Dict[str, Any]]:
+        self.flush_lookups()
+        since = time.strftime("%Y-%m-%d", time.localtime(time.time() - (days - 1) * 86400))
+        rows = self._conn().execute(
+            "SELECT day, method, hits, misses FROM cache_lookups "
+            "WHERE namespace = ? AND day >= ? ORDER BY day, method",
+            (self.namespace, since)
+        )
+        return [
+            {"day": day, "method": method, "hits": hits, "misses": misses}
+            for day, method, hits, misses in rows
+        ]
+    
+    def total_size(self) -> int:
+        """Total stored bytes across all namespaces."""
+        row = self._conn().execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()
+        return row[0]
+    
+    def evict(self) -> int:
+        """
+        Evict least recently used entries if the cache is over its size cap.
+        
+        Eviction is global: the cap applies to the whole file, not per namespace.
+        
+        Returns:
+            Number of entries removed
+        """
+        if not self.max_size_bytes or self.total_size() <= self.max_size_bytes:
+            return 0
+        
+        target = int(self.max_size_bytes * self.EVICT_TARGET)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Keep the most recently accessed entries whose running size fits the target
+            cursor = conn.execute("""
+                DELETE FROM cache_entries WHERE rowid IN (
+                    SELECT rowid FROM (
+                        SELECT rowid, SUM(size) OVER (
+                            ORDER BY accessed DESC, rowid DESC
+                        ) AS running
+                        FROM cache_entries
+                    ) WHERE running > ?
+                )
+            """, (target,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        
+        logger.debug(f"Evicted {cursor.rowcount} cache entries (cap {self.max_size_bytes} bytes)")
+        return cursor.rowcount
+
+
+def create_cache_backend(namespace: str, backend: Optional[str] = None) -> CacheBackend:
+    """
+    Build the configured cache backend for a namespace.
+    
+    Args:
+        namespace: Cache namespace (usually the tool class name)
+        backend: Override settings.cache_backend ("sqlite" or "json")
+    
+    Returns:
+        CacheBackend instance
+    """
+    backend = (backend or settings.cache_backend).lower()
+    if backend == "sqlite":
+        return SQLiteCacheBackend(namespace)
+    if backend == "json":
+        return JsonFileCacheBackend(namespace)
+    raise ValueError(f"Unknown cache backend: {backend}")
@@ -0,0 +1,173 @@
+"""
+Compact binary encoding for cache entries and fast model rehydration.
+
+Encoded values carry a 3-byte header (marker, serializer, compression) so the
+decoder knows how to read them. Values are written as compact JSON, so cached
+models can be validated straight from the stored bytes (decode_models, see
+benchmarks/cache_codec_bench.py), and compressed with zstandard when installed
+(``pip install lyra-agent[fast-cache]``) or else zlib from the standard library.
+"""
+from typing import Any, Dict, List, Optional, Type
+import hashlib
+import json
+import threading
+import zlib
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+MARKER = 0x01  # never the first byte of a JSON document
+COMPRESS_MIN_BYTES = 512
+
+_SER_JSON = ord("j")
+_COMP_NONE = ord("n")
+_COMP_ZLIB = ord("z")
+_COMP_ZSTD = ord("s")
+
+_zstd_local = threading.local()
+
+
+def _zstd() -> threading.local:
+    """Per-thread zstd compressor and decompressor (they are not thread-safe)."""
+    if not hasattr(_zstd_local, "c"):
+        _zstd_local.c = zstandard.ZstdCompressor(level=3)
+        _zstd_local.d = zstandard.ZstdDecompressor()
+    return _zstd_local
+
+
+def encode(data: Any) -> bytes:
+    """
+    Serialize to compact JSON and (for larger payloads) compress a JSON-compatible value.
+    
+    Args:
+        data: JSON-compatible value (dicts, lists, strings, numbers, None)
+    
+    Returns:
+        Encoded bytes with codec header
+    """
+    payload = json.dumps(data, separators=(",", ":")).encode()
+    
+    comp = _COMP_NONE
+    if len(payload) >= COMPRESS_MIN_BYTES:
+        if zstandard is not None:
+            comp, payload = _COMP_ZSTD, _zstd().c.compress(payload)
+        else:
+            comp, payload = _COMP_ZLIB, zlib.compress(payload, 6)
+    
+    return bytes((MARKER, _SER_JSON, comp)) + payload
+
+
+def decode(blob: bytes) -> Any:
+    """
+    Decode a value written by encode().
+    
+    Args:
+        blob: Encoded bytes
+    
+    Returns:
+        Decoded value
+    """
+    return json.loads(_payload(blob))
+
+
+def _payload(blob: bytes) -> bytes:
+    """Check the header of an encoded value and return its decompressed JSON payload."""
+    if blob[:1] != bytes((MARKER,)) or blob[1] != _SER_JSON:
+        raise ValueError("Not a value written by codec.encode()")
+    return _decompress(blob[2], blob[3:])
+
+
+def _decompress(comp: int, payload: bytes) -> bytes:
+    """Undo the compression recorded in the header."""
+    if comp == _COMP_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("Cache entry is zstd-compressed but zstandard is not installed")
+        return _zstd().d.decompress(payload)
+    if comp == _COMP_ZLIB:
+        return zlib.decompress(payload)
+    return payload
+
+
+# --- Rehydration -----------------------------------------------------------
+
+_LIST_ADAPTERS: Dict[type, TypeAdapter] = {}
+_SCHEMA_HASHES: Dict[type, str] = {}
+
+
+def schema_hash(model: Optional[Type[BaseModel]]) -> str:
+    """
+    Short fingerprint of a model's JSON schema, used to version cache keys.
+    
+    Adding, removing or retyping a field (including in nested models) changes the
+    hash; models whose schema is unchanged keep their cached entries across upgrades.
+    
+    Args:
+        model: Pydantic model class, or None for plain values
+    
+    Returns:
+        8-character hex digest ("raw" for None)
+    """
+    if model is None:
+        return "raw"
+    digest = _SCHEMA_HASHES.get(model)
+    if digest is None:
+        schema = json.dumps(model.model_json_schema(), sort_keys=True)
+        digest = hashlib.md5(schema.encode()).hexdigest()[:8]
+        _SCHEMA_HASHES[model] = digest
+    return digest
+
+
+def rehydrate(model: Type[BaseModel], data: Any) -> Any:
+    """
+    Build model(s) from cached model_dump(mode='json') output.
+    
+    Lists are validated in a single pydantic-core call through a cached TypeAdapter
+    instead of one Model(**d) call per item. This is faster than skipping validation
+    with model_construct, which has to rebuild nested models and datetimes in Python
+    (see benchmarks/cache_codec_bench.py). Stored entries are best read with
+    decode_models instead.
+    
+    Args:
+        model: Pydantic model class
+        data: A dumped model or list of dumped models
+    
+    Returns:
+        Model instance or list of instances
+    """
+    if isinstance(data, list):
+        return _list_adapter(model).validate_python(data)
+    return model.model_validate(data)
+
+
+def decode_models(blob: bytes, model: Type[BaseModel]) -> Any:
+    """
+    Decode a value written by encode() straight into model(s).
+    
+    The payload is parsed and validated from the raw bytes in one pydantic-core
+    call (validate_json), without building the intermediate dicts that
+    decode() + rehydrate() go through.
+    
+    Args:
+        blob: Encoded bytes of a dumped model or list of dumped models
+        model: Pydantic model class
+    
+    Returns:
+        Model instance or list of instances
+    """
+    payload = _payload(blob)
+    if payload[:1] == b"[":
+        return _list_adapter(model).validate_json(payload)
+    return model.model_validate_json(payload)
+
+
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """Cached TypeAdapter for List[model]."""
+    adapter = _LIST_ADAPTERS.get(model)
+    if adapter is None:
+        adapter = TypeAdapter(List[model])
+        _LIST_ADAPTERS[model] = adapter
+    return adapter
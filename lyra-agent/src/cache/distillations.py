@@ -0,0 +1,56 @@
+"""
+Content-addressed cache of LLM distillations.
+
+A verdict is stored under a hash of the model name, the prompt template version
+and the exact prompt, so an unchanged ticket or PR reuses its previous verdict and
+any change to its data, the template or the model is a miss. Entries never go
+stale; `lyra cache purge --tool=distill` drops them.
+"""
+from typing import Any, Dict, Iterable, Optional
+import hashlib
+from src.cache.backends import CacheBackend, create_cache_backend, method_from_key
+from src.config.settings import settings
+from src.utils.logger import logger
+
+
+class DistillationCache:
+    """Persistent JSON verdicts keyed by (kind, prompt version, model, prompt)."""
+    
+    def __init__(self, namespace: str = "distillations", backend: Optional[CacheBackend] = None):
+        self.backend = backend or create_cache_backend(namespace)
+    
+    @staticmethod
+    def key(kind: str, prompt_version: str, model: str, prompt: str) -> str:
+        """
+        Cache key of a distillation.
+        
+        Keys look like "<kind>.<prompt version>.<digest>", so `lyra cache stats`
+        groups them per kind.
+        """
+        digest = hashlib.sha256(f"{model}\0{prompt_version}\0{prompt}".encode()).hexdigest()
+        return f"{kind}.v{prompt_version}.{digest}"
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached verdict for key, or None."""
+        if not settings.distill_cache_enabled:
+            return None
+        try:
+            entry = self.backend.get(key)
+            self.backend.record_lookup(method_from_key(key), hit=entry is not None)
+        except Exception as e:
+            logger.warning(f"Distillation cache read error: {e}")
+            return None
+        return dict(entry.data) if entry is not None else None
+    
+    def set(self, key: str, verdict: Dict[str, Any], tags: Iterable[str] = ()):
+        """Store a verdict under key."""
+        if not settings.distill_cache_enabled:
+            return
+        try:
+            self.backend.set(key, verdict, tags=tags)
+        except Exception as e:
+            logger.warning(f"Distillation cache write error: {e}")
+
+
+# Global instance
+distillation_cache = DistillationCache()
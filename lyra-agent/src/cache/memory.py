@@ -0,0 +1,110 @@
+"""
+Bounded in-process L1 cache.
+
+Holds already-built objects (pydantic models, lists of models) so repeated lookups
+within one run skip both disk I/O and model validation.
+"""
+from collections import OrderedDict
+from typing import Optional, Any, Dict, Tuple
+import threading
+import time
+
+
+class MemoryCache:
+    """
+    Thread-safe LRU cache with per-entry expiry and entry/byte limits.
+    
+    Sizes are supplied by the caller (normally the encoded size of the disk entry),
+    so the byte limit is an estimate of payload size rather than Python heap usage.
+    """
+    
+    def __init__(self, max_entries: int = 2048, max_bytes: int = 64 * 1024 * 1024, ttl: int = 600):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: str, default: Any = None) -> Optional[Any]:
+        """Return the cached object, or default on miss or expiry (so None can be cached)."""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            
+            value, expires_at, _ = item
+            if time.time() >= expires_at:
+                self._remove(key)
+                self.misses += 1
+                return default
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key: str, value: Any, size: int = 0, expires_at: Optional[float] = None):
+        """
+        Store an object.
+        
+        Args:
+            key: Cache key
+            value: Object to hold (stored by reference)
+            size: Approximate payload size in bytes
+            expires_at: Absolute expiry; capped at now + ttl
+        """
+        deadline = time.time() + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        
+        if size > self.max_bytes:
+            return
+        
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, deadline, size)
+            self._bytes += size
+            
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+    
+    def delete(self, key: str):
+        """Drop key if present."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+    
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def _remove(self, key: str):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+    
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from memory."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of cache counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hit_rate, 3),
+            }
@@ -0,0 +1,63 @@
+"""
+Single-flight request coalescing.
+
+Concurrent calls that share a key are collapsed into one: the first caller runs the
+function and every other in-flight caller with the same key waits for its result.
+"""
+from typing import Any, Callable, Dict
+import threading
+
+
+class _Call:
+    """An in-flight call shared by its waiters."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class SingleFlight:
+    """Coalesce duplicate concurrent calls across threads."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.coalesced = 0
+    
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn once for all concurrent callers with the same key.
+        
+        Args:
+            key: Deduplication key
+            fn: Zero-argument function to run
+        
+        Returns:
+            fn's result (shared by all waiters). Exceptions propagate to every waiter.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                self.coalesced += 1
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
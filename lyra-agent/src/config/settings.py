@@ -3,7 +3,7 @@ Configuration management using Pydantic Settings.
 Loads from .env file and environment variables.
 """
 from typing import Optional, List
-from pydantic import Field
+from pydantic import AliasChoices, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -69,12 +69,107 @@ class Settings(BaseSettings):
     enable_cache: bool = Field(default=True, description="Enable API caching")
     cache_ttl: int = Field(default=3600, description="Cache TTL in seconds")
     
+    # Cache Storage Configuration
+    cache_backend: str = Field(default="sqlite", description="Cache backend: sqlite or json")
+    cache_dir: str = Field(default="./data/cache", description="Cache storage directory")
+    cache_max_size_mb: int = Field(default=512, description="Max SQLite cache size in MB")
+    memory_cache_enabled: bool = Field(default=True, description="Enable in-process L1 cache")
+    memory_cache_max_entries: int = Field(default=2048, description="Max L1 cache entries")
+    memory_cache_max_mb: int = Field(default=64, description="Max L1 cache payload size in MB")
+    memory_cache_ttl: int = Field(default=600, description="L1 cache TTL in seconds")
+    cache_stale_while_revalidate: bool = Field(
+        default=False, description="Serve expired entries while refreshing them in the background"
+    )
+    cache_max_stale: int = Field(default=86400, description="Max seconds past TTL an entry is served")
+    cache_refresh_workers: int = Field(default=4, description="Background cache refresh threads")
+    cache_negative_ttl: int = Field(default=900, description="TTL in seconds for cached 404s")
+    warm_max_workers: int = Field(default=8, description="Parallel requests for `lyra cache warm`")
+    
+    # HTTP Connection Pools
+    http_pool_size: int = Field(
+        default=32, description="Pooled keep-alive connections per API host, shared by all threads"
+    )
+    
+    # Release Knowledge Pipeline
+    distill_api_workers: int = Field(default=8, description="Concurrent Jira/GitHub calls while distilling a release")
+    distill_llm_workers: int = Field(default=4, description="Concurrent LLM calls while distilling a release")
+    distill_cache_enabled: bool = Field(
+        default=True, description="Reuse LLM verdicts for tickets/PRs whose prompt input is unchanged"
+    )
+    
+    # Jira Search Configuration
+    jira_page_size: int = Field(default=100, description="Tickets per Jira search request")
+    jira_page_workers: int = Field(default=4, description="Jira search pages fetched in parallel")
+    jira_key_batch_size: int = Field(default=100, description="Ticket keys per batched 'key in (...)' search")
+    jira_comment_page_size: int = Field(default=100, description="Comments per Jira comment request")
+    jira_comment_workers: int = Field(default=8, description="Tickets whose comments are loaded in parallel")
+    
+    # GitHub Fan-out Configuration
+    github_max_workers: int = Field(default=8, description="Parallel repo requests for GitHub searches")
+    github_repo_timeout: float = Field(default=30.0, description="Per-repo timeout in seconds for searches")
+    github_graphql_batch_size: int = Field(default=25, description="PRs per GraphQL request in bulk PR fetches")
+    
+    # GitHub Rate Limit Configuration
+    github_rate_burst: int = Field(default=10, description="Requests sent back-to-back before pacing kicks in")
+    github_background_reserve: float = Field(
+        default=0.2, description="Share of the rate limit kept for interactive calls (warm/sync wait)"
+    )
+    github_max_rate_wait: int = Field(
+        default=3600, description="Max seconds to sleep for a rate limit reset before failing"
+    )
+    
+    # PR Diff Configuration
+    pr_diff_max_files: int = Field(default=300, description="Files inspected per PR diff")
+    pr_diff_max_bytes: int = Field(default=512_000, description="Patch bytes read per PR diff")
+    pr_diff_max_hunk_bytes: int = Field(default=4000, description="Max bytes kept per public-API patch")
+    public_api_patterns: str = Field(
+        default="*/api/*,api/*,*.proto,*.graphql,*openapi*,*swagger*,*.d.ts,*/public/*,*__init__.py",
+        description="Comma-separated globs of public-API files whose patches PR diffs keep"
+    )
+    
+    # Local Git Mirror Configuration
+    git_mirror_enabled: bool = Field(
+        default=False, description="Answer file content/existence checks from local bare git mirrors"
+    )
+    git_mirror_dir: str = Field(default="./data/mirrors", description="Git mirror directory")
+    git_mirror_url: str = Field(
+        default="https://github.com/{repo}.git", description="Clone URL template, {repo} is owner/name"
+    )
+    git_mirror_fetch_interval: int = Field(default=900, description="Seconds before a mirror is fetched again")
+    git_mirror_timeout: int = Field(default=600, description="Timeout in seconds for git clone/fetch")
+    
+    # Local Index Configuration
+    index_dir: str = Field(default="./data/index", description="Local PR/ticket index directory")
+    pr_index_enabled: bool = Field(default=True, description="Answer PR searches from the local PR index")
+    pr_index_sync_interval: int = Field(
+        default=900, description="Seconds before a PR search triggers an incremental index sync"
+    )
+    jira_index_enabled: bool = Field(
+        default=False, description="Answer Jira searches on project_key from the local Jira mirror"
+    )
+    jira_index_sync_interval: int = Field(
+        default=900, description="Seconds before a Jira search triggers an incremental mirror sync"
+    )
+    jira_index_sync_overlap: int = Field(
+        default=300, description="Seconds re-fetched before the last sync, for clock skew between us and Jira"
+    )
+    offline: bool = Field(
+        default=False,
+        validation_alias=AliasChoices("lyra_offline", "offline"),
+        description="Serve Jira/GitHub data from cache only (LYRA_OFFLINE=1)"
+    )
+    
     # Computed Properties
     @property
     def github_repo_list(self) -> List[str]:
         """Parse GitHub repos from comma-separated string."""
         return [repo.strip() for repo in self.github_repos.split(",")]
     
+    @property
+    def public_api_pattern_list(self) -> List[str]:
+        """Parse public-API globs from comma-separated string."""
+        return [pattern.strip() for pattern in self.public_api_patterns.split(",") if pattern.strip()]
+    
     @property
     def slack_channel_list(self) -> List[str]:
         """Parse Slack channels from comma-separated string."""
@@ -1,22 +1,53 @@
 """
 Lyra CLI - Sprint 1 version (create release-notes only).
 """
+import time
+from typing import Dict, Optional
 import typer
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, MofNCompleteColumn
 from rich.panel import Panel
+from rich.table import Table
 
 from src.operations.doc_creator import doc_creator
+from src.operations.cache_warmer import cache_warmer
+from src.cache.backends import CacheBackend, create_cache_backend
+from src.services.git_mirror import git_mirror
+from src.services.jira_index import jira_index
+from src.services.pr_index import pr_index
+from src.tools.github_tool import github_tool
+from src.tools.jira_tool import jira_tool
 from src.config.settings import settings
 from src.utils.logger import logger
+from src.utils.rate_limit import github_scheduler
 
 app = typer.Typer(
     name="lyra",
     help="Lyra - Autonomous Documentation Agent (Sprint 1)",
     add_completion=False
 )
+cache_app = typer.Typer(help="Manage the Jira/GitHub tool cache")
+app.add_typer(cache_app, name="cache")
+sync_app = typer.Typer(help="Sync local indexes of Jira/GitHub data")
+app.add_typer(sync_app, name="sync")
 console = Console()
 
+# `--tool` names mapped to the cache namespace each tool writes to
+CACHE_TOOLS = {"jira": "jiratool", "github": "githubtool", "distill": "distillations"}
+
+
+@app.callback()
+def main(
+    offline: bool = typer.Option(
+        settings.offline, "--offline", envvar="LYRA_OFFLINE",
+        help="Serve Jira/GitHub data from cache only; fail on cache misses"
+    ),
+):
+    """Lyra - Autonomous Documentation Agent."""
+    settings.offline = offline
+    if offline:
+        logger.info("Offline mode: Jira and GitHub data served from cache only")
+
 
 @app.command()
 def create_release_notes(
@@ -59,13 +90,301 @@ def create_release_notes(
         for line in lines:
             console.print(f"  {line}")
         console.print("  [dim]...[/dim]")
-        
+    
     except Exception as e:
         console.print(f"\n[red]✗ Failed to create release notes: {e}[/red]")
         logger.exception("Release notes creation failed")
         raise typer.Exit(1)
 
 
+@cache_app.command("warm")
+def cache_warm(
+    version: str = typer.Argument(..., help="Release version to prefetch (e.g., v2.1)"),
+    workers: int = typer.Option(settings.warm_max_workers, help="Parallel requests"),
+):
+    """
+    Prefetch a release into the tool caches so `create-release-notes` reads from cache.
+    
+    Example:
+        lyra cache warm v2.1 --workers=8
+    """
+    cache_warmer.max_workers = workers
+    
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        console=console
+    ) as progress:
+        tasks = {}
+        
+        def on_progress(stage: str, done: int, total: int):
+            if stage not in tasks:
+                tasks[stage] = progress.add_task(f"Warming {stage}...", total=total)
+            progress.update(tasks[stage], completed=done, total=total)
+        
+        report = cache_warmer.warm_release(version, on_progress)
+    
+    console.print(
+        f"\n[green]✓ Cached {report.tickets} tickets, {report.linked_tickets} linked tickets "
+        f"and {report.prs} PRs in {report.duration:.1f}s[/green]"
+    )
+    _print_quota(report.api_quota)
+    if report.errors:
+        console.print(f"[yellow]{len(report.errors)} item(s) failed:[/yellow]")
+        for error in report.errors[:10]:
+            console.print(f"  [dim]{error}[/dim]")
+        raise typer.Exit(1)
+
+
+def _cache_backends(tool: Optional[str]) -> Dict[str, CacheBackend]:
+    """Cache backends for one tool (or all), keyed by tool name."""
+    if tool is not None and tool not in CACHE_TOOLS:
+        console.print(f"[red]Unknown tool '{tool}'. Choose from: {', '.join(CACHE_TOOLS)}[/red]")
+        raise typer.Exit(1)
+    names = [tool] if tool else list(CACHE_TOOLS)
+    return {name: create_cache_backend(CACHE_TOOLS[name]) for name in names}
+
+
+def _print_quota(quota: dict):
+    """Print GitHub API quota used by this run."""
+    for name, q in quota.get("resources", {}).items():
+        console.print(
+            f"[dim]GitHub {name} quota: {q['used']} used, {q['remaining']}/{q['limit']} left, "
+            f"resets in {q['reset_in_s'] // 60}m[/dim]"
+        )
+    if quota.get("throttled_s") or quota.get("rate_limited"):
+        console.print(
+            f"[dim]Throttled {quota['throttled_s']:.1f}s, {quota['rate_limited']} rate-limited response(s)[/dim]"
+        )
+
+
+def _format_size(size: int) -> str:
+    """Human-readable byte count."""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def _format_age(timestamp: float) -> str:
+    """Age of a timestamp as 45s / 12m / 3h / 2d."""
+    age = time.time() - timestamp
+    for unit, seconds in (("d", 86400), ("h", 3600), ("m", 60)):
+        if age >= seconds:
+            return f"{age / seconds:.0f}{unit}"
+    return f"{age:.0f}s"
+
+
+@cache_app.command("stats")
+def cache_stats(
+    tool: Optional[str] = typer.Option(None, help="Only this tool (jira, github, distill)"),
+    days: int = typer.Option(7, help="Days of hit-ratio history to show"),
+):
+    """
+    Show cache size and hit ratio per tool method.
+    
+    Example:
+        lyra cache stats --tool=jira --days=14
+    """
+    backends = _cache_backends(tool)
+    
+    table = Table(title="Cache contents")
+    for column in ("Tool", "Method", "Entries", "Size", "Disk hits", "Oldest", "Newest"):
+        table.add_column(column, justify="left" if column in ("Tool", "Method") else "right")
+    total_entries = total_bytes = 0
+    for name, backend in backends.items():
+        for row in backend.stats():
+            table.add_row(
+                name, row["method"] or "(legacy)", str(row["entries"]), _format_size(row["bytes"]),
+                str(row["hits"]), _format_age(row["oldest"]), _format_age(row["newest"])
+            )
+            total_entries += row["entries"]
+            total_bytes += row["bytes"]
+    console.print(table)
+    console.print(f"[dim]{total_entries} entries, {_format_size(total_bytes)} in {settings.cache_dir}[/dim]\n")
+    
+    history = Table(title=f"Hit ratio, last {days} days")
+    for column in ("Day", "Tool", "Method", "Hits", "Misses", "Hit ratio"):
+        history.add_column(column, justify="right" if column in ("Hits", "Misses", "Hit ratio") else "left")
+    for name, backend in backends.items():
+        for row in backend.lookup_history(days):
+            lookups = row["hits"] + row["misses"]
+            history.add_row(
+                row["day"], name, row["method"] or "(legacy)", str(row["hits"]), str(row["misses"]),
+                f"{row['hits'] / lookups:.0%}" if lookups else "-"
+            )
+    if history.row_count:
+        console.print(history)
+    else:
+        console.print("[dim]No lookup history recorded yet[/dim]")
+
+
+@cache_app.command("ls")
+def cache_ls(
+    tool: Optional[str] = typer.Option(None, help="Only this tool (jira, github, distill)"),
+    method: Optional[str] = typer.Option(None, help="Only entries written by this method (e.g. get_ticket_details)"),
+    tag: Optional[str] = typer.Option(None, help="Only entries with this tag, wildcards allowed (e.g. 'release:v2.1')"),
+    limit: int = typer.Option(50, help="Maximum entries to list"),
+):
+    """
+    List cache entries with their tags.
+    
+    Example:
+        lyra cache ls --tag='repo:your-org/developerhub'
+    """
+    table = Table()
+    for column in ("Tool", "Method", "Key", "Size", "Age", "Hits", "Tags"):
+        table.add_column(column, justify="right" if column in ("Size", "Age", "Hits") else "left")
+    
+    shown = 0
+    for name, backend in _cache_backends(tool).items():
+        for info in backend.list_entries(method=method, tag=tag, limit=limit - shown):
+            tags = info.tags
+            table.add_row(
+                name, info.method or "(legacy)", info.key[-12:], _format_size(info.size),
+                _format_age(info.created), str(info.hits),
+                ", ".join(tags[:4]) + (f" (+{len(tags) - 4})" if len(tags) > 4 else "")
+            )
+            shown += 1
+        if shown >= limit:
+            break
+    
+    if shown:
+        console.print(table)
+    else:
+        console.print("[dim]No matching cache entries[/dim]")
+
+
+@cache_app.command("purge")
+def cache_purge(
+    tool: Optional[str] = typer.Option(None, help="Only this tool (jira, github, distill)"),
+    method: Optional[str] = typer.Option(None, help="Only entries written by this method"),
+    tag: Optional[str] = typer.Option(None, help="Only entries with this tag, wildcards allowed"),
+    expired: bool = typer.Option(False, "--expired", help="Only entries too old to be served"),
+    all_entries: bool = typer.Option(False, "--all", help="Purge everything matching --tool (or all tools)"),
+):
+    """
+    Delete cache entries selectively, e.g. one release or one repo after a data fix.
+    
+    Example:
+        lyra cache purge --tag='release:v2.1'
+        lyra cache purge --tool=github --tag='repo:your-org/developerhub'
+    """
+    if not (tool or method or tag or expired or all_entries):
+        console.print("[red]Refusing to purge everything: pass a filter or --all[/red]")
+        raise typer.Exit(1)
+    
+    older_than = None
+    if expired:
+        max_age = settings.cache_ttl
+        if settings.cache_stale_while_revalidate:
+            max_age += settings.cache_max_stale
+        older_than = time.time() - max_age
+    
+    removed = 0
+    for name, backend in _cache_backends(tool).items():
+        if expired and name == "distill":
+            # Content-addressed: distillations never go stale
+            continue
+        count = backend.purge(method=method, tag=tag, older_than=older_than)
+        if count:
+            console.print(f"[dim]{name}: {count} entries[/dim]")
+        removed += count
+    console.print(f"[green]✓ Purged {removed} cache entries[/green]")
+
+
+@sync_app.command("github")
+def sync_github(
+    repo: Optional[str] = typer.Option(None, help="Only this repository (owner/name)"),
+    full: bool = typer.Option(False, "--full", help="Re-fetch the full PR history"),
+):
+    """
+    Sync the local PR index used by PR searches (incremental by updated_at).
+    
+    Example:
+        lyra sync github --repo=your-org/developerhub
+    """
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console
+    ) as progress:
+        progress.add_task("Syncing pull requests...", total=None)
+        fetched, errors = github_tool.sync_pr_index(repo, full=full)
+    
+    indexed = pr_index.stats()
+    timings = github_tool.repo_timings()
+    for name, count in fetched.items():
+        console.print(
+            f"[green]✓ {name}: {count} PRs fetched, {indexed.get(name, 0)} indexed "
+            f"in {timings.get(name, {}).get('max_s', 0):.1f}s[/green]"
+        )
+    for name, error in errors.items():
+        console.print(f"[red]✗ {name}: {error}[/red]")
+    _print_quota(github_scheduler.report())
+    if errors:
+        raise typer.Exit(1)
+
+
+@sync_app.command("jira")
+def sync_jira(
+    full: bool = typer.Option(False, "--full", help="Re-fetch every issue of the project"),
+):
+    """
+    Sync the local Jira mirror used by ticket searches (incremental by updated).
+    
+    Example:
+        lyra sync jira
+    """
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console
+    ) as progress:
+        progress.add_task(f"Syncing {settings.project_key} issues...", total=None)
+        try:
+            fetched = jira_tool.sync_jira_index(full=full)
+        except Exception as e:
+            console.print(f"[red]✗ {settings.project_key}: {e}[/red]")
+            raise typer.Exit(1)
+    
+    mirrored = jira_index.stats().get(settings.project_key.upper(), 0)
+    console.print(f"[green]✓ {settings.project_key}: {fetched} issues fetched, {mirrored} mirrored[/green]")
+    if not settings.jira_index_enabled:
+        console.print("[yellow]Searches use the mirror only with JIRA_INDEX_ENABLED=true[/yellow]")
+
+
+@sync_app.command("git")
+def sync_git(
+    repo: Optional[str] = typer.Option(None, help="Only this repository (owner/name)"),
+):
+    """
+    Clone or fetch the local git mirrors used for file checks (git_mirror_enabled).
+    
+    Example:
+        lyra sync git --repo=your-org/developerhub
+    """
+    repos = [repo] if repo else settings.github_repo_list
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console
+    ) as progress:
+        progress.add_task("Fetching git mirrors...", total=None)
+        errors = git_mirror.sync(repos)
+    
+    for name in repos:
+        if name in errors:
+            console.print(f"[red]✗ {name}: {errors[name]}[/red]")
+        else:
+            console.print(f"[green]✓ {name}: {git_mirror.path(name)}[/green]")
+    if errors:
+        raise typer.Exit(1)
+
+
 @app.command()
 def version():
     """Show Lyra version."""
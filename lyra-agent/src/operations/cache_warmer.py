@@ -0,0 +1,161 @@
+"""
+Cache warmer - prefetches everything a release run reads into the tool caches.
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+import contextvars
+import time
+from src.config.settings import settings
+from src.schemas.data_models import GitHubPR
+from src.tools.jira_tool import jira_tool
+from src.tools.github_tool import github_tool, repo_from_pr_url
+from src.utils.logger import logger
+from src.utils.rate_limit import BACKGROUND, github_scheduler, request_priority
+
+
+ProgressCallback = Callable[[str, int, int], None]
+
+
+@dataclass
+class WarmReport:
+    """Summary of a cache warm run."""
+    release_version: str
+    tickets: int = 0
+    linked_tickets: int = 0
+    prs: int = 0
+    errors: List[str] = field(default_factory=list)
+    duration: float = 0.0
+    api_quota: dict = field(default_factory=dict)
+
+
+class CacheWarmer:
+    """Prefetches release data into the Jira and GitHub tool caches."""
+    
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or settings.warm_max_workers
+    
+    def warm_release(
+        self,
+        release_version: str,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> WarmReport:
+        """
+        Prefetch a release: tickets, ticket details with comments, linked issues,
+        PRs per ticket, PR details with file lists and PR diffs.
+        
+        Runs at background request priority, so it never starves interactive
+        GitHub calls of rate-limit quota.
+        
+        Args:
+            release_version: Release version (e.g., "v2.1")
+            on_progress: Called as on_progress(stage, done, total)
+        
+        Returns:
+            WarmReport
+        """
+        with request_priority(BACKGROUND):
+            return self._warm_release(release_version, on_progress)
+    
+    def _warm_release(
+        self,
+        release_version: str,
+        on_progress: Optional[ProgressCallback]
+    ) -> WarmReport:
+        start = time.time()
+        report = WarmReport(release_version=release_version)
+        progress = on_progress or (lambda stage, done, total: None)
+        
+        progress("release query", 0, 1)
+        tickets = jira_tool.get_tickets_for_release(release_version)
+        report.tickets = len(tickets)
+        progress("release query", 1, 1)
+        logger.info(f"Warming cache for {release_version}: {len(tickets)} tickets")
+        
+        # Stage 1: per-ticket details, then all comments in one concurrent bulk load
+        self._run_parallel(
+            "tickets",
+            [ticket.key for ticket in tickets],
+            jira_tool.get_ticket_details,
+            progress,
+            report
+        )
+        progress("comments", 0, 1)
+        try:
+            jira_tool.load_comments(ticket.key for ticket in tickets)
+        except Exception as e:
+            report.errors.append(f"comments: {e}")
+            logger.warning(f"Cache warm comment load failed: {e}")
+        progress("comments", 1, 1)
+        
+        # Linked tickets of the whole release, in batched searches
+        progress("linked tickets", 0, 1)
+        try:
+            crawled = jira_tool.crawl_links([t.key for t in tickets], depth=1, max_nodes=None)
+            report.linked_tickets = len({t.key for t in crawled} - {t.key for t in tickets})
+        except Exception as e:
+            report.errors.append(f"linked tickets: {e}")
+            logger.warning(f"Cache warm link crawl failed: {e}")
+        progress("linked tickets", 1, 1)
+        
+        # PRs of the whole release in one lookup
+        progress("PR lookup", 0, 1)
+        prs: Dict[Tuple[str, int], GitHubPR] = {}
+        try:
+            for ticket_prs in github_tool.find_prs_for_tickets([t.key for t in tickets]).values():
+                for pr in ticket_prs:
+                    prs[(repo_from_pr_url(pr.url), pr.number)] = pr
+        except Exception as e:
+            report.errors.append(f"PR lookup: {e}")
+            logger.warning(f"Cache warm PR lookup failed: {e}")
+        progress("PR lookup", 1, 1)
+        
+        # Stage 2: PR details (files, merge info), batched GraphQL requests
+        refs = list(prs)
+        batch_size = settings.github_graphql_batch_size
+        self._run_parallel(
+            "PR batches",
+            [refs[i:i + batch_size] for i in range(0, len(refs), batch_size)],
+            github_tool.get_pr_details_many,
+            progress,
+            report
+        )
+        # PR diffs, which PR impacts are distilled from (with diff_summary only as a fallback)
+        self._run_parallel(
+            "PR diffs",
+            refs,
+            lambda ref: github_tool.get_pr_diff(*ref),
+            progress,
+            report
+        )
+        report.prs = len(prs)
+        
+        report.duration = time.time() - start
+        report.api_quota = github_scheduler.report()
+        logger.info(
+            f"Cache warm for {release_version} finished in {report.duration:.1f}s: "
+            f"{report.tickets} tickets, {report.linked_tickets} linked, {report.prs} PRs, "
+            f"{len(report.errors)} errors"
+        )
+        return report
+    
+    def _run_parallel(self, stage: str, items: list, fn, progress: ProgressCallback, report: WarmReport) -> list:
+        """Run fn over items with bounded parallelism, collecting errors instead of failing."""
+        results = []
+        done = 0
+        progress(stage, 0, len(items))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(contextvars.copy_context().run, fn, item): item for item in items}
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    report.errors.append(f"{stage} {futures[future]}: {e}")
+                    logger.warning(f"Cache warm failed for {stage} {futures[future]}: {e}")
+                done += 1
+                progress(stage, done, len(items))
+        return results
+
+
+# Global instance
+cache_warmer = CacheWarmer()
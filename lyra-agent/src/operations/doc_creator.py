@@ -5,8 +5,11 @@ from pathlib import Path
 from src.agents.controller import create_lyra_agent
 from src.schemas.data_models import DocDraft
 from src.config.settings import settings
+from src.tools.jira_tool import jira_tool
+from src.tools.github_tool import github_tool
 from src.utils.logger import logger
 from src.utils.metrics import AgentMetrics
+from src.utils.rate_limit import github_scheduler
 
 
 class DocumentCreator:
@@ -45,6 +48,12 @@ class DocumentCreator:
             final_state = self.agent.invoke(initial_state)
             metrics.finish()
             metrics.iterations = final_state.get('iterations', 0)
+            metrics.cache_stats = {
+                "jira": jira_tool.cache_stats(),
+                "github": github_tool.cache_stats()
+            }
+            metrics.repo_timings = github_tool.repo_timings()
+            metrics.api_quota = github_scheduler.report()
             metrics.log_summary()
             
             draft = final_state.get('draft')
@@ -53,7 +62,7 @@ class DocumentCreator:
                 return draft
             else:
                 raise Exception("Agent failed to generate draft")
-                
+        
         except Exception as e:
             logger.error(f"Failed to create release notes: {e}")
             raise
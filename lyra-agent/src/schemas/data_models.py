@@ -72,6 +72,35 @@ class GitHubPR(BaseModel):
     url: HttpUrl
 
 
+class DiffStat(BaseModel):
+    """Line changes of a group of files."""
+    files: int = 0
+    additions: int = 0
+    deletions: int = 0
+
+
+class DiffHunk(BaseModel):
+    """Patch of one changed file."""
+    path: str
+    status: str
+    patch: str
+    truncated: bool = False
+
+
+class PRDiff(BaseModel):
+    """Compact, size-capped view of a PR's changes."""
+    repo: str
+    number: int
+    files_total: int
+    files_inspected: int
+    additions: int = Field(..., description="Whole PR, not only the inspected files")
+    deletions: int = Field(..., description="Whole PR, not only the inspected files")
+    truncated: bool = Field(False, description="Stopped at the file or byte budget")
+    by_directory: Dict[str, DiffStat] = Field(default_factory=dict)
+    by_extension: Dict[str, DiffStat] = Field(default_factory=dict)
+    api_hunks: List[DiffHunk] = Field(default_factory=list, description="Patches of public-API files")
+
+
 class ConfluencePage(BaseModel):
     """Confluence page data model."""
     id: str
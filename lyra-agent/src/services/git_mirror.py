@@ -0,0 +1,241 @@
+"""
+Local git mirrors of the configured repositories.
+
+Keeps a bare clone (branches and tags) per repo under settings.git_mirror_dir and
+answers file existence and content questions from its trees and blobs at any
+branch, tag or commit, without API calls. Mirrors are fetched again when older
+than settings.git_mirror_fetch_interval, and never in offline mode.
+"""
+from base64 import b64encode
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import os
+import shutil
+import subprocess
+import threading
+import time
+from src.config.settings import settings
+from src.utils.logger import logger
+
+
+class GitMirrorError(RuntimeError):
+    """A mirror could not be cloned, fetched or read."""
+
+
+class GitMirror:
+    """Bare git mirrors with batched tree lookups via `git cat-file --batch-check`."""
+    
+    _FETCHED_MARKER = "lyra-fetched"
+    
+    def __init__(
+        self,
+        mirror_dir: Optional[str] = None,
+        url_template: Optional[str] = None,
+        fetch_interval: Optional[int] = None
+    ):
+        self.mirror_dir = Path(mirror_dir or settings.git_mirror_dir)
+        self.url_template = url_template or settings.git_mirror_url
+        self.fetch_interval = settings.git_mirror_fetch_interval if fetch_interval is None else fetch_interval
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        # repo -> (time, error) of the last failed clone/fetch, so callers falling back
+        # to the API per path do not retry the clone for every path
+        self._failures: Dict[str, tuple] = {}
+        # repo -> refs that did not resolve even after a fetch (cleared by the next fetch)
+        self._unknown_refs: Dict[str, set] = {}
+    
+    def path(self, repo: str) -> Path:
+        """Directory of the mirror of repo ("owner/name")."""
+        return self.mirror_dir / f"{repo.replace('/', '__')}.git"
+    
+    def exists(self, repo: str, paths: Iterable[str], ref: str = "main") -> Dict[str, bool]:
+        """
+        Check which paths (files or directories) exist in repo at ref.
+        
+        All paths are resolved by one git process, so hundreds of checks take
+        milliseconds. An unknown ref means no path exists.
+        
+        Args:
+            repo: Repository full name ("owner/name")
+            paths: Repository paths
+            ref: Branch, tag or commit SHA
+        
+        Returns:
+            Existence per path, in the order given
+        
+        Raises:
+            GitMirrorError: The mirror is unavailable
+        """
+        paths = list(paths)
+        mirror = self.ensure(repo)
+        commit = self._resolve(repo, mirror, ref)
+        if commit is None:
+            return {path: False for path in paths}
+        
+        lines = "".join(f"{commit}:{path.strip('/')}\n" for path in paths)
+        output = self._git(mirror, "cat-file", "--batch-check", input=lines)
+        # One line per request: "<sha> <type> <size>" or "<object> missing"
+        results = output.splitlines()
+        return {path: not line.endswith(" missing") for path, line in zip(paths, results)}
+    
+    def read(self, repo: str, path: str, ref: str = "main") -> Optional[bytes]:
+        """
+        Content of a file in repo at ref.
+        
+        Returns:
+            File bytes, or None if the file or ref does not exist
+        
+        Raises:
+            GitMirrorError: The mirror is unavailable
+        """
+        mirror = self.ensure(repo)
+        commit = self._resolve(repo, mirror, ref)
+        if commit is None:
+            return None
+        result = subprocess.run(
+            ["git", "cat-file", "blob", f"{commit}:{path.strip('/')}"],
+            cwd=mirror, capture_output=True, env=self._env()
+        )
+        return result.stdout if result.returncode == 0 else None
+    
+    def ensure(self, repo: str, fetch: bool = True) -> Path:
+        """
+        Return the mirror of repo, cloning it or fetching updates as needed.
+        
+        Args:
+            repo: Repository full name ("owner/name")
+            fetch: Fetch if the mirror is older than fetch_interval (never offline)
+        
+        Raises:
+            GitMirrorError: Cloning or fetching failed (retried after fetch_interval)
+        """
+        mirror = self.path(repo)
+        with self._lock(repo):
+            failure = self._failures.get(repo)
+            if failure and time.time() - failure[0] < self.fetch_interval:
+                raise GitMirrorError(failure[1])
+            try:
+                if not mirror.exists():
+                    if settings.offline:
+                        raise GitMirrorError(f"No local mirror of {repo} and Lyra is running offline")
+                    self._clone(repo, mirror)
+                elif fetch and not settings.offline and self._age(mirror) > self.fetch_interval:
+                    self._fetch(repo, mirror)
+            except GitMirrorError as e:
+                self._failures[repo] = (time.time(), str(e))
+                raise
+            self._failures.pop(repo, None)
+        return mirror
+    
+    def sync(self, repos: List[str]) -> Dict[str, str]:
+        """
+        Clone or fetch the mirrors of repos now, regardless of their age.
+        
+        Returns:
+            Error message per repo that failed
+        """
+        errors = {}
+        for repo in repos:
+            try:
+                with self._lock(repo):
+                    mirror = self.path(repo)
+                    if mirror.exists():
+                        self._fetch(repo, mirror)
+                    else:
+                        self._clone(repo, mirror)
+                    self._failures.pop(repo, None)
+            except GitMirrorError as e:
+                errors[repo] = str(e)
+        return errors
+    
+    def _resolve(self, repo: str, mirror: Path, ref: str) -> Optional[str]:
+        """Commit SHA of ref, fetching once if the ref is unknown (e.g. a new branch)."""
+        commit = self._rev_parse(mirror, ref)
+        if commit is None and not settings.offline and ref not in self._unknown_refs.get(repo, ()):
+            with self._lock(repo):
+                self._fetch(repo, mirror)
+            commit = self._rev_parse(mirror, ref)
+            if commit is None:
+                self._unknown_refs.setdefault(repo, set()).add(ref)
+        return commit
+    
+    def _rev_parse(self, mirror: Path, ref: str) -> Optional[str]:
+        result = subprocess.run(
+            ["git", "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"],
+            cwd=mirror, capture_output=True, text=True, env=self._env()
+        )
+        return result.stdout.strip() if result.returncode == 0 else None
+    
+    def _clone(self, repo: str, mirror: Path):
+        logger.info(f"Cloning git mirror of {repo} into {mirror}")
+        start = time.time()
+        staging = mirror.with_name(mirror.name + ".tmp")
+        shutil.rmtree(staging, ignore_errors=True)
+        mirror.parent.mkdir(parents=True, exist_ok=True)
+        # Clone into a staging directory so an interrupted clone never looks like a mirror
+        self._git(mirror.parent, "clone", "--bare", "--quiet", self._url(repo), str(staging), auth=True)
+        self._git(staging, "config", "remote.origin.fetch", "+refs/heads/*:refs/heads/*")
+        self._git(staging, "config", "--add", "remote.origin.fetch", "+refs/tags/*:refs/tags/*")
+        (staging / self._FETCHED_MARKER).touch()
+        staging.rename(mirror)
+        logger.info(f"Cloned {repo} in {time.time() - start:.1f}s")
+    
+    def _fetch(self, repo: str, mirror: Path):
+        logger.debug(f"Fetching git mirror of {repo}")
+        self._git(mirror, "fetch", "--prune", "--quiet", "origin", auth=True)
+        (mirror / self._FETCHED_MARKER).touch()
+        self._unknown_refs.pop(repo, None)
+    
+    def _age(self, mirror: Path) -> float:
+        try:
+            return time.time() - (mirror / self._FETCHED_MARKER).stat().st_mtime
+        except FileNotFoundError:
+            return float("inf")
+    
+    def _url(self, repo: str) -> str:
+        return self.url_template.format(repo=repo)
+    
+    def _auth_env(self) -> Dict[str, str]:
+        """
+        Git config passing the GitHub token for HTTPS remotes.
+        
+        Set through the environment (GIT_CONFIG_COUNT, git 2.31+), so the token is
+        neither stored in the mirror config nor visible on the command line.
+        """
+        if not self._url("x/y").startswith("https://") or not settings.github_token:
+            return {}
+        credentials = b64encode(f"x-access-token:{settings.github_token}".encode()).decode()
+        return {
+            "GIT_CONFIG_COUNT": "1",
+            "GIT_CONFIG_KEY_0": "http.extraHeader",
+            "GIT_CONFIG_VALUE_0": f"Authorization: Basic {credentials}",
+        }
+    
+    def _git(self, cwd: Path, *args: str, input: Optional[str] = None, auth: bool = False) -> str:
+        command = next((a for a in args if not a.startswith("-") and "=" not in a), "")
+        try:
+            result = subprocess.run(
+                ["git", *args],
+                cwd=cwd,
+                input=input,
+                capture_output=True,
+                text=True,
+                timeout=settings.git_mirror_timeout,
+                env={**self._env(), **self._auth_env()} if auth else self._env()
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise GitMirrorError(f"git {command} failed: {e}") from e
+        if result.returncode != 0:
+            raise GitMirrorError(f"git {command} failed: {result.stderr.strip()}")
+        return result.stdout
+    
+    def _env(self) -> Dict[str, str]:
+        return {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+    
+    def _lock(self, repo: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(repo, threading.Lock())
+
+
+# Global instance
+git_mirror = GitMirror()
@@ -0,0 +1,285 @@
+"""
+Local Jira project mirror.
+
+Keeps the issues of the configured project in SQLite: the JiraTicket model (with
+comments), the fields searches filter on as columns, and fix versions, labels and
+components as rows of ticket_values. It is kept current by incremental syncs of
+the issues updated since the previous one.
+
+Common JQL shapes (AND-ed =, !=, in and not in clauses on project, status, issue
+type, fixVersion, labels and components, plus ORDER BY) are translated to SQL,
+so release queries are answered locally; anything else returns None and goes to
+live Jira.
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import re
+import time
+from src.config.settings import settings
+from src.schemas.data_models import JiraTicket
+from src.utils.logger import logger
+from src.utils.sqlite import ThreadLocalSQLite
+
+
+# JQL field -> tickets column
+_SCALAR_FIELDS = {"project": "project", "status": "status", "issuetype": "issue_type", "type": "issue_type"}
+
+# JQL field -> ticket_values field (multi-valued: only = and in are translated)
+_MULTI_FIELDS = {"fixversion": "fixVersion", "labels": "label", "component": "component", "components": "component"}
+
+# JQL ORDER BY field -> SQL expression
+_ORDER_FIELDS = {
+    "created": "t.created",
+    "updated": "t.updated",
+    "key": "t.project {direction}, CAST(substr(t.key, instr(t.key, '-') + 1) AS INTEGER)",
+}
+
+_CLAUSE = re.compile(
+    r'\s*(?P<field>\w+)\s*(?P<op>!=|=|not\s+in\b|in\b)\s*'
+    r'(?P<value>"(?:[^"\\]|\\.)*"|\'[^\']*\'|\([^()]*\)|[\w.\-]+)\s*',
+    re.IGNORECASE
+)
+_AND = re.compile(r'AND\b', re.IGNORECASE)
+_ORDER_BY = re.compile(r'ORDER\s+BY\s+(?P<terms>.+)$', re.IGNORECASE)
+_LIST_ITEM = re.compile(r'\s*(?:"((?:[^"\\]|\\.)*)"|\'([^\']*)\'|([^,\s]+))\s*(?:,|$)')
+
+
+def _unquote(value: str) -> str:
+    if value[:1] == '"':
+        return re.sub(r'\\(.)', r'\1', value[1:-1])
+    if value[:1] == "'":
+        return value[1:-1]
+    return value
+
+
+def _values(value: str) -> Optional[List[str]]:
+    """The values of a (quoted, bare or parenthesized list) JQL operand."""
+    if not value.startswith("("):
+        return [_unquote(value)]
+    inner = value[1:-1]
+    items, pos = [], 0
+    while pos < len(inner.rstrip()):
+        match = _LIST_ITEM.match(inner, pos)
+        if not match or match.end() == pos:
+            return None
+        double, single, bare = match.groups()
+        items.append(re.sub(r'\\(.)', r'\1', double) if double is not None else single if single is not None else bare)
+        pos = match.end()
+    return items or None
+
+
+def translate_jql(jql: str) -> Optional[Tuple[str, list, str, Set[str]]]:
+    """
+    Translate a JQL query into SQL over the mirror.
+    
+    Args:
+        jql: JQL query string
+    
+    Returns:
+        (WHERE clause, parameters, ORDER BY clause, projects the query is restricted
+        to, upper-cased), or None if the query has a shape the mirror does not support
+    """
+    jql = jql.strip()
+    order_sql = "t.project DESC, CAST(substr(t.key, instr(t.key, '-') + 1) AS INTEGER) DESC"
+    order = _ORDER_BY.search(jql)
+    if order:
+        terms = []
+        for term in order.group("terms").split(","):
+            parts = term.split()
+            if not parts or len(parts) > 2 or parts[0].lower() not in _ORDER_FIELDS:
+                return None
+            direction = parts[1].upper() if len(parts) == 2 else "ASC"
+            if direction not in ("ASC", "DESC"):
+                return None
+            expression = _ORDER_FIELDS[parts[0].lower()].format(direction=direction)
+            terms.append(f"{expression} {direction}")
+        order_sql = ", ".join(terms)
+        jql = jql[:order.start()].strip()
+    
+    conditions, params, pos = [], [], 0
+    projects: Optional[Set[str]] = None
+    while pos < len(jql):
+        match = _CLAUSE.match(jql, pos)
+        if not match:
+            return None
+        field, op = match.group("field").lower(), " ".join(match.group("op").lower().split())
+        value = match.group("value")
+        values = _values(value)
+        if values is None or value.startswith("(") != (op in ("in", "not in")):
+            return None
+        if not value.startswith(("(", '"', "'")) and value.upper() in ("EMPTY", "NULL"):
+            return None
+        negate = op in ("!=", "not in")
+        placeholders = ", ".join("?" * len(values))
+        
+        if field in _SCALAR_FIELDS:
+            column = _SCALAR_FIELDS[field]
+            conditions.append(f"t.{column} {'NOT ' if negate else ''}IN ({placeholders})")
+            if column == "project" and not negate:
+                matched = {value.upper() for value in values}
+                projects = matched if projects is None else projects & matched
+        elif field in _MULTI_FIELDS and not negate:
+            # Jira's != on multi-valued fields also drops tickets without any value; not mirrored
+            conditions.append(
+                "EXISTS (SELECT 1 FROM ticket_values v WHERE v.key = t.key "
+                f"AND v.field = ? AND v.value IN ({placeholders}))"
+            )
+            params.append(_MULTI_FIELDS[field])
+        else:
+            return None
+        params.extend(values)
+        
+        pos = match.end()
+        if pos < len(jql):
+            conjunction = _AND.match(jql, pos)
+            if not conjunction:
+                return None
+            pos = conjunction.end()
+            if pos >= len(jql):
+                return None
+    
+    if not conditions:
+        return None
+    return " AND ".join(conditions), params, order_sql, projects or set()
+
+
+class JiraIndex:
+    """SQLite mirror of JiraTicket models with per-project sync watermarks."""
+    
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tickets (
+            key TEXT PRIMARY KEY,
+            project TEXT NOT NULL COLLATE NOCASE,
+            status TEXT NOT NULL COLLATE NOCASE,
+            issue_type TEXT NOT NULL COLLATE NOCASE,
+            created TEXT NOT NULL,
+            updated TEXT NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_tickets_project ON tickets(project, updated);
+        
+        -- fixVersion, label and component values
+        CREATE TABLE IF NOT EXISTS ticket_values (
+            key TEXT NOT NULL,
+            field TEXT NOT NULL,
+            value TEXT NOT NULL COLLATE NOCASE,
+            PRIMARY KEY (key, field, value)
+        );
+        CREATE INDEX IF NOT EXISTS idx_ticket_values ON ticket_values(field, value);
+        
+        CREATE TABLE IF NOT EXISTS ticket_sync (
+            project TEXT PRIMARY KEY,
+            watermark TEXT,
+            synced_at REAL NOT NULL
+        );
+    """
+    
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = Path(db_path) if db_path else Path(settings.index_dir) / "jira.db"
+        self._db = ThreadLocalSQLite(self.db_path, self._SCHEMA)
+    
+    def upsert(self, tickets: List[JiraTicket]):
+        """Insert or update tickets, with their field values."""
+        conn = self._db.conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for ticket in tickets:
+                conn.execute(
+                    "INSERT OR REPLACE INTO tickets (key, project, status, issue_type, created, updated, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        ticket.key, ticket.key.split("-")[0], ticket.status, ticket.issue_type,
+                        ticket.created.isoformat(), ticket.updated.isoformat(), ticket.model_dump_json()
+                    )
+                )
+                conn.execute("DELETE FROM ticket_values WHERE key = ?", (ticket.key,))
+                conn.executemany(
+                    "INSERT OR IGNORE INTO ticket_values (key, field, value) VALUES (?, ?, ?)",
+                    [(ticket.key, "fixVersion", value) for value in ticket.fix_versions]
+                    + [(ticket.key, "label", value) for value in ticket.labels]
+                    + [(ticket.key, "component", value) for value in ticket.components]
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    
+    def search(self, jql: str, projects: Iterable[str], limit: Optional[int] = None) -> Optional[List[JiraTicket]]:
+        """
+        Answer a JQL query from the mirror.
+        
+        Args:
+            jql: JQL query string
+            projects: Mirrored projects; the query must be restricted to some of them
+            limit: Maximum results
+        
+        Returns:
+            Matching tickets in the query's order, or None if the query cannot be
+            translated or may match tickets of other projects
+        """
+        translated = translate_jql(jql)
+        if translated is None:
+            return None
+        where, params, order, query_projects = translated
+        if not query_projects or not query_projects <= {project.upper() for project in projects}:
+            return None
+        rows = self._db.conn().execute(
+            f"SELECT t.data FROM tickets t WHERE {where} ORDER BY {order} LIMIT ?",
+            [*params, limit if limit is not None else -1]
+        ).fetchall()
+        return [JiraTicket.model_validate_json(row[0]) for row in rows]
+    
+    def prune(self, project: str, keep: Iterable[str]) -> int:
+        """Delete tickets of project not in keep (deleted or moved away). Returns the count."""
+        conn = self._db.conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS keep_tickets (key TEXT PRIMARY KEY)")
+            conn.execute("DELETE FROM keep_tickets")
+            conn.executemany("INSERT OR IGNORE INTO keep_tickets VALUES (?)", [(key,) for key in keep])
+            gone = [row[0] for row in conn.execute(
+                "SELECT key FROM tickets WHERE project = ? AND key NOT IN (SELECT key FROM keep_tickets)", (project,)
+            )]
+            for table in ("tickets", "ticket_values"):
+                conn.executemany(f"DELETE FROM {table} WHERE key = ?", [(key,) for key in gone])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return len(gone)
+    
+    def watermark(self, project: str) -> Optional[datetime]:
+        """Start time of the last completed sync of project."""
+        row = self._db.conn().execute(
+            "SELECT watermark FROM ticket_sync WHERE project = ?", (project,)
+        ).fetchone()
+        return datetime.fromisoformat(row[0]) if row and row[0] else None
+    
+    def last_synced(self, project: str) -> Optional[float]:
+        """Unix time of the last completed sync of project, or None if never synced."""
+        row = self._db.conn().execute(
+            "SELECT synced_at FROM ticket_sync WHERE project = ?", (project,)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def mark_synced(self, project: str, watermark: datetime):
+        """Record a completed sync of project that started at watermark."""
+        self._db.conn().execute(
+            "INSERT OR REPLACE INTO ticket_sync (project, watermark, synced_at) VALUES (?, ?, ?)",
+            (project, watermark.isoformat(), time.time())
+        )
+    
+    def reset(self, project: str):
+        """Forget the watermark of project so the next sync fetches all its issues."""
+        self._db.conn().execute("DELETE FROM ticket_sync WHERE project = ?", (project,))
+        logger.info(f"Reset Jira mirror watermark for {project}")
+    
+    def stats(self) -> Dict[str, int]:
+        """Mirrored ticket count per project."""
+        rows = self._db.conn().execute("SELECT project, COUNT(*) FROM tickets GROUP BY project ORDER BY project")
+        return dict(rows.fetchall())
+
+
+# Global instance
+jira_index = JiraIndex()
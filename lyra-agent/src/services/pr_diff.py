@@ -0,0 +1,121 @@
+"""
+Size-capped PR diff summaries.
+
+Turns a stream of changed files (PyGithub ``File`` objects, or anything with
+filename/status/additions/deletions/patch) into a PRDiff: per-directory and
+per-extension line stats plus the patches of public-API files. Iteration stops
+at the file or byte budget, so large PRs cost a bounded number of pages.
+"""
+from fnmatch import fnmatch
+from pathlib import PurePosixPath
+from typing import Any, Iterable, List, Optional
+from src.config.settings import settings
+from src.schemas.data_models import DiffHunk, DiffStat, PRDiff
+
+
+# Directories are grouped by their first two path components ("src/api")
+DIRECTORY_DEPTH = 2
+
+
+def is_public_api(path: str, patterns: Optional[List[str]] = None) -> bool:
+    """Whether path matches one of the public-API globs (settings.public_api_patterns)."""
+    patterns = settings.public_api_pattern_list if patterns is None else patterns
+    return any(fnmatch(path, pattern) for pattern in patterns)
+
+
+def summarize_files(
+    files: Iterable[Any],
+    repo: str,
+    number: int,
+    files_total: int,
+    additions: int,
+    deletions: int,
+    max_files: Optional[int] = None,
+    max_bytes: Optional[int] = None
+) -> PRDiff:
+    """
+    Summarize changed files until a budget is exhausted.
+    
+    Args:
+        files: Changed files, consumed lazily
+        repo: Repository full name
+        number: PR number
+        files_total: Changed files in the whole PR
+        additions: Added lines in the whole PR
+        deletions: Deleted lines in the whole PR
+        max_files: File budget (default settings.pr_diff_max_files)
+        max_bytes: Patch byte budget (default settings.pr_diff_max_bytes)
+    
+    Returns:
+        PRDiff
+    """
+    max_files = max_files or settings.pr_diff_max_files
+    max_bytes = max_bytes or settings.pr_diff_max_bytes
+    hunk_bytes = settings.pr_diff_max_hunk_bytes
+    diff = PRDiff(
+        repo=repo, number=number, files_total=files_total,
+        files_inspected=0, additions=additions, deletions=deletions
+    )
+    bytes_read = 0
+    
+    for file in files:
+        path = file.filename
+        patch = getattr(file, "patch", None) or ""
+        bytes_read += len(patch)
+        diff.files_inspected += 1
+        
+        parts = PurePosixPath(path).parts[:-1]
+        directory = "/".join(parts[:DIRECTORY_DEPTH]) or "."
+        extension = PurePosixPath(path).suffix or "(none)"
+        for stats, key in ((diff.by_directory, directory), (diff.by_extension, extension)):
+            stat = stats.setdefault(key, DiffStat())
+            stat.files += 1
+            stat.additions += file.additions
+            stat.deletions += file.deletions
+        
+        if patch and is_public_api(path):
+            diff.api_hunks.append(DiffHunk(
+                path=path,
+                status=file.status,
+                patch=patch[:hunk_bytes],
+                truncated=len(patch) > hunk_bytes
+            ))
+        
+        # Stop before pulling the next file, which may cost another page
+        if diff.files_inspected >= max_files or bytes_read >= max_bytes:
+            break
+    
+    # Also set when GitHub stops listing files (after 3000)
+    diff.truncated = diff.files_inspected < files_total
+    return diff
+
+
+def format_pr_diff(diff: PRDiff, top: int = 8) -> str:
+    """
+    Render a PRDiff as compact text for LLM prompts.
+    
+    Args:
+        diff: PR diff summary
+        top: Directories/extensions listed, by lines changed
+    
+    Returns:
+        Multi-line summary
+    """
+    def groups(stats: dict) -> str:
+        ranked = sorted(stats.items(), key=lambda item: -(item[1].additions + item[1].deletions))
+        return ", ".join(
+            f"{name} +{s.additions}/-{s.deletions} ({s.files} files)" for name, s in ranked[:top]
+        ) or "none"
+    
+    lines = [
+        f"Files: {diff.files_inspected} of {diff.files_total} inspected"
+        f"{' (truncated)' if diff.truncated else ''}, +{diff.additions}/-{diff.deletions} lines in total",
+        f"By directory: {groups(diff.by_directory)}",
+        f"By extension: {groups(diff.by_extension)}",
+    ]
+    if diff.api_hunks:
+        lines.append("Public API changes:")
+        for hunk in diff.api_hunks:
+            lines.append(f"--- {hunk.path} ({hunk.status})")
+            lines.append(hunk.patch + ("\n[... patch truncated]" if hunk.truncated else ""))
+    return "\n".join(lines)
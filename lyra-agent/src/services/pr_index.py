@@ -0,0 +1,203 @@
+"""
+Local pull request index.
+
+Keeps every PR of the configured repos in SQLite with an FTS5 full-text index over
+title, body and labels, so PR searches are answered locally across the whole history.
+Repos are synced incrementally: each sync fetches PRs by descending ``updated_at`` and
+stops at the previous sync's watermark.
+
+The Jira keys each PR references (``GitHubPR.linked_issues``) are kept in an inverted
+index, so ticket-to-PR lookups are a single indexed query, for one ticket or a release.
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+import time
+from src.config.settings import settings
+from src.schemas.data_models import GitHubPR
+from src.utils.logger import logger
+from src.utils.sqlite import ThreadLocalSQLite
+
+
+class PRIndex:
+    """SQLite + FTS5 store of GitHubPR models with per-repo sync watermarks."""
+    
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS prs (
+            repo TEXT NOT NULL,
+            number INTEGER NOT NULL,
+            state TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (repo, number)
+        );
+        CREATE INDEX IF NOT EXISTS idx_prs_updated ON prs(repo, updated_at);
+        
+        -- rowid matches prs.rowid
+        CREATE VIRTUAL TABLE IF NOT EXISTS prs_fts USING fts5(title, body, labels);
+        
+        CREATE TABLE IF NOT EXISTS pr_links (
+            ticket TEXT NOT NULL,
+            repo TEXT NOT NULL,
+            number INTEGER NOT NULL,
+            PRIMARY KEY (ticket, repo, number)
+        );
+        CREATE INDEX IF NOT EXISTS idx_pr_links_pr ON pr_links(repo, number);
+        
+        CREATE TABLE IF NOT EXISTS pr_sync (
+            repo TEXT PRIMARY KEY,
+            watermark TEXT,
+            synced_at REAL NOT NULL
+        );
+    """
+    
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = Path(db_path) if db_path else Path(settings.index_dir) / "prs.db"
+        self._db = ThreadLocalSQLite(self.db_path, self._SCHEMA)
+    
+    def upsert(self, repo: str, prs: List[GitHubPR]):
+        """
+        Insert or update PRs of one repo, with their ticket links.
+        
+        Args:
+            repo: Repository full name ("owner/name")
+            prs: PR models
+        """
+        conn = self._db.conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for pr in prs:
+                rowid = conn.execute(
+                    "INSERT INTO prs (repo, number, state, updated_at, data) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (repo, number) DO UPDATE SET "
+                    "state = excluded.state, updated_at = excluded.updated_at, data = excluded.data "
+                    "RETURNING rowid",
+                    (repo, pr.number, pr.state, pr.updated_at.isoformat(), pr.model_dump_json())
+                ).fetchone()[0]
+                conn.execute("DELETE FROM prs_fts WHERE rowid = ?", (rowid,))
+                conn.execute(
+                    "INSERT INTO prs_fts (rowid, title, body, labels) VALUES (?, ?, ?, ?)",
+                    (rowid, pr.title, pr.body or "", " ".join(pr.labels))
+                )
+                conn.execute("DELETE FROM pr_links WHERE repo = ? AND number = ?", (repo, pr.number))
+                conn.executemany(
+                    "INSERT OR IGNORE INTO pr_links (ticket, repo, number) VALUES (?, ?, ?)",
+                    [(ticket, repo, pr.number) for ticket in pr.linked_issues]
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    
+    def search(
+        self,
+        query: str,
+        repos: List[str],
+        state: str = "all",
+        limit: Optional[int] = None
+    ) -> List[GitHubPR]:
+        """
+        Full-text search over title, body and labels.
+        
+        The query is matched as a phrase, so "DEV-123" finds the ticket key and not
+        PRs that merely mention "DEV" and "123" separately.
+        
+        Args:
+            query: Search text (ticket key, keywords)
+            repos: Repositories to search
+            state: "open", "closed" or "all"
+            limit: Maximum results, most recently updated first
+        
+        Returns:
+            Matching PRs
+        """
+        if not repos:
+            return []
+        phrase = '"' + query.replace('"', '""') + '"'
+        sql = (
+            "SELECT p.data FROM prs_fts JOIN prs p ON p.rowid = prs_fts.rowid "
+            f"WHERE prs_fts MATCH ? AND p.repo IN ({', '.join('?' * len(repos))})"
+        )
+        params: list = [phrase, *repos]
+        if state != "all":
+            sql += " AND p.state = ?"
+            params.append(state)
+        sql += " ORDER BY p.updated_at DESC LIMIT ?"
+        params.append(limit or -1)
+        
+        rows = self._db.conn().execute(sql, params).fetchall()
+        return [GitHubPR.model_validate_json(row[0]) for row in rows]
+    
+    def prs_for_tickets(
+        self,
+        tickets: List[str],
+        repos: Optional[List[str]] = None
+    ) -> Dict[str, List[GitHubPR]]:
+        """
+        Bulk ticket-to-PR lookup through the inverted index.
+        
+        Args:
+            tickets: Jira keys (e.g. every ticket of a release)
+            repos: Only PRs of these repositories (default: all indexed)
+        
+        Returns:
+            PRs per ticket, most recently updated first. Every requested ticket is a key.
+        """
+        found: Dict[str, List[GitHubPR]] = {ticket: [] for ticket in tickets}
+        if not tickets:
+            return found
+        
+        conn = self._db.conn()
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS wanted_tickets (ticket TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM wanted_tickets")
+        conn.executemany("INSERT OR IGNORE INTO wanted_tickets VALUES (?)", [(t,) for t in tickets])
+        
+        sql = (
+            "SELECT l.ticket, p.data FROM wanted_tickets w "
+            "JOIN pr_links l ON l.ticket = w.ticket "
+            "JOIN prs p ON p.repo = l.repo AND p.number = l.number"
+        )
+        params: list = []
+        if repos is not None:
+            sql += f" WHERE p.repo IN ({', '.join('?' * len(repos))})"
+            params.extend(repos)
+        sql += " ORDER BY p.updated_at DESC"
+        
+        for ticket, data in conn.execute(sql, params):
+            found[ticket].append(GitHubPR.model_validate_json(data))
+        return found
+    
+    def watermark(self, repo: str) -> Optional[datetime]:
+        """Newest updated_at seen by the last completed sync of repo."""
+        row = self._db.conn().execute(
+            "SELECT watermark FROM pr_sync WHERE repo = ?", (repo,)
+        ).fetchone()
+        return datetime.fromisoformat(row[0]) if row and row[0] else None
+    
+    def last_synced(self, repo: str) -> Optional[float]:
+        """Unix time of the last completed sync of repo, or None if never synced."""
+        row = self._db.conn().execute(
+            "SELECT synced_at FROM pr_sync WHERE repo = ?", (repo,)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def mark_synced(self, repo: str, watermark: Optional[datetime]):
+        """Record a completed sync of repo up to watermark."""
+        self._db.conn().execute(
+            "INSERT OR REPLACE INTO pr_sync (repo, watermark, synced_at) VALUES (?, ?, ?)",
+            (repo, watermark.isoformat() if watermark else None, time.time())
+        )
+    
+    def reset(self, repo: str):
+        """Forget the watermark of repo so the next sync fetches its full history."""
+        self._db.conn().execute("DELETE FROM pr_sync WHERE repo = ?", (repo,))
+        logger.info(f"Reset PR index watermark for {repo}")
+    
+    def stats(self) -> Dict[str, int]:
+        """Indexed PR count per repo."""
+        rows = self._db.conn().execute("SELECT repo, COUNT(*) FROM prs GROUP BY repo ORDER BY repo")
+        return dict(rows.fetchall())
+
+
+# Global instance
+pr_index = PRIndex()
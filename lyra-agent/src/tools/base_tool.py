@@ -2,13 +2,92 @@
 Base tool class with common functionality.
 """
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Type, Tuple, Callable, Iterable, List
+import contextvars
+import functools
 import hashlib
+import inspect
 import json
+import threading
 import time
-from pathlib import Path
+from pydantic import BaseModel
+from src.cache.backends import CacheEntry, create_cache_backend, method_from_key
+from src.cache.codec import schema_hash
+from src.cache.memory import MemoryCache
+from src.cache.singleflight import SingleFlight
 from src.config.settings import settings
 from src.utils.logger import logger
+from src.utils.rate_limit import BACKGROUND, request_priority
+
+
+@dataclass
+class Validated:
+    """Fetch result carrying a source validator (e.g. an HTTP ETag) for conditional refresh."""
+    value: Any
+    validator: Optional[str] = None
+
+
+@dataclass
+class Partial:
+    """Incomplete fetch result (some sources failed): returned to the caller but not cached."""
+    value: Any
+
+
+class NotFoundError(Exception):
+    """The requested object does not exist at the source (possibly served from the negative cache)."""
+    pass
+
+
+class OfflineError(RuntimeError):
+    """Offline mode needed the network: a cache miss or an uncached API call."""
+    pass
+
+
+@dataclass(frozen=True)
+class _NotFound:
+    """Cached marker for a 404."""
+    message: str
+
+
+_MISS = object()
+NEGATIVE_TAG = "not-found"
+_CALL_KEY: contextvars.ContextVar = contextvars.ContextVar("call_key", default=None)
+
+
+def cached_method(model: Optional[Type[BaseModel]] = None) -> Callable:
+    """
+    Decorator deriving the cache key of a tool method from its signature.
+    
+    All arguments, defaults included, are bound with inspect.signature, so no
+    parameter can be left out of the key. The method reads its key with
+    self._call_key(); method.cache_key(tool, *args, **kwargs) builds the same key
+    for bulk fetches that fill the method's entries.
+    
+    Args:
+        model: Pydantic model of the cached value (its schema is part of the key)
+    """
+    def decorate(method: Callable) -> Callable:
+        signature = inspect.signature(method)
+        
+        def cache_key(tool: "BaseTool", *args, **kwargs) -> str:
+            bound = signature.bind(tool, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(list(bound.arguments.items())[1:])
+            return tool._cache_key(method.__name__, model, **arguments)
+        
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            token = _CALL_KEY.set(cache_key(self, *args, **kwargs))
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                _CALL_KEY.reset(token)
+        
+        wrapper.cache_key = cache_key
+        return wrapper
+    return decorate
 
 
 class BaseTool(ABC):
@@ -22,59 +101,412 @@ class BaseTool(ABC):
             cache_enabled: Override default cache setting
         """
         self.cache_enabled = cache_enabled if cache_enabled is not None else settings.enable_cache
-        self.cache_dir = Path("./data/cache") / self.__class__.__name__.lower()
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self._init_client()
+        self.cache = create_cache_backend(self.__class__.__name__.lower())
+        self.memory_cache = MemoryCache(
+            max_entries=settings.memory_cache_max_entries,
+            max_bytes=settings.memory_cache_max_mb * 1024 * 1024,
+            ttl=settings.memory_cache_ttl
+        ) if settings.memory_cache_enabled else None
+        self._refresh_lock = threading.Lock()
+        self._refreshing = set()
+        self._refresh_executor: Optional[ThreadPoolExecutor] = None
+        self._single_flight = SingleFlight()
+        self._client = None
+        self._local = threading.local()
     
     @abstractmethod
-    def _init_client(self):
-        """Initialize the API client. Implemented by subclasses."""
+    def _init_client(self) -> Any:
+        """Build and return a new API client. Implemented by subclasses, called once per thread."""
         pass
     
-    def _cache_key(self, method: str, **kwargs) -> str:
-        """Generate cache key from method and parameters."""
-        key_data = f"{method}:{json.dumps(kwargs, sort_keys=True)}"
-        return hashlib.md5(key_data.encode()).hexdigest()
+    @property
+    def client(self) -> Any:
+        """
+        API client of the calling thread, built on first use so cached and offline
+        runs never connect.
+        
+        The Jira and GitHub client libraries are not safe to share between threads,
+        so each thread gets its own client; their connection pools are shared (see
+        src.utils.http). A client assigned with `tool.client = ...` serves all threads.
+        
+        Raises:
+            OfflineError: In offline mode
+        """
+        if self._client is not None:
+            return self._client
+        client = getattr(self._local, "client", None)
+        if client is None:
+            if settings.offline:
+                raise OfflineError(
+                    f"{self.__class__.__name__} needs the network but Lyra is running offline"
+                )
+            client = self._local.client = self._init_client()
+        return client
     
-    def _get_cached(self, key: str) -> Optional[Any]:
-        """Retrieve cached response if exists and not expired."""
-        if not self.cache_enabled:
+    @client.setter
+    def client(self, value: Any):
+        self._client = value
+    
+    def _handle(self, name: str, factory: Callable[[], Any]) -> Any:
+        """
+        Memoized API handle (repository, organization, ...) of this thread's client.
+        
+        Args:
+            name: Handle name, e.g. "repo:org/app"
+            factory: Builds the handle from self.client
+        """
+        client = self.client
+        if getattr(self._local, "handles_client", None) is not client:
+            self._local.handles = {}
+            self._local.handles_client = client
+        handles = self._local.handles
+        if name not in handles:
+            handles[name] = factory()
+        return handles[name]
+    
+    def _cache_key(self, method: str, _model: Optional[Type[BaseModel]] = None, **kwargs) -> str:
+        """
+        Generate cache key from method, parameters and the cached model's schema.
+        
+        Keys look like "<method>.<schema hash>.<digest>", so the method stays readable
+        and entries written for an older shape of the model are never read back.
+        Tool methods get theirs from @cached_method rather than calling this directly.
+        """
+        key_data = f"{method}:{json.dumps(kwargs, sort_keys=True, default=str)}"
+        digest = hashlib.md5(key_data.encode()).hexdigest()
+        key = f"{method}.{schema_hash(_model)}.{digest}"
+        # Remembered so an offline miss can say which call was missing
+        self._local.last_call = (key, f"{method}({', '.join(f'{k}={v!r}' for k, v in kwargs.items())})")
+        return key
+    
+    def _call_key(self) -> str:
+        """Cache key of the @cached_method call being run."""
+        key = _CALL_KEY.get()
+        if key is None:
+            raise RuntimeError("_call_key() used outside a @cached_method")
+        return key
+    
+    def _cache_tags(self, value: Any) -> List[str]:
+        """Tags for a cached value: the union of _item_tags over a list, or of a single item."""
+        items = value if isinstance(value, list) else [value]
+        tags = set()
+        for item in items:
+            tags.update(self._item_tags(item))
+        return sorted(tags)
+    
+    def _item_tags(self, item: Any) -> Iterable[str]:
+        """Tags for one cached object (e.g. "ticket:DEV-123"). Overridden by subclasses."""
+        return ()
+    
+    def _get_cached(self, key: str, model: Optional[Type[BaseModel]] = None) -> Optional[Any]:
+        """
+        Retrieve cached response if exists and not expired.
+        
+        Lookups go to the in-memory tier first, then to the disk backend. Disk hits
+        are built into models once and promoted to memory.
+        
+        Args:
+            key: Cache key
+            model: Pydantic model to build from cached dicts (single or list)
+        
+        Returns:
+            Cached object(s), or None on miss or a cached 404. Use _lookup to tell
+            a miss from a cached None or empty list.
+        """
+        hit = self._lookup(key, model)
+        if hit is None or isinstance(hit[0], _NotFound):
             return None
+        return hit[0]
+    
+    def _lookup(
+        self,
+        key: str,
+        model: Optional[Type[BaseModel]] = None,
+        allow_stale: bool = False
+    ) -> Optional[Tuple[Any, Optional[CacheEntry]]]:
+        """
+        Look up key in memory, then on disk.
+        
+        In offline mode entries never expire.
         
-        cache_file = self.cache_dir / f"{key}.json"
-        if not cache_file.exists():
+        Args:
+            key: Cache key
+            model: Pydantic model to build from cached dicts
+            allow_stale: Return entries past cache_ttl (up to cache_max_stale beyond it)
+        
+        Returns:
+            (value, disk entry) tuple, or None on miss. Empty results are hits. The value
+            is a _NotFound marker for a cached 404. The entry is None for memory hits,
+            which are always fresh.
+        """
+        if not self.cache_enabled:
             return None
         
+        if self.memory_cache is not None:
+            value = self.memory_cache.get(key, _MISS)
+            if value is not _MISS:
+                logger.debug(f"Memory cache hit for {key}")
+                return (list(value) if isinstance(value, list) else value), None
+        
         try:
-            with open(cache_file, 'r') as f:
-                cached = json.load(f)
-            
-            # Check if expired
-            if time.time() - cached['timestamp'] > settings.cache_ttl:
-                cache_file.unlink()
+            entry = self.cache.get(key)
+            if entry is None:
                 return None
             
+            negative = "not_found" in entry.meta
+            ttl = settings.cache_negative_ttl if negative else settings.cache_ttl
+            
+            # Check if expired. Cached 404s are never served stale.
+            age = entry.age()
+            if age > ttl and not settings.offline:
+                if negative or not allow_stale or age > ttl + settings.cache_max_stale:
+                    self.cache.delete(key)
+                    return None
+                logger.debug(f"Stale cache hit for {key} ({age:.0f}s old)")
+                return entry.load(model), entry
+            
             logger.debug(f"Cache hit for {key}")
-            return cached['data']
+            value = _NotFound(entry.meta["not_found"]) if negative else entry.load(model)
         except Exception as e:
             logger.warning(f"Cache read error: {e}")
             return None
+        
+        if self.memory_cache is not None:
+            self.memory_cache.set(key, value, size=entry.size, expires_at=entry.timestamp + ttl)
+        return (list(value) if isinstance(value, list) else value), entry
     
-    def _set_cached(self, key: str, data: Any):
-        """Store response in cache."""
+    def _set_cached(
+        self,
+        key: str,
+        value: Any,
+        meta: Optional[Dict[str, Any]] = None,
+        tags: Iterable[str] = ()
+    ):
+        """
+        Store response in cache. Models are dumped for disk and kept as-is in memory.
+        
+        The disk entry is tagged with the value's own tags (see _item_tags) plus any
+        call-level tags, so `lyra cache purge --tag ...` can find it.
+        """
         if not self.cache_enabled:
             return
         
-        cache_file = self.cache_dir / f"{key}.json"
         try:
-            with open(cache_file, 'w') as f:
-                json.dump({
-                    'timestamp': time.time(),
-                    'data': data
-                }, f)
+            all_tags = set(tags) | set(self._cache_tags(value))
+            size = self.cache.set(key, self._dump_cached(value), meta=meta, tags=all_tags)
             logger.debug(f"Cached result for {key}")
         except Exception as e:
             logger.warning(f"Cache write error: {e}")
+            return
+        
+        if self.memory_cache is not None:
+            self.memory_cache.set(key, list(value) if isinstance(value, list) else value, size=size)
+    
+    def _set_not_found(self, key: str, error: Exception, tags: Iterable[str] = ()) -> _NotFound:
+        """Cache a 404 for settings.cache_negative_ttl. Returns the marker."""
+        marker = _NotFound(str(error))
+        if not self.cache_enabled:
+            return marker
+        
+        try:
+            size = self.cache.set(key, None, meta={"not_found": marker.message}, tags={*tags, NEGATIVE_TAG})
+            logger.debug(f"Cached not-found result for {key}")
+        except Exception as e:
+            logger.warning(f"Cache write error: {e}")
+            return marker
+        
+        if self.memory_cache is not None:
+            self.memory_cache.set(key, marker, size=size, expires_at=time.time() + settings.cache_negative_ttl)
+        return marker
+    
+    def _is_not_found(self, error: Exception) -> bool:
+        """Whether error means the object does not exist (HTTP 404 from PyGithub or jira)."""
+        if isinstance(error, NotFoundError):
+            return True
+        return 404 in (getattr(error, "status", None), getattr(error, "status_code", None))
+    
+    def _cached_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Any],
+        model: Optional[Type[BaseModel]] = None,
+        revalidate: Optional[Callable[[Any, Optional[str]], Any]] = None,
+        tags: Iterable[str] = ()
+    ) -> Any:
+        """
+        Return the cached value for key, fetching and caching it on a miss.
+        
+        Empty results are cached like any other value. A fetch that fails with a 404
+        (see _is_not_found) is cached for settings.cache_negative_ttl and raised as
+        NotFoundError, also on later calls until that entry expires.
+        
+        With settings.cache_stale_while_revalidate, an expired entry is returned
+        immediately and refreshed in the background. If revalidate is given it is
+        called first with the stale value and its stored validator (ETag, timestamp)
+        and should return None when the source is unchanged; otherwise fetch is used.
+        
+        Misses are coalesced per key: concurrent callers (threads, or asyncio tasks
+        via asyncio.to_thread) share a single fetch. In offline mode (settings.offline)
+        any entry is served regardless of age and a miss raises OfflineError.
+        
+        Args:
+            key: Cache key
+            fetch: Loads the value from the source. May return a Validated wrapper.
+            model: Pydantic model for cached data
+            revalidate: Optional conditional refresh, see above
+            tags: Call-level tags for the entry, in addition to those of the value
+        
+        Returns:
+            Cached or freshly fetched value
+        
+        Raises:
+            NotFoundError: The object does not exist at the source
+            OfflineError: Offline mode and key is not cached
+        """
+        tags = tuple(tags)
+        hit = self._lookup(key, model, allow_stale=settings.cache_stale_while_revalidate)
+        if hit is not None:
+            value, entry = hit
+            stale = entry is not None and entry.age() > settings.cache_ttl
+            if stale and not settings.offline and not isinstance(value, _NotFound):
+                self._schedule_refresh(key, value, entry, fetch, revalidate, tags)
+            self._record_lookup(key, hit=True)
+        elif settings.offline:
+            self._record_lookup(key, hit=False)
+            raise OfflineError(f"Offline cache miss in {self.__class__.__name__}: {self._describe_key(key)}")
+        else:
+            self._record_lookup(key, hit=False)
+            value = self._single_flight.do(key, lambda: self._fetch_once(key, fetch, model, tags))
+        
+        if isinstance(value, _NotFound):
+            raise NotFoundError(value.message)
+        return list(value) if isinstance(value, list) else value
+    
+    def _describe_key(self, key: str) -> str:
+        """The call behind key if it was the last one built by _cache_key on this thread, else the key."""
+        last_call = getattr(self._local, "last_call", None)
+        if last_call is not None and last_call[0] == key:
+            return f"{last_call[1]} (key {key})"
+        return f"key {key}"
+    
+    def _record_lookup(self, key: str, hit: bool):
+        """Count a lookup towards the per-method hit ratio shown by `lyra cache stats`."""
+        if not self.cache_enabled:
+            return
+        try:
+            self.cache.record_lookup(method_from_key(key), hit)
+        except Exception as e:
+            logger.debug(f"Could not record cache lookup: {e}")
+    
+    def _fetch_once(
+        self,
+        key: str,
+        fetch: Callable[[], Any],
+        model: Optional[Type[BaseModel]],
+        tags: Iterable[str] = ()
+    ) -> Any:
+        """Single-flight leader body: re-check the cache, then fetch and store."""
+        # Another leader may have filled the cache between our miss and acquiring the flight
+        hit = self._lookup(key, model)
+        if hit is not None:
+            return hit[0]
+        
+        try:
+            result = fetch()
+        except Exception as e:
+            if not self._is_not_found(e):
+                raise
+            return self._set_not_found(key, e, tags)
+        return self._store_fetched(key, result, tags)
+    
+    def _store_fetched(self, key: str, result: Any, tags: Iterable[str] = ()) -> Any:
+        """Cache a fetch result, keeping its validator (if any) as entry metadata."""
+        if isinstance(result, Partial):
+            logger.debug(f"Not caching partial result for {key}")
+            return result.value
+        if isinstance(result, Validated):
+            meta = {"validator": result.validator} if result.validator else None
+            self._set_cached(key, result.value, meta=meta, tags=tags)
+            return result.value
+        self._set_cached(key, result, tags=tags)
+        return result
+    
+    def _schedule_refresh(
+        self,
+        key: str,
+        stale_value: Any,
+        entry: CacheEntry,
+        fetch: Callable[[], Any],
+        revalidate: Optional[Callable[[Any, Optional[str]], Any]],
+        tags: Iterable[str] = ()
+    ):
+        """Start a background refresh for key unless one is already running."""
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            if self._refresh_executor is None:
+                self._refresh_executor = ThreadPoolExecutor(
+                    max_workers=settings.cache_refresh_workers,
+                    thread_name_prefix=f"{self.__class__.__name__}-refresh"
+                )
+        
+        self._refresh_executor.submit(self._run_refresh, key, stale_value, entry, fetch, revalidate, tags)
+    
+    def _run_refresh(self, *args):
+        """Refreshes are prefetches: they yield API quota to interactive calls."""
+        with request_priority(BACKGROUND):
+            self._refresh(*args)
+    
+    def _refresh(
+        self,
+        key: str,
+        stale_value: Any,
+        entry: CacheEntry,
+        fetch: Callable[[], Any],
+        revalidate: Optional[Callable[[Any, Optional[str]], Any]],
+        tags: Iterable[str] = ()
+    ):
+        """Background refresh body. Errors are logged; the stale entry stays in place."""
+        try:
+            if revalidate is not None:
+                result = revalidate(stale_value, entry.meta.get("validator"))
+                if result is None:
+                    # Unchanged at the source: renew the entry without re-fetching
+                    self._set_cached(key, stale_value, meta=entry.meta, tags=tags)
+                    logger.debug(f"Revalidated {key}: not modified")
+                    return
+            else:
+                result = fetch()
+            if isinstance(result, Partial):
+                # Keep the complete stale copy rather than replacing it with a partial one
+                return
+            self._store_fetched(key, result, tags)
+            logger.debug(f"Refreshed stale cache entry {key}")
+        except Exception as e:
+            if self._is_not_found(e):
+                # Deleted at the source: stop serving the stale copy
+                self._set_not_found(key, e, tags)
+            logger.warning(f"Background refresh failed for {key}: {e}")
+        finally:
+            with self._refresh_lock:
+                self._refreshing.discard(key)
+    
+    @staticmethod
+    def _dump_cached(value: Any) -> Any:
+        """Convert models (or lists of models) to JSON-safe data."""
+        if isinstance(value, BaseModel):
+            return value.model_dump(mode='json')
+        if isinstance(value, list):
+            return [v.model_dump(mode='json') if isinstance(v, BaseModel) else v for v in value]
+        return value
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """In-memory cache counters and coalesced call count for this tool."""
+        stats = self.memory_cache.stats() if self.memory_cache is not None else {}
+        if stats:
+            stats["coalesced"] = self._single_flight.coalesced
+        return stats
     
     def _handle_error(self, error: Exception, context: str) -> None:
         """Standardized error handling."""
@@ -2,31 +2,143 @@
 GitHub integration tool using LangChain.
 Provides tools for searching PRs, reading diffs, checking code.
 """
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import contextvars
+import threading
+import time
 from github import Github, GithubException
+from github.Requester import HTTPRequestsConnectionClass, HTTPSRequestsConnectionClass, Requester
+from urllib3.util.retry import Retry
 from langchain.tools import tool
 import json
 import re
 from datetime import datetime
 from src.config.settings import settings
-from src.schemas.data_models import GitHubPR
-from src.tools.base_tool import BaseTool
+from src.schemas.data_models import GitHubPR, PRDiff
+from src.services.git_mirror import GitMirrorError, git_mirror
+from src.services.pr_diff import summarize_files
+from src.services.pr_index import pr_index
+from src.tools.base_tool import BaseTool, NotFoundError, OfflineError, Partial, Validated, cached_method
+from src.utils.http import shared_adapter
 from src.utils.logger import logger
+from src.utils.rate_limit import BACKGROUND, RateLimitedAdapter, github_scheduler, request_priority
+
+
+# Fields of a PR fetched by get_pr_details_many (everything GitHubPR needs)
+_PR_FRAGMENT = """
+fragment PRFields on PullRequest {
+  databaseId number title body state url
+  author { login }
+  createdAt updatedAt mergedAt
+  mergedBy { login }
+  baseRefName headRefName
+  changedFiles additions deletions
+  labels(first: 100) { nodes { name } }
+  files(first: 10) { nodes { path } }
+}
+"""
+
+
+def repo_from_pr_url(url: str) -> str:
+    """Extract "owner/repo" from a PR html URL."""
+    parts = str(url).split('/')
+    return f"{parts[-4]}/{parts[-3]}"
+
+
+def _linked_issues(text: str) -> List[str]:
+    """Jira ticket keys (like DEV-123) mentioned in text."""
+    return list(set(re.findall(r'[A-Z]+-\d+', text)))
+
+
+def _diff_summary(changed_files: List[str], total: int) -> str:
+    """Summary of the first changed files of a PR."""
+    summary = f"Changed files: {', '.join(changed_files)}"
+    if total > 10:
+        summary += f" (and {total - 10} more)"
+    return summary
+
+
+class _ScheduledConnection:
+    """
+    PyGithub connection that sends requests through the rate-limit scheduler.
+    
+    PyGithub creates one connection object per request once custom connection
+    classes are injected, so all of them (from every thread's client) mount one
+    shared, pooled adapter per host.
+    """
+    
+    def _use_shared_adapter(self):
+        adapter = shared_adapter(
+            f"github:{self.protocol}://{self.host}:{self.port}",
+            lambda: RateLimitedAdapter(github_scheduler, max_retries=self.retry, pool_size=self.pool_size)
+        )
+        self.session.mount(f"{self.protocol}://", adapter)
+    
+    def close(self):
+        # Closing the session would close the shared adapter's pooled connections
+        pass
+
+
+class _ScheduledHTTPConnection(_ScheduledConnection, HTTPRequestsConnectionClass):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._use_shared_adapter()
+
+
+class _ScheduledHTTPSConnection(_ScheduledConnection, HTTPSRequestsConnectionClass):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._use_shared_adapter()
 
 
 class GitHubTool(BaseTool):
     """Tool for interacting with GitHub."""
     
-    def _init_client(self):
-        """Initialize GitHub client."""
+    def __init__(self, cache_enabled: bool = None):
+        super().__init__(cache_enabled)
+        self._timings_lock = threading.Lock()
+        self._repo_timings: Dict[str, Dict[str, float]] = {}
+        # Per-repo workers, shared by all _fan_out calls (their threads keep their clients)
+        self._fan_out_lock = threading.Lock()
+        self._fan_out_executor: Optional[ThreadPoolExecutor] = None
+    
+    def _init_client(self) -> Github:
+        """Initialize a GitHub client on the shared, rate-limited connection pool."""
         try:
-            self.client = Github(settings.github_token)
-            self.org = self.client.get_organization(settings.github_org)
+            # Rate limits are handled by github_scheduler (pacing, sleep until reset);
+            # urllib3 only retries transient server errors.
+            Requester.injectConnectionClasses(_ScheduledHTTPConnection, _ScheduledHTTPSConnection)
+            client = Github(
+                settings.github_token,
+                retry=Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504)),
+                pool_size=settings.http_pool_size,
+                per_page=100,  # fewer pages for file lists and PR syncs
+                seconds_between_requests=None
+            )
             logger.info("GitHub client initialized successfully")
+            return client
         except Exception as e:
             logger.error(f"Failed to initialize GitHub client: {e}")
             raise
     
+    @property
+    def org(self):
+        """The configured GitHub organization."""
+        return self._handle("org", lambda: self.client.get_organization(settings.github_org))
+    
+    def _repo(self, repo_name: str):
+        """Repository handle, built without an API request and memoized per thread."""
+        return self._handle(f"repo:{repo_name}", lambda: self.client.get_repo(repo_name, lazy=True))
+    
+    def _item_tags(self, item) -> Iterable[str]:
+        """Tag PRs with their repo, PR reference and referenced Jira tickets."""
+        if not isinstance(item, GitHubPR):
+            return ()
+        repo = repo_from_pr_url(item.url)
+        return [f"repo:{repo}", f"pr:{repo}#{item.number}"] + [f"ticket:{key}" for key in item.linked_issues]
+    
+    @cached_method(GitHubPR)
     def search_prs(
         self,
         query: str,
@@ -37,42 +149,66 @@ class GitHubTool(BaseTool):
         """
         Search pull requests.
         
+        With settings.pr_index_enabled the search runs against the local PR index
+        (full history, phrase match on title, body and labels, at most max_results
+        hits), updating it first if it is older than settings.pr_index_sync_interval.
+        Otherwise, and for repos never synced (see `lyra sync github`), the first
+        max_results PRs of each repo are scanned via the API.
+        
+        Repos are synced or scanned in parallel (see _fan_out). A repo that fails or
+        times out is skipped; the partial result is returned but not cached.
+        
         Args:
             query: Search query (ticket ID, keywords, etc.)
             repo_name: Specific repo to search (optional)
             state: PR state (open, closed, all)
             max_results: Maximum results
-            
+        
         Returns:
             List of GitHubPR models
         """
-        cache_key = self._cache_key("search_prs", query=query, repo=repo_name, state=state)
-        cached = self._get_cached(cache_key)
-        if cached:
-            return [GitHubPR(**pr) for pr in cached]
+        cache_key = self._call_key()
+        repos_to_search = [repo_name] if repo_name else settings.github_repo_list
         
-        try:
-            prs = []
-            repos_to_search = [repo_name] if repo_name else settings.github_repo_list
+        if settings.pr_index_enabled:
+            ready, _ = self._fan_out(repos_to_search, self._ensure_indexed, "PR index sync", timeout=None)
+            if all(ready.get(repo) for repo in repos_to_search):
+                prs = pr_index.search(query, repos_to_search, state, max_results)
+                logger.info(f"Found {len(prs)} PRs matching: {query} (local index)")
+                return prs
+        
+        def scan_repo(repo_full_name: str) -> List[GitHubPR]:
+            logger.debug(f"Searching PRs in {repo_full_name} for: {query}")
+            repo = self._repo(repo_full_name)
             
-            for repo_full_name in repos_to_search:
-                logger.debug(f"Searching PRs in {repo_full_name} for: {query}")
-                repo = self.client.get_repo(repo_full_name)
-                
-                # Search in title and body
-                pulls = repo.get_pulls(state=state)
-                for pr in pulls[:max_results]:
-                    if query.lower() in pr.title.lower() or (pr.body and query.lower() in pr.body.lower()):
-                        pr_model = self._pr_to_model(pr)
-                        prs.append(pr_model)
+            # Search in title and body
+            matches = []
+            pulls = repo.get_pulls(state=state)
+            for pr in pulls[:max_results]:
+                if query.lower() in pr.title.lower() or (pr.body and query.lower() in pr.body.lower()):
+                    matches.append(self._pr_to_model(pr))
+            self._remember_prs(repo_full_name, matches)
+            return matches
+        
+        def fetch() -> List[GitHubPR]:
+            results, errors = self._fan_out(repos_to_search, scan_repo, "search_prs")
+            if errors and not results:
+                raise RuntimeError(f"PR search failed in every repo: {errors}")
             
-            self._set_cached(cache_key, [pr.model_dump() for pr in prs])
+            # Merge in configured repo order, whatever order the repos finished in
+            prs = [pr for repo in repos_to_search for pr in results.get(repo, [])]
             logger.info(f"Found {len(prs)} PRs matching: {query}")
-            return prs
-            
+            return Partial(prs) if errors else prs
+        
+        try:
+            # No cheap conditional check for a multi-repo scan: stale entries refresh in full
+            return self._cached_fetch(
+                cache_key, fetch, GitHubPR, tags=[f"repo:{repo}" for repo in repos_to_search]
+            )
         except Exception as e:
             self._handle_error(e, "search_prs")
     
+    @cached_method(GitHubPR)
     def get_pr_details(self, repo_name: str, pr_number: int) -> GitHubPR:
         """
         Get detailed information about a specific PR.
@@ -80,38 +216,378 @@ class GitHubTool(BaseTool):
         Args:
             repo_name: Repository name (e.g., "your-org/developerhub")
             pr_number: PR number
-            
+        
         Returns:
             GitHubPR model
         """
-        cache_key = self._cache_key("get_pr", repo=repo_name, pr=pr_number)
-        cached = self._get_cached(cache_key)
-        if cached:
-            return GitHubPR(**cached)
+        cache_key = self._call_key()
         
-        try:
+        def fetch() -> Validated:
             logger.debug(f"Fetching PR details: {repo_name}#{pr_number}")
-            repo = self.client.get_repo(repo_name)
+            repo = self._repo(repo_name)
             pr = repo.get_pull(pr_number)
-            pr_model = self._pr_to_model(pr, include_diff=True)
-            
-            self._set_cached(cache_key, pr_model.model_dump())
-            return pr_model
-            
+            model = self._pr_to_model(pr, include_diff=True)
+            self._remember_prs(repo_name, [model])
+            return Validated(model, pr.etag)
+        
+        def revalidate(stale: GitHubPR, etag: Optional[str]) -> Optional[Validated]:
+            # A 304 to If-None-Match does not count against the rate limit
+            if etag:
+                status, _, _ = self.client.requester.requestJson(
+                    "GET", f"/repos/{repo_name}/pulls/{pr_number}", headers={"If-None-Match": etag}
+                )
+                if status == 304:
+                    return None
+            return fetch()
+        
+        try:
+            return self._cached_fetch(
+                cache_key, fetch, GitHubPR, revalidate, tags=[f"repo:{repo_name}", f"pr:{repo_name}#{pr_number}"]
+            )
         except Exception as e:
             self._handle_error(e, f"get_pr_details({repo_name}#{pr_number})")
     
+    @cached_method(PRDiff)
+    def get_pr_diff(
+        self,
+        repo_name: str,
+        pr_number: int,
+        max_files: Optional[int] = None,
+        max_bytes: Optional[int] = None
+    ) -> PRDiff:
+        """
+        Size-capped summary of a PR's changes: line stats per directory and
+        extension, plus the patches of public-API files (settings.public_api_patterns).
+        
+        Files are streamed until max_files files or max_bytes patch bytes have been
+        read, so large PRs cost a bounded number of requests.
+        
+        Args:
+            repo_name: Repository name
+            pr_number: PR number
+            max_files: File budget (default settings.pr_diff_max_files)
+            max_bytes: Patch byte budget (default settings.pr_diff_max_bytes)
+        
+        Returns:
+            PRDiff model
+        """
+        cache_key = self._call_key()
+        
+        def fetch() -> PRDiff:
+            logger.debug(f"Fetching PR diff: {repo_name}#{pr_number}")
+            pr = self._repo(repo_name).get_pull(pr_number)
+            return summarize_files(
+                pr.get_files(), repo_name, pr_number,
+                files_total=pr.changed_files, additions=pr.additions, deletions=pr.deletions,
+                max_files=max_files, max_bytes=max_bytes
+            )
+        
+        try:
+            return self._cached_fetch(
+                cache_key, fetch, PRDiff, tags=[f"repo:{repo_name}", f"pr:{repo_name}#{pr_number}"]
+            )
+        except Exception as e:
+            self._handle_error(e, f"get_pr_diff({repo_name}#{pr_number})")
+    
+    def get_pr_details_many(self, refs: Iterable[Tuple[str, int]]) -> Dict[Tuple[str, int], GitHubPR]:
+        """
+        Get details of many PRs in a few batched GraphQL requests.
+        
+        Each PR is cached under the same key as get_pr_details, so later single
+        lookups are cache hits, and PRs already cached are not fetched again.
+        Up to settings.github_graphql_batch_size PRs go into one request. PRs that
+        do not exist are cached as not found and left out of the result.
+        
+        Args:
+            refs: (repo name, PR number) pairs
+        
+        Returns:
+            GitHubPR per (repo name, PR number), in the order of refs
+        """
+        refs = list(dict.fromkeys((repo_name, int(number)) for repo_name, number in refs))
+        found: Dict[Tuple[str, int], GitHubPR] = {}
+        missing: List[Tuple[str, int]] = []
+        for ref in refs:
+            key = self._pr_details_key(*ref)
+            hit = self._lookup(key, GitHubPR)
+            self._record_lookup(key, hit=hit is not None)
+            if hit is None:
+                missing.append(ref)
+            elif isinstance(hit[0], GitHubPR):
+                found[ref] = hit[0]
+        
+        if missing and settings.offline:
+            raise OfflineError(f"Offline cache miss in {self.__class__.__name__}: details of {len(missing)} PRs")
+        
+        batch_size = settings.github_graphql_batch_size
+        try:
+            for start in range(0, len(missing), batch_size):
+                found.update(self._fetch_pr_batch(missing[start:start + batch_size]))
+        except Exception as e:
+            self._handle_error(e, f"get_pr_details_many({len(missing)} PRs)")
+        return {ref: found[ref] for ref in refs if ref in found}
+    
+    def _pr_details_key(self, repo_name: str, pr_number: int) -> str:
+        """Cache key of get_pr_details(repo_name, pr_number)."""
+        return GitHubTool.get_pr_details.cache_key(self, repo_name, pr_number)
+    
+    def _fetch_pr_batch(self, refs: List[Tuple[str, int]]) -> Dict[Tuple[str, int], GitHubPR]:
+        """Fetch PRs in one GraphQL request and cache each under its get_pr_details key."""
+        by_repo: Dict[str, List[int]] = {}
+        for repo_name, number in refs:
+            by_repo.setdefault(repo_name, []).append(number)
+        
+        selections = []
+        for i, (repo_name, numbers) in enumerate(by_repo.items()):
+            owner, name = repo_name.split("/", 1)
+            pulls = " ".join(f"pr{number}: pullRequest(number: {number}) {{ ...PRFields }}" for number in numbers)
+            selections.append(f"repo{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) {{ {pulls} }}")
+        query = f"query {{ {' '.join(selections)} }}\n{_PR_FRAGMENT}"
+        
+        logger.debug(f"Fetching {len(refs)} PRs from {len(by_repo)} repos via GraphQL")
+        requester = self.client.requester
+        headers, response = requester.requestJsonAndCheck("POST", requester.graphql_url, input={"query": query})
+        data = response.get("data") or {}
+        errors = response.get("errors") or []
+        if not data and errors:
+            raise GithubException(400, response, headers)
+        
+        # Paths like ("repo0",) or ("repo0", "pr12") that GitHub reports as missing
+        not_found = {tuple(error.get("path") or ()) for error in errors if error.get("type") == "NOT_FOUND"}
+        for error in errors:
+            if error.get("type") != "NOT_FOUND":
+                logger.warning(f"GraphQL error for {error.get('path')}: {error.get('message')}")
+        
+        found: Dict[Tuple[str, int], GitHubPR] = {}
+        for i, (repo_name, numbers) in enumerate(by_repo.items()):
+            repo_data = data.get(f"repo{i}") or {}
+            models = []
+            for number in numbers:
+                key = self._pr_details_key(repo_name, number)
+                tags = [f"repo:{repo_name}", f"pr:{repo_name}#{number}"]
+                node = repo_data.get(f"pr{number}")
+                if node is not None:
+                    model = self._graphql_pr_to_model(node)
+                    self._set_cached(key, model, tags=tags)
+                    found[(repo_name, number)] = model
+                    models.append(model)
+                elif (f"repo{i}",) in not_found or (f"repo{i}", f"pr{number}") in not_found:
+                    self._set_not_found(key, NotFoundError(f"PR {repo_name}#{number} not found"), tags)
+            self._remember_prs(repo_name, models)
+        return found
+    
     def find_prs_for_ticket(self, ticket_id: str) -> List[GitHubPR]:
         """
         Find all PRs that reference a specific Jira ticket.
         
         Args:
             ticket_id: Jira ticket ID (e.g., DEV-123)
-            
+        
         Returns:
             List of GitHubPR models
         """
-        return self.search_prs(query=ticket_id)
+        return self.find_prs_for_tickets([ticket_id])[ticket_id]
+    
+    def find_prs_for_tickets(self, ticket_ids: List[str]) -> Dict[str, List[GitHubPR]]:
+        """
+        Find the PRs referencing each of several Jira tickets.
+        
+        With the local PR index this is one query against its ticket-to-PR inverted
+        index, built from the Jira keys found in PR titles and bodies. Without it
+        (disabled, or a repo never synced) each ticket falls back to search_prs.
+        
+        Args:
+            ticket_ids: Jira ticket IDs (e.g. all tickets of a release)
+        
+        Returns:
+            PRs per ticket ID, most recently updated first
+        """
+        repos = settings.github_repo_list
+        if settings.pr_index_enabled:
+            ready, _ = self._fan_out(repos, self._ensure_indexed, "PR index sync", timeout=None)
+            if all(ready.get(repo) for repo in repos):
+                return pr_index.prs_for_tickets(ticket_ids, repos)
+        return {ticket_id: self.search_prs(query=ticket_id) for ticket_id in ticket_ids}
+    
+    def _remember_prs(self, repo_name: str, prs: List[GitHubPR]):
+        """Add PRs fetched outside a sync to the local index (and its ticket links)."""
+        if not settings.pr_index_enabled or not prs:
+            return
+        try:
+            pr_index.upsert(repo_name, prs)
+        except Exception as e:
+            logger.warning(f"Could not add PRs of {repo_name} to the local index: {e}")
+    
+    def sync_pr_index(
+        self,
+        repo_name: Optional[str] = None,
+        full: bool = False
+    ) -> Tuple[Dict[str, int], Dict[str, str]]:
+        """
+        Incrementally sync the local PR index, repos in parallel.
+        
+        Args:
+            repo_name: Repository to sync (default: all configured repos)
+            full: Ignore the watermark and re-fetch the full PR history
+        
+        Returns:
+            (PRs fetched per repo, error message per failed repo)
+        """
+        repos = [repo_name] if repo_name else settings.github_repo_list
+        # Full-history syncs can legitimately take minutes: no per-repo timeout.
+        # Syncs yield API quota to interactive calls.
+        with request_priority(BACKGROUND):
+            return self._fan_out(repos, lambda repo: self._sync_repo_prs(repo, full), "PR index sync", timeout=None)
+    
+    def _fan_out(
+        self,
+        repos: List[str],
+        fn: Callable[[str], Any],
+        label: str,
+        timeout: Optional[float] = -1
+    ) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """
+        Run fn(repo) for each repo on the tool's shared thread pool (settings.github_max_workers).
+        
+        Each repo gets its own timeout, counted from when its call starts (or from
+        when we start waiting for it, if it is still queued). Errors and timeouts are
+        isolated per repo and recorded in repo_timings(). fn must not call _fan_out
+        itself: it would wait for workers of the pool it is running on.
+        
+        Args:
+            repos: Repository names
+            fn: Per-repo function
+            label: Operation name for logs
+            timeout: Seconds per repo; -1 means settings.github_repo_timeout, None no limit
+        
+        Returns:
+            (results, errors), both keyed by repo in the order of repos
+        """
+        if timeout == -1:
+            timeout = settings.github_repo_timeout
+        started: Dict[str, float] = {}
+        
+        def run(repo: str) -> Any:
+            started[repo] = time.monotonic()
+            try:
+                return fn(repo)
+            finally:
+                self._record_timing(repo, time.monotonic() - started[repo])
+        
+        results: Dict[str, Any] = {}
+        errors: Dict[str, str] = {}
+        with self._fan_out_lock:
+            if self._fan_out_executor is None:
+                self._fan_out_executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.github_max_workers), thread_name_prefix="github-fanout"
+                )
+        # Each call gets a copy of the caller's context (request priority)
+        futures = {
+            repo: self._fan_out_executor.submit(contextvars.copy_context().run, run, repo) for repo in repos
+        }
+        try:
+            for repo, future in futures.items():
+                remaining = None
+                if timeout is not None:
+                    start = started.get(repo)
+                    remaining = timeout if start is None else max(0.0, start + timeout - time.monotonic())
+                try:
+                    results[repo] = future.result(timeout=remaining)
+                except FutureTimeout:
+                    future.cancel()
+                    errors[repo] = f"timed out after {timeout}s"
+                    self._record_timing(repo, None)
+                except Exception as e:
+                    errors[repo] = str(e)
+                    self._record_timing(repo, None, failed=True)
+        finally:
+            # Timed-out calls finish (and are discarded) in the background; queued ones are dropped
+            for future in futures.values():
+                future.cancel()
+        
+        for repo, error in errors.items():
+            logger.warning(f"{label} failed for {repo}: {error}")
+        return results, errors
+    
+    def _record_timing(self, repo: str, elapsed: Optional[float], failed: bool = False):
+        """Accumulate a call duration (or a timeout/failure when elapsed is None)."""
+        with self._timings_lock:
+            timing = self._repo_timings.setdefault(
+                repo, {"calls": 0, "total_s": 0.0, "max_s": 0.0, "errors": 0, "timeouts": 0}
+            )
+            if elapsed is not None:
+                timing["calls"] += 1
+                timing["total_s"] += elapsed
+                timing["max_s"] = max(timing["max_s"], elapsed)
+            elif failed:
+                timing["errors"] += 1
+            else:
+                timing["timeouts"] += 1
+    
+    def repo_timings(self) -> Dict[str, Dict[str, float]]:
+        """Per-repo call count, average/max seconds, errors and timeouts, slowest first."""
+        with self._timings_lock:
+            rows = {
+                repo: {
+                    "calls": t["calls"],
+                    "avg_s": round(t["total_s"] / t["calls"], 3) if t["calls"] else 0.0,
+                    "max_s": round(t["max_s"], 3),
+                    "errors": t["errors"],
+                    "timeouts": t["timeouts"],
+                }
+                for repo, t in self._repo_timings.items()
+            }
+        return dict(sorted(rows.items(), key=lambda item: item[1]["avg_s"], reverse=True))
+    
+    def _sync_repo_prs(self, repo_name: str, full: bool = False) -> int:
+        """Fetch PRs updated since the watermark (newest first) into the index."""
+        if full:
+            pr_index.reset(repo_name)
+        watermark = pr_index.watermark(repo_name)
+        newest = watermark
+        batch: List[GitHubPR] = []
+        fetched = 0
+        
+        repo = self._repo(repo_name)
+        for pr in repo.get_pulls(state="all", sort="updated", direction="desc"):
+            if watermark and pr.updated_at < watermark:
+                break
+            batch.append(self._pr_to_model(pr))
+            newest = max(newest, pr.updated_at) if newest else pr.updated_at
+            if len(batch) >= 100:
+                pr_index.upsert(repo_name, batch)
+                fetched += len(batch)
+                batch = []
+        if batch:
+            pr_index.upsert(repo_name, batch)
+            fetched += len(batch)
+        
+        # Only a completed sync moves the watermark, so an interrupted one resumes safely
+        pr_index.mark_synced(repo_name, newest)
+        logger.info(f"Synced {fetched} PRs of {repo_name} into the local index")
+        return fetched
+    
+    def _ensure_indexed(self, repo_name: str) -> bool:
+        """
+        Update repo's PR index if it is due. Returns whether the index can answer for repo.
+        
+        Only incremental updates run here, so callers need no per-repo timeout. The
+        first, full-history sync can take minutes and is left to `lyra sync github`;
+        until then the repo is searched via the API. A failed update falls back to
+        the existing index. Offline, the index is used as is.
+        """
+        last_synced = pr_index.last_synced(repo_name)
+        if last_synced is None:
+            logger.debug(f"PR index of {repo_name} not synced yet (lyra sync github), using the API")
+            return False
+        if settings.offline or time.time() - last_synced < settings.pr_index_sync_interval:
+            return True
+        
+        try:
+            self._single_flight.do(f"sync:{repo_name}", lambda: self._sync_repo_prs(repo_name))
+        except Exception as e:
+            logger.warning(f"PR index sync failed for {repo_name}: {e}")
+        return True
     
     def get_file_content(self, repo_name: str, file_path: str, branch: str = "main") -> str:
         """
@@ -121,18 +597,30 @@ class GitHubTool(BaseTool):
             repo_name: Repository name
             file_path: Path to file
             branch: Branch name
-            
+        
         Returns:
             File content as string
         """
+        if settings.git_mirror_enabled:
+            try:
+                content = git_mirror.read(repo_name, file_path, ref=branch)
+                if content is None:
+                    logger.warning(f"Could not fetch {file_path}: not found in {repo_name}@{branch}")
+                    return ""
+                return content.decode('utf-8')
+            except GitMirrorError as e:
+                logger.warning(f"Git mirror unavailable for {repo_name}, using the API: {e}")
         try:
-            repo = self.client.get_repo(repo_name)
+            repo = self._repo(repo_name)
             content = repo.get_contents(file_path, ref=branch)
             return content.decoded_content.decode('utf-8')
+        except OfflineError:
+            raise
         except Exception as e:
             logger.warning(f"Could not fetch {file_path}: {e}")
             return ""
     
+    @cached_method()
     def check_file_exists(self, repo_name: str, file_path: str, branch: str = "main") -> bool:
         """
         Check if a file exists in the repository.
@@ -141,34 +629,68 @@ class GitHubTool(BaseTool):
             repo_name: Repository name
             file_path: Path to file
             branch: Branch name
-            
+        
         Returns:
             True if file exists
         """
-        try:
-            repo = self.client.get_repo(repo_name)
+        cache_key = self._call_key()
+        local = self._mirror_exists(repo_name, [file_path], branch)
+        if local is not None:
+            return local[file_path]
+        
+        def fetch() -> bool:
+            repo = self._repo(repo_name)
             repo.get_contents(file_path, ref=branch)
             return True
-        except GithubException:
+        
+        try:
+            # Missing files are cached as not-found for settings.cache_negative_ttl
+            return self._cached_fetch(cache_key, fetch, tags=[f"repo:{repo_name}"])
+        except (NotFoundError, GithubException):
             return False
     
+    def check_files_exist(self, repo_name: str, paths: List[str], branch: str = "main") -> Dict[str, bool]:
+        """
+        Check which of many paths exist in the repository.
+        
+        With settings.git_mirror_enabled this is one local lookup in the repo's git
+        mirror; otherwise (or if the mirror is unavailable) each path is checked
+        through the cached Contents API calls of check_file_exists.
+        
+        Args:
+            repo_name: Repository name
+            paths: Paths to files or directories
+            branch: Branch, tag or commit SHA
+        
+        Returns:
+            Existence per path, in the order given
+        """
+        local = self._mirror_exists(repo_name, paths, branch)
+        if local is not None:
+            return local
+        return {path: self.check_file_exists(repo_name, path, branch) for path in paths}
+    
+    def _mirror_exists(self, repo_name: str, paths: List[str], branch: str) -> Optional[Dict[str, bool]]:
+        """Existence of paths from the git mirror, or None if it is disabled or unavailable."""
+        if not settings.git_mirror_enabled:
+            return None
+        try:
+            return git_mirror.exists(repo_name, paths, ref=branch)
+        except GitMirrorError as e:
+            logger.warning(f"Git mirror unavailable for {repo_name}, using the API: {e}")
+            return None
+    
     def _pr_to_model(self, pr, include_diff: bool = False) -> GitHubPR:
         """Convert GitHub PR to GitHubPR model."""
         # Extract linked Jira tickets from title and body
-        linked_issues = []
-        text_to_search = f"{pr.title} {pr.body or ''}"
-        # Match JIRA ticket patterns like DEV-123
-        matches = re.findall(r'[A-Z]+-\d+', text_to_search)
-        linked_issues = list(set(matches))
+        linked_issues = _linked_issues(f"{pr.title} {pr.body or ''}")
         
         # Get diff summary if requested
         diff_summary = None
         if include_diff:
             files = pr.get_files()
             changed_files = [f.filename for f in files[:10]]  # First 10 files
-            diff_summary = f"Changed files: {', '.join(changed_files)}"
-            if pr.changed_files > 10:
-                diff_summary += f" (and {pr.changed_files - 10} more)"
+            diff_summary = _diff_summary(changed_files, pr.changed_files)
         
         return GitHubPR(
             id=pr.id,
@@ -191,6 +713,31 @@ class GitHubTool(BaseTool):
             labels=[label.name for label in pr.labels],
             url=pr.html_url
         )
+    
+    def _graphql_pr_to_model(self, node: Dict[str, Any]) -> GitHubPR:
+        """Convert a PRFields GraphQL node to the same GitHubPR model as _pr_to_model."""
+        files = [f["path"] for f in node["files"]["nodes"]]
+        return GitHubPR(
+            id=node["databaseId"],
+            number=node["number"],
+            title=node["title"],
+            body=node["body"] or None,
+            state="open" if node["state"] == "OPEN" else "closed",
+            author=node["author"]["login"] if node["author"] else "ghost",
+            created_at=node["createdAt"],
+            updated_at=node["updatedAt"],
+            merged_at=node["mergedAt"],
+            merged_by=node["mergedBy"]["login"] if node["mergedBy"] else None,
+            base_branch=node["baseRefName"],
+            head_branch=node["headRefName"],
+            files_changed=node["changedFiles"],
+            additions=node["additions"],
+            deletions=node["deletions"],
+            diff_summary=_diff_summary(files, node["changedFiles"]),
+            linked_issues=_linked_issues(f"{node['title']} {node['body'] or ''}"),
+            labels=[label["name"] for label in node["labels"]["nodes"]],
+            url=node["url"]
+        )
 
 
 # LangChain tool wrappers
@@ -206,7 +753,7 @@ def search_github_prs(query: str, repo_name: Optional[str] = None, max_results:
         query: Search query (ticket ID, keywords, etc.)
         repo_name: Optional specific repository to search
         max_results: Maximum number of results
-        
+    
     Returns:
         JSON string with list of PRs
     """
@@ -222,7 +769,7 @@ def get_github_pr(repo_name: str, pr_number: int) -> str:
     Args:
         repo_name: Repository name (e.g., "your-org/developerhub")
         pr_number: PR number
-        
+    
     Returns:
         JSON string with PR details
     """
@@ -237,7 +784,7 @@ def find_github_prs_for_ticket(ticket_id: str) -> str:
     
     Args:
         ticket_id: Jira ticket ID (e.g., DEV-123)
-        
+    
     Returns:
         JSON string with list of PRs
     """
@@ -255,7 +802,7 @@ def check_github_file_exists(repo_name: str, file_path: str, branch: str = "main
         repo_name: Repository name
         file_path: Path to file
         branch: Branch name (default: main)
-        
+    
     Returns:
         JSON string with existence check result
     """
@@ -2,156 +2,649 @@
 Jira integration tool using LangChain.
 Provides tools for searching tickets, reading comments, following links.
 """
-from typing import List, Optional
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import contextvars
+import math
+import threading
+import time
 from jira import JIRA
 from langchain.tools import tool
-from datetime import datetime
+from datetime import datetime, timezone
 import json
 from src.config.settings import settings
 from src.schemas.data_models import JiraTicket, JiraComment
-from src.tools.base_tool import BaseTool
+from src.services.jira_index import jira_index, translate_jql
+from src.tools.base_tool import BaseTool, NotFoundError, OfflineError, cached_method
+from src.utils.http import mount_shared
 from src.utils.logger import logger
 
 
+# Fields _issue_to_model reads for list views: no description, comments or custom fields
+_SUMMARY_FIELDS = (
+    "summary,status,priority,issuetype,assignee,reporter,created,updated,"
+    "resolutiondate,fixVersions,components,labels,issuelinks"
+)
+
+# Field projection profiles: name -> (Jira fields=, expand=), from lean to rich;
+# each profile's fields include the previous one's. The changelog is never read,
+# so no profile expands it. Comments are loaded separately (see load_comments).
+FIELD_PROFILES = {
+    # Ticket lists: triage data and links
+    "summary": (_SUMMARY_FIELDS, None),
+    # Decision distillation: adds the description
+    "release": (_SUMMARY_FIELDS + ",description", None),
+    # Everything Jira has, including custom fields
+    "full": ("*all", None),
+}
+
+
+def field_profile(profile: str) -> Tuple[str, Optional[str]]:
+    """(fields, expand) request parameters of a field projection profile."""
+    try:
+        return FIELD_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown Jira field profile {profile!r}, expected one of {sorted(FIELD_PROFILES)}")
+
+
 class JiraTool(BaseTool):
     """Tool for interacting with Jira."""
     
-    def _init_client(self):
-        """Initialize Jira client."""
+    def __init__(self, cache_enabled: bool = None):
+        super().__init__(cache_enabled)
+        # (version, deployment type) from the first client's server_info call
+        self._server_info: Optional[Tuple[tuple, Optional[str]]] = None
+        # Page fetchers and comment loaders, shared by all calls (their threads keep their clients)
+        self._executor_lock = threading.Lock()
+        self._page_executor: Optional[ThreadPoolExecutor] = None
+        self._comment_executor: Optional[ThreadPoolExecutor] = None
+    
+    def _init_client(self) -> JIRA:
+        """Initialize a Jira client on the shared "jira" connection pool."""
         try:
-            self.client = JIRA(
+            client = JIRA(
                 server=settings.jira_server,
-                basic_auth=(settings.jira_user, settings.jira_api_token)
+                basic_auth=(settings.jira_user, settings.jira_api_token),
+                # Only the first client asks the server what it is; the others reuse the answer
+                get_server_info=self._server_info is None
             )
+            if self._server_info is None:
+                self._server_info = (client._version, client.deploymentType)
+            else:
+                client._version, client.deploymentType = self._server_info
+            mount_shared(client._session, "jira")
             logger.info("Jira client initialized successfully")
+            return client
         except Exception as e:
             logger.error(f"Failed to initialize Jira client: {e}")
             raise
     
+    def _item_tags(self, item) -> Iterable[str]:
+        """Tag tickets with their key, project and fix versions."""
+        if not isinstance(item, JiraTicket):
+            return ()
+        tags = [f"ticket:{item.key}", f"project:{item.key.split('-')[0]}"]
+        return tags + [f"release:{version}" for version in item.fix_versions]
+    
+    @cached_method(JiraTicket)
     def search_tickets(
         self, 
         jql: str, 
-        max_results: int = 50,
-        expand_comments: bool = True
+        max_results: Optional[int] = 50,
+        profile: str = "summary"
     ) -> List[JiraTicket]:
         """
         Search Jira tickets using JQL.
         
+        With settings.jira_index_enabled, queries on settings.project_key that the
+        local Jira mirror can translate are answered from it (updating it first if it
+        is older than settings.jira_index_sync_interval); others, and all of them until
+        `lyra sync jira` has run, go to Jira.
+        
         Args:
             jql: JQL query string
-            max_results: Maximum number of results
-            expand_comments: Whether to fetch comments
-            
+            max_results: Maximum number of results (None: all, paged as in iter_tickets)
+            profile: Field projection profile (see FIELD_PROFILES)
+        
         Returns:
             List of JiraTicket models
         """
-        cache_key = self._cache_key("search_tickets", jql=jql, max_results=max_results)
-        cached = self._get_cached(cache_key)
-        if cached:
-            return [JiraTicket(**t) for t in cached]
+        cache_key = self._call_key()
+        fields, expand = field_profile(profile)
         
-        try:
+        mirrored = self._search_mirror(jql, max_results, profile)
+        if mirrored is not None:
+            return mirrored
+        
+        def fetch() -> List[JiraTicket]:
             logger.info(f"Searching Jira with JQL: {jql}")
-            expand_fields = "changelog" if expand_comments else None
-            issues = self.client.search_issues(
-                jql, 
-                maxResults=max_results,
-                expand=expand_fields
-            )
-            
-            tickets = []
-            for issue in issues:
-                ticket = self._issue_to_model(issue, expand_comments)
-                tickets.append(ticket)
-            
-            # Cache results
-            self._set_cached(cache_key, [t.model_dump() for t in tickets])
-            
+            tickets = [
+                self._issue_to_model(issue)
+                for issue in self._iter_issues(jql, limit=max_results, fields=fields, expand=expand)
+            ]
             logger.info(f"Found {len(tickets)} tickets")
             return tickets
-            
+        
+        def revalidate(stale: List[JiraTicket], _validator: Optional[str]) -> Optional[List[JiraTicket]]:
+            # Cheap check: same query, only the "updated" field of each hit
+            issues = self._iter_issues(jql, limit=max_results, fields="updated")
+            current = [(issue.key, self._parse_datetime(issue.fields.updated)) for issue in issues]
+            if current == [(t.key, t.updated) for t in stale]:
+                return None
+            return fetch()
+        
+        try:
+            return self._cached_fetch(cache_key, fetch, JiraTicket, revalidate)
         except Exception as e:
             self._handle_error(e, "search_tickets")
     
-    def get_ticket_details(self, ticket_id: str, include_comments: bool = True) -> JiraTicket:
+    def iter_tickets(
+        self,
+        jql: str,
+        page_size: Optional[int] = None,
+        profile: str = "summary"
+    ) -> Iterator[JiraTicket]:
+        """
+        Stream all tickets matching jql, page by page.
+        
+        The first page is yielded as soon as it arrives, so callers can start
+        working while later pages are in flight. A completed stream is cached as
+        search_tickets(jql, max_results=None) and replayed from there next time.
+        Queries the local Jira mirror can answer are served from it, as in search_tickets.
+        
+        Args:
+            jql: JQL query string
+            page_size: Tickets per request (default settings.jira_page_size)
+            profile: Field projection profile (see FIELD_PROFILES)
+        
+        Yields:
+            JiraTicket models, in JQL order
+        """
+        fields, expand = field_profile(profile)
+        mirrored = self._search_mirror(jql, None, profile)
+        if mirrored is not None:
+            yield from mirrored
+            return
+        
+        key = JiraTool.search_tickets.cache_key(self, jql, None, profile)
+        hit = self._lookup(key, JiraTicket)
+        self._record_lookup(key, hit=hit is not None)
+        if hit is not None and isinstance(hit[0], list):
+            yield from hit[0]
+            return
+        if settings.offline:
+            raise OfflineError(f"Offline cache miss in {self.__class__.__name__}: iter_tickets(jql={jql!r})")
+        
+        logger.info(f"Streaming Jira search: {jql}")
+        tickets = []
+        for issue in self._iter_issues(jql, page_size=page_size, fields=fields, expand=expand):
+            ticket = self._issue_to_model(issue)
+            tickets.append(ticket)
+            yield ticket
+        # Only complete results are cached (not when the caller stops early)
+        self._store_fetched(key, tickets)
+    
+    def _search_mirror(self, jql: str, limit: Optional[int], profile: str) -> Optional[List[JiraTicket]]:
+        """Tickets for jql from the local Jira mirror, or None if it cannot answer."""
+        if not settings.jira_index_enabled or translate_jql(jql) is None or not self._ensure_mirrored():
+            return None
+        tickets = jira_index.search(jql, [settings.project_key], limit)
+        if tickets is None:
+            return None
+        logger.info(f"Found {len(tickets)} tickets for JQL: {jql} (local mirror)")
+        # Keep results the shape a live search with this profile has
+        fields = field_profile(profile)[0].split(",")
+        if "*all" in fields:
+            return tickets
+        update = {"comments": []}
+        if "description" not in fields:
+            update["description"] = ""
+        return [ticket.model_copy(update=update) for ticket in tickets]
+    
+    def sync_jira_index(self, full: bool = False) -> int:
+        """
+        Incrementally sync the local Jira mirror of settings.project_key.
+        
+        Fetches the issues updated since the previous sync started (all issues on the
+        first or a full sync, which also drops mirrored tickets that no longer exist),
+        with the release profile's fields plus comments.
+        
+        Args:
+            full: Ignore the watermark and re-fetch every issue
+        
+        Returns:
+            Number of issues fetched
+        """
+        project = settings.project_key
+        if full:
+            jira_index.reset(project)
+        watermark = jira_index.watermark(project)
+        started = datetime.now(timezone.utc)
+        
+        jql = f'project = "{project}"'
+        if watermark:
+            # Relative dates do not depend on the time zone of the Jira user's profile
+            minutes = math.ceil(((started - watermark).total_seconds() + settings.jira_index_sync_overlap) / 60)
+            jql += f' AND updated >= "-{minutes}m"'
+        jql += " ORDER BY updated ASC"
+        
+        fields, expand = field_profile("release")
+        fields += ",comment"
+        batch: List[JiraTicket] = []
+        seen = set()
+        for issue in self._iter_issues(jql, fields=fields, expand=expand):
+            batch.append(self._issue_to_model(issue))
+            seen.add(issue.key)
+            if len(batch) >= 500:
+                jira_index.upsert(batch)
+                batch = []
+        if batch:
+            jira_index.upsert(batch)
+        if watermark is None:
+            removed = jira_index.prune(project, seen)
+            if removed:
+                logger.info(f"Removed {removed} tickets no longer in {project} from the Jira mirror")
+        
+        # Only a completed sync moves the watermark, so an interrupted one resumes safely
+        jira_index.mark_synced(project, started)
+        logger.info(f"Synced {len(seen)} issues of {project} into the Jira mirror")
+        return len(seen)
+    
+    def _ensure_mirrored(self) -> bool:
+        """
+        Update the Jira mirror if it is due. Returns whether the mirror can answer.
+        
+        Only incremental updates run here. The first, full sync can take minutes and
+        is left to `lyra sync jira`; until then searches go to Jira. A failed update
+        falls back to the existing mirror. Offline, the mirror is used as is.
+        """
+        last_synced = jira_index.last_synced(settings.project_key)
+        if last_synced is None:
+            logger.debug(f"Jira mirror of {settings.project_key} not synced yet (lyra sync jira), using Jira")
+            return False
+        if settings.offline or time.time() - last_synced < settings.jira_index_sync_interval:
+            return True
+        
+        try:
+            self._single_flight.do("sync:jira", self.sync_jira_index)
+        except Exception as e:
+            logger.warning(f"Jira mirror sync failed for {settings.project_key}: {e}")
+        return True
+    
+    def _iter_issues(
+        self,
+        jql: str,
+        limit: Optional[int] = None,
+        page_size: Optional[int] = None,
+        fields: Optional[str] = None,
+        expand: Optional[str] = None,
+        validate: bool = True
+    ) -> Iterator[Any]:
+        """
+        Raw issues matching jql, up to limit (None: all).
+        
+        Jira Server/Data Center pages by offset: once the first page gives the total,
+        the remaining pages are fetched in parallel (settings.jira_page_workers) and
+        yielded in order. Jira Cloud pages by cursor, so the next page is prefetched
+        while the current one is consumed. validate=False lets Server/Data Center
+        ignore unknown keys in the query instead of failing it.
+        """
+        page_size = page_size or settings.jira_page_size
+        if limit is not None:
+            page_size = min(page_size, limit)
+        if page_size <= 0:
+            return
+        fields = fields or "*all"
+        
+        with self._executor_lock:
+            if self._page_executor is None:
+                self._page_executor = ThreadPoolExecutor(
+                    max_workers=settings.jira_page_workers, thread_name_prefix="jira-pages"
+                )
+        if self.client.deploymentType == "Cloud":
+            pages = self._cloud_pages(self._page_executor, jql, limit, page_size, fields, expand)
+        else:
+            pages = self._offset_pages(self._page_executor, jql, limit, page_size, fields, expand, validate)
+        
+        seen = set()
+        with closing(pages):
+            for page in pages:
+                for issue in page:
+                    # Offset pages can overlap when tickets change mid-search
+                    if issue.key in seen:
+                        continue
+                    seen.add(issue.key)
+                    yield issue
+                    if limit is not None and len(seen) >= limit:
+                        return
+    
+    def _offset_pages(self, executor, jql, limit, page_size, fields, expand, validate) -> Iterator[list]:
+        """Pages via startAt: the first one alone, then all others in parallel."""
+        first = self.client.search_issues(
+            jql, startAt=0, maxResults=page_size, validate_query=validate, fields=fields, expand=expand
+        )
+        total = first.total if limit is None else min(first.total, limit)
+        step = len(first) or page_size
+        
+        def fetch_page(start: int) -> list:
+            # Runs on a worker thread, with that thread's client
+            return list(self.client.search_issues(
+                jql, startAt=start, maxResults=min(step, total - start),
+                validate_query=validate, fields=fields, expand=expand
+            ))
+        
+        futures = [
+            executor.submit(contextvars.copy_context().run, fetch_page, start)
+            for start in range(step, total, step)
+        ]
+        if futures:
+            logger.debug(f"Fetching {len(futures)} more pages of {total} Jira results in parallel")
+        try:
+            yield list(first)
+            for future in futures:
+                yield future.result()
+        finally:
+            # Pages not fetched yet when the consumer stops are dropped
+            for future in futures:
+                future.cancel()
+    
+    def _cloud_pages(self, executor, jql, limit, page_size, fields, expand) -> Iterator[list]:
+        """Pages via nextPageToken, one request ahead of the consumer."""
+        def fetch_page(token: Optional[str]):
+            return self.client.enhanced_search_issues(
+                jql, nextPageToken=token, maxResults=page_size, fields=fields, expand=expand
+            )
+        
+        future = executor.submit(contextvars.copy_context().run, fetch_page, None)
+        fetched = 0
+        try:
+            while future is not None:
+                page = future.result()
+                fetched += len(page)
+                token = getattr(page, "nextPageToken", None)
+                more = token and (limit is None or fetched < limit)
+                future = executor.submit(contextvars.copy_context().run, fetch_page, token) if more else None
+                yield list(page)
+        finally:
+            if future is not None:
+                future.cancel()
+    
+    @cached_method(JiraTicket)
+    def get_ticket_details(self, ticket_id: str, profile: str = "release") -> JiraTicket:
         """
         Get detailed information about a specific ticket.
         
         Args:
             ticket_id: Jira ticket ID (e.g., DEV-123)
-            include_comments: Whether to fetch comments
-            
+            profile: Field projection profile (see FIELD_PROFILES)
+        
         Returns:
             JiraTicket model
         """
-        cache_key = self._cache_key("get_ticket", ticket_id=ticket_id)
-        cached = self._get_cached(cache_key)
-        if cached:
-            return JiraTicket(**cached)
+        cache_key = self._call_key()
+        fields, expand = field_profile(profile)
+        
+        def fetch() -> JiraTicket:
+            logger.debug(f"Fetching ticket details: {ticket_id} ({profile})")
+            issue = self.client.issue(ticket_id, fields=fields, expand=expand)
+            return self._issue_to_model(issue)
+        
+        def revalidate(stale: JiraTicket, _validator: Optional[str]) -> Optional[JiraTicket]:
+            issue = self.client.issue(ticket_id, fields="updated")
+            if self._parse_datetime(issue.fields.updated) == stale.updated:
+                return None
+            return fetch()
         
         try:
-            logger.debug(f"Fetching ticket details: {ticket_id}")
-            issue = self.client.issue(ticket_id, expand="changelog")
-            ticket = self._issue_to_model(issue, include_comments)
-            
-            self._set_cached(cache_key, ticket.model_dump())
-            return ticket
-            
+            return self._cached_fetch(cache_key, fetch, JiraTicket, revalidate, tags=[f"ticket:{ticket_id}"])
         except Exception as e:
             self._handle_error(e, f"get_ticket_details({ticket_id})")
     
-    def get_tickets_for_release(self, release_version: str) -> List[JiraTicket]:
+    def load_comments(self, ticket_ids: Iterable[str]) -> Dict[str, List[JiraComment]]:
+        """
+        Comments of many tickets, loaded concurrently (settings.jira_comment_workers).
+        
+        Comments are cached per ticket, apart from ticket metadata, so ticket lookups
+        stay lean and only callers that read comments pay for them. Tickets with many
+        comments are paged (settings.jira_comment_page_size per request).
+        
+        Args:
+            ticket_ids: Jira ticket IDs
+        
+        Returns:
+            Comments per ticket, oldest first; tickets that do not exist are left out
+        """
+        ticket_ids = list(dict.fromkeys(ticket_ids))
+        if not ticket_ids:
+            return {}
+        comments: Dict[str, List[JiraComment]] = {}
+        with self._executor_lock:
+            if self._comment_executor is None:
+                self._comment_executor = ThreadPoolExecutor(
+                    max_workers=settings.jira_comment_workers, thread_name_prefix="jira-comments"
+                )
+        futures = {
+            ticket_id: self._comment_executor.submit(contextvars.copy_context().run, self._ticket_comments, ticket_id)
+            for ticket_id in ticket_ids
+        }
+        for ticket_id, future in futures.items():
+            try:
+                comments[ticket_id] = future.result()
+            except NotFoundError:
+                logger.warning(f"Ticket {ticket_id} not found, no comments loaded")
+            except Exception as e:
+                self._handle_error(e, f"load_comments({ticket_id})")
+        return comments
+    
+    def with_comments(self, ticket: JiraTicket) -> JiraTicket:
+        """
+        Copy of ticket with its comments, loaded in the calling thread.
+        
+        For many tickets, load their comments in one load_comments call instead.
+        """
+        try:
+            comments = self._ticket_comments(ticket.key)
+        except NotFoundError:
+            logger.warning(f"Ticket {ticket.key} not found, no comments loaded")
+            comments = []
+        except Exception as e:
+            self._handle_error(e, f"with_comments({ticket.key})")
+        return ticket.model_copy(update={"comments": comments})
+    
+    def _ticket_comments(self, ticket_id: str) -> List[JiraComment]:
+        """All comments of one ticket, through the cache."""
+        cache_key = self._cache_key("load_comments", JiraComment, ticket_id=ticket_id)
+        
+        def fetch() -> List[JiraComment]:
+            comments: List[JiraComment] = []
+            while True:
+                page = self.client._get_json(
+                    f"issue/{ticket_id}/comment",
+                    params={
+                        "startAt": len(comments),
+                        "maxResults": settings.jira_comment_page_size,
+                        "orderBy": "created"
+                    }
+                )
+                batch = page.get("comments") or []
+                comments.extend(self._comment_to_model(comment) for comment in batch)
+                if not batch or len(comments) >= page.get("total", 0):
+                    break
+            logger.debug(f"Loaded {len(comments)} comments of {ticket_id}")
+            return comments
+        
+        return self._cached_fetch(cache_key, fetch, JiraComment, tags=[f"ticket:{ticket_id}"])
+    
+    def _comment_to_model(self, comment: Dict[str, Any]) -> JiraComment:
+        """Convert a comment from the REST API to a JiraComment model."""
+        return JiraComment(
+            id=comment["id"],
+            author=(comment.get("author") or {}).get("displayName", "Unknown"),
+            body=comment.get("body") or "",
+            created=self._parse_datetime(comment["created"]),
+            updated=self._parse_datetime(comment["updated"]) if comment.get("updated") else None
+        )
+    
+    def get_tickets_for_release(self, release_version: str, profile: str = "summary") -> List[JiraTicket]:
         """
         Get all tickets for a specific release version.
         
         Args:
             release_version: Release version (e.g., "v2.1")
-            
+            profile: Field projection profile (see FIELD_PROFILES)
+        
         Returns:
             List of JiraTicket models
         """
-        jql = f'project = {settings.project_key} AND fixVersion = "{release_version}" ORDER BY created DESC'
-        return self.search_tickets(jql)
+        return self.search_tickets(self._release_jql(release_version), max_results=None, profile=profile)
+    
+    def iter_tickets_for_release(self, release_version: str, profile: str = "summary") -> Iterator[JiraTicket]:
+        """Stream the tickets of a release (see iter_tickets); shares get_tickets_for_release's cache."""
+        return self.iter_tickets(self._release_jql(release_version), profile=profile)
     
-    def follow_linked_issues(self, ticket_id: str) -> List[JiraTicket]:
+    @staticmethod
+    def _release_jql(release_version: str) -> str:
+        return f'project = {settings.project_key} AND fixVersion = "{release_version}" ORDER BY created DESC'
+    
+    def follow_linked_issues(self, ticket_id: str, profile: str = "summary") -> List[JiraTicket]:
         """
         Follow links from a ticket and get all related tickets.
         
         Args:
             ticket_id: Source ticket ID
-            
+            profile: Field projection profile of the linked tickets
+        
         Returns:
             List of linked tickets
         """
         try:
-            issue = self.client.issue(ticket_id)
-            linked_tickets = []
-            
-            # Get linked issues
-            for link in issue.fields.issuelinks:
-                if hasattr(link, 'outwardIssue'):
-                    linked_id = link.outwardIssue.key
-                elif hasattr(link, 'inwardIssue'):
-                    linked_id = link.inwardIssue.key
-                else:
-                    continue
-                
-                linked_ticket = self.get_ticket_details(linked_id)
-                linked_tickets.append(linked_ticket)
+            # Links come from the (cached) ticket itself, so this works offline
+            linked_ids = self.get_ticket_details(ticket_id).linked_issues
+            found = self._tickets_by_key(linked_ids, profile)
+            for linked_id in linked_ids:
+                if linked_id not in found:
+                    logger.warning(f"Linked ticket {linked_id} of {ticket_id} not found, skipping")
+            linked_tickets = [found[linked_id] for linked_id in linked_ids if linked_id in found]
             
             logger.debug(f"Found {len(linked_tickets)} linked tickets for {ticket_id}")
             return linked_tickets
-            
+        
         except Exception as e:
             self._handle_error(e, f"follow_linked_issues({ticket_id})")
     
-    def _issue_to_model(self, issue, include_comments: bool = True) -> JiraTicket:
-        """Convert Jira issue to JiraTicket model."""
+    def crawl_links(
+        self,
+        root_keys: Iterable[str],
+        depth: int = 2,
+        max_nodes: Optional[int] = 200,
+        profile: str = "summary"
+    ) -> List[JiraTicket]:
+        """
+        Walk the link graph around root_keys breadth-first.
+        
+        Each level is resolved with batched "key in (...)" searches
+        (settings.jira_key_batch_size keys per request) rather than one request per
+        ticket, and every ticket fetched is cached under its get_ticket_details key.
+        
+        Args:
+            root_keys: Tickets to start from
+            depth: Link hops followed from the roots (0: roots only)
+            max_nodes: Most tickets visited, roots included (None: no limit)
+            profile: Field projection profile (see FIELD_PROFILES)
+        
+        Returns:
+            Tickets in breadth-first order, roots first; missing tickets are left out
+        """
+        field_profile(profile)
+        frontier = list(dict.fromkeys(root_keys))[:max_nodes]
+        visited = set()
+        tickets: List[JiraTicket] = []
+        try:
+            for level in range(depth + 1):
+                if not frontier:
+                    break
+                visited.update(frontier)
+                found = self._tickets_by_key(frontier, profile)
+                level_tickets = [found[key] for key in frontier if key in found]
+                tickets.extend(level_tickets)
+                logger.debug(f"Link crawl level {level}: {len(level_tickets)} of {len(frontier)} tickets found")
+                
+                budget = None if max_nodes is None else max_nodes - len(visited)
+                frontier = list(dict.fromkeys(
+                    key for ticket in level_tickets for key in ticket.linked_issues if key not in visited
+                ))[:budget]
+            return tickets
+        except Exception as e:
+            self._handle_error(e, f"crawl_links({len(visited)} tickets visited)")
+    
+    def _tickets_by_key(self, keys: Iterable[str], profile: str) -> Dict[str, JiraTicket]:
+        """
+        Tickets for keys from the cache, fetching the rest in batched searches.
+        
+        A ticket cached under a richer profile also serves a leaner one. Keys the
+        search does not return are cached as not found and left out.
+        """
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, JiraTicket] = {}
+        missing = []
+        for key in keys:
+            hit = self._cached_ticket(key, profile)
+            if hit is None:
+                missing.append(key)
+            elif isinstance(hit, JiraTicket):
+                found[key] = hit
+        
+        if missing and settings.offline:
+            raise OfflineError(f"Offline cache miss in {self.__class__.__name__}: {len(missing)} tickets")
+        
+        fields, expand = field_profile(profile)
+        batch_size = settings.jira_key_batch_size
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start:start + batch_size]
+            logger.debug(f"Fetching {len(batch)} tickets in one search")
+            jql = f"key in ({', '.join(batch)})"
+            for issue in self._iter_issues(jql, fields=fields, expand=expand, validate=False):
+                ticket = self._issue_to_model(issue)
+                # A moved ticket comes back under its new key, which is cached but not requested
+                self._store_fetched(self._ticket_key(ticket.key, profile), ticket, tags=[f"ticket:{ticket.key}"])
+                found[ticket.key] = ticket
+            for key in batch:
+                if key not in found:
+                    self._set_not_found(
+                        self._ticket_key(key, profile), NotFoundError(f"Jira ticket {key} not found"),
+                        tags=[f"ticket:{key}"]
+                    )
+        return {key: found[key] for key in keys if key in found}
+    
+    def _cached_ticket(self, ticket_id: str, profile: str) -> Optional[Any]:
+        """Cached ticket (or not-found marker) under profile or any richer one, else None."""
+        profiles = list(FIELD_PROFILES)
+        for name in profiles[profiles.index(profile):]:
+            key = self._ticket_key(ticket_id, name)
+            hit = self._lookup(key, JiraTicket)
+            if hit is not None:
+                self._record_lookup(key, hit=True)
+                return hit[0]
+        self._record_lookup(self._ticket_key(ticket_id, profile), hit=False)
+        return None
+    
+    def _ticket_key(self, ticket_id: str, profile: str) -> str:
+        """Cache key of get_ticket_details(ticket_id, profile)."""
+        return JiraTool.get_ticket_details.cache_key(self, ticket_id, profile)
+    
+    @staticmethod
+    def _parse_datetime(value: str) -> datetime:
+        """Parse a Jira timestamp."""
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    
+    def _issue_to_model(self, issue) -> JiraTicket:
+        """Convert Jira issue to JiraTicket model (fields outside the profile stay empty)."""
         fields = issue.fields
         
         # Parse comments
         comments = []
-        if include_comments and hasattr(fields, 'comment') and fields.comment:
+        if hasattr(fields, 'comment') and fields.comment:
             for comment in fields.comment.comments:
                 comments.append(JiraComment(
                     id=comment.id,
@@ -174,7 +667,7 @@ class JiraTool(BaseTool):
             id=issue.id,
             key=issue.key,
             summary=fields.summary,
-            description=fields.description or "",
+            description=getattr(fields, 'description', None) or "",
             status=fields.status.name,
             priority=fields.priority.name if fields.priority else "Unknown",
             issue_type=fields.issuetype.name,
@@ -204,11 +697,11 @@ def search_jira_tickets(jql: str, max_results: int = 50) -> str:
     Args:
         jql: JQL query string
         max_results: Maximum number of results (default: 50)
-        
+    
     Returns:
         JSON string with list of tickets
     """
-    tickets = jira_tool.search_tickets(jql, max_results)
+    tickets = jira_tool.search_tickets(jql, max_results, profile="summary")
     return json.dumps([t.model_dump(mode='json') for t in tickets], indent=2, default=str)
 
 
@@ -219,11 +712,11 @@ def get_jira_ticket(ticket_id: str) -> str:
     
     Args:
         ticket_id: Jira ticket ID (e.g., DEV-123)
-        
+    
     Returns:
         JSON string with ticket details
     """
-    ticket = jira_tool.get_ticket_details(ticket_id)
+    ticket = jira_tool.with_comments(jira_tool.get_ticket_details(ticket_id, profile="release"))
     return json.dumps(ticket.model_dump(mode='json'), indent=2, default=str)
 
 
@@ -234,11 +727,11 @@ def get_jira_release_tickets(release_version: str) -> str:
     
     Args:
         release_version: Release version (e.g., "v2.1")
-        
+    
     Returns:
         JSON string with list of tickets
     """
-    tickets = jira_tool.get_tickets_for_release(release_version)
+    tickets = jira_tool.get_tickets_for_release(release_version, profile="summary")
     return json.dumps([t.model_dump(mode='json') for t in tickets], indent=2, default=str)
 
 
@@ -249,10 +742,10 @@ def get_linked_jira_tickets(ticket_id: str) -> str:
     
     Args:
         ticket_id: Source ticket ID
-        
+    
     Returns:
         JSON string with list of linked tickets
     """
-    tickets = jira_tool.follow_linked_issues(ticket_id)
+    tickets = jira_tool.follow_linked_issues(ticket_id, profile="summary")
     return json.dumps([t.model_dump(mode='json') for t in tickets], indent=2, default=str)
 
@@ -1,16 +1,33 @@
 """
 Smart tools - Sprint 1 version (Jira + GitHub only)
 """
-from typing import Dict, Any, List
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Tuple
 from langchain.tools import tool
 from langchain_mistralai import ChatMistralAI
+import contextvars
 import json
+import threading
+from src.cache.distillations import distillation_cache
+from src.services.pr_diff import format_pr_diff
 from src.tools.jira_tool import jira_tool
-from src.tools.github_tool import github_tool
+from src.tools.github_tool import github_tool, repo_from_pr_url
 from src.config.settings import settings
 from src.utils.logger import logger
 
 
+# Versions of the prompt templates and of how verdicts are parsed; bump on any change
+# so cached verdicts are not reused (see distillation_cache)
+TICKET_PROMPT_VERSION = "1"
+PR_PROMPT_VERSION = "1"
+
+# Keys a verdict needs per kind; verdicts without them count as parse failures
+VERDICT_KEYS = {
+    "distill_ticket_decision": ("decision", "rationale", "confidence"),
+    "distill_pr_impact": ("impact", "is_breaking"),
+}
+
+
 class SmartToolOrchestrator:
     """Smart tools for Jira and GitHub only (Sprint 1)."""
     
@@ -20,11 +37,16 @@ class SmartToolOrchestrator:
             api_key=settings.mistral_api_key,
             temperature=0
         )
+        # Shared by every distillation, so concurrent releases stay within the limits too
+        self._api_slots = threading.BoundedSemaphore(settings.distill_api_workers)
+        self._llm_slots = threading.BoundedSemaphore(settings.distill_llm_workers)
         logger.info("Smart Tool Orchestrator initialized (Sprint 1: Jira + GitHub)")
     
     def distill_ticket_decision(self, ticket_id: str) -> Dict[str, Any]:
         """Distill Jira ticket into key decision."""
-        ticket = jira_tool.get_ticket_details(ticket_id)
+        # Description and comments are what the decision is distilled from
+        with self._api_slots:
+            ticket = jira_tool.with_comments(jira_tool.get_ticket_details(ticket_id, profile="release"))
         
         comments_text = "\n\n".join([
             f"Comment by {c.author} on {c.created}:\n{c.body}"
@@ -55,10 +77,11 @@ Return ONLY a JSON object with:
 
 If no clear decision was made, set confidence to 0.0.
 """
-        
+
         try:
-            response = self.llm.invoke(prompt)
-            result = json.loads(response.content)
+            result = self._distill(
+                "distill_ticket_decision", TICKET_PROMPT_VERSION, prompt, tags=[f"ticket:{ticket.key}"]
+            )
             
             result["source_ticket"] = ticket_id
             result["ticket_status"] = ticket.status
@@ -66,7 +89,7 @@ If no clear decision was made, set confidence to 0.0.
             
             logger.debug(f"Distilled {ticket_id}: {result['decision'][:50]}...")
             return result
-            
+        
         except Exception as e:
             logger.error(f"Failed to distill ticket {ticket_id}: {e}")
             return {
@@ -77,7 +100,13 @@ If no clear decision was made, set confidence to 0.0.
     
     def distill_pr_impact(self, repo_name: str, pr_number: int) -> Dict[str, Any]:
         """Distill GitHub PR into user impact."""
-        pr = github_tool.get_pr_details(repo_name, pr_number)
+        with self._api_slots:
+            pr = github_tool.get_pr_details(repo_name, pr_number)
+            try:
+                changes = format_pr_diff(github_tool.get_pr_diff(repo_name, pr_number))
+            except Exception as e:
+                logger.warning(f"Could not fetch diff of {repo_name}#{pr_number}: {e}")
+                changes = pr.diff_summary
         
         prompt = f"""You are analyzing a GitHub Pull Request to determine its impact.
 
@@ -89,7 +118,8 @@ Description:
 Files Changed: {pr.files_changed}
 Additions: {pr.additions}
 Deletions: {pr.deletions}
-Diff Summary: {pr.diff_summary}
+Changes:
+{changes}
 
 Linked Issues: {', '.join(pr.linked_issues)}
 
@@ -107,10 +137,11 @@ Return ONLY a JSON object with:
 
 If this is purely internal/refactoring with no user impact, set is_doc_worthy to false.
 """
-        
+
         try:
-            response = self.llm.invoke(prompt)
-            result = json.loads(response.content)
+            result = self._distill(
+                "distill_pr_impact", PR_PROMPT_VERSION, prompt, tags=[f"repo:{repo_name}", f"pr:{repo_name}#{pr_number}"]
+            )
             
             result["source_pr"] = pr_number
             result["repo"] = repo_name
@@ -119,7 +150,7 @@ If this is purely internal/refactoring with no user impact, set is_doc_worthy to
             
             logger.debug(f"Distilled PR #{pr_number}: {result['impact'][:50]}...")
             return result
-            
+        
         except Exception as e:
             logger.error(f"Failed to distill PR {pr_number}: {e}")
             return {
@@ -128,27 +159,98 @@ If this is purely internal/refactoring with no user impact, set is_doc_worthy to
                 "is_doc_worthy": False
             }
     
+    def _distill(self, kind: str, prompt_version: str, prompt: str, tags: List[str]) -> Dict[str, Any]:
+        """
+        LLM verdict (parsed JSON) for prompt, reused from the distillation cache when
+        the same model has seen the exact same prompt before.
+        """
+        key = distillation_cache.key(kind, prompt_version, settings.mistral_model, prompt)
+        verdict = distillation_cache.get(key)
+        if verdict is not None:
+            logger.debug(f"Reusing cached verdict for {kind} ({', '.join(tags)})")
+            return verdict
+        
+        with self._llm_slots:
+            response = self.llm.invoke(prompt)
+        verdict = json.loads(response.content)
+        if not isinstance(verdict, dict) or any(name not in verdict for name in VERDICT_KEYS[kind]):
+            raise ValueError(f"Malformed {kind} verdict, expected a JSON object with {', '.join(VERDICT_KEYS[kind])}")
+        # Only complete verdicts are stored: failures are retried next run
+        distillation_cache.set(key, verdict, tags=tags)
+        return dict(verdict)
+    
+    def _ticket_knowledge(self, ticket_id: str) -> Tuple[Dict[str, Any], list]:
+        """Decision of a ticket and, if it is doc-worthy, the PRs referencing it."""
+        distilled = self.distill_ticket_decision(ticket_id)
+        if not distilled.get("is_doc_worthy", False):
+            return distilled, []
+        with self._api_slots:
+            return distilled, github_tool.find_prs_for_tickets([ticket_id])[ticket_id]
+    
     def get_release_knowledge(self, release_version: str, project_name: str) -> Dict[str, Any]:
-        """Smart aggregator for release (Jira + GitHub only)."""
+        """
+        Smart aggregator for release (Jira + GitHub only).
+        
+        Tickets and PRs are distilled concurrently: at most settings.distill_api_workers
+        Jira/GitHub calls and settings.distill_llm_workers LLM calls run at a time.
+        PRs are only looked up for doc-worthy tickets, each as soon as its decision is in.
+        Results are collected in ticket order, so the output matches a sequential run.
+        """
         logger.info(f"Gathering smart knowledge for {release_version}")
         
-        tickets = jira_tool.get_tickets_for_release(release_version)
+        workers = settings.distill_api_workers + settings.distill_llm_workers
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="distill")
+        
+        def submit(fn, *args) -> Future:
+            return executor.submit(contextvars.copy_context().run, fn, *args)
+        
+        try:
+            # Tickets are streamed: distillation starts on the first page while later pages load
+            ticket_futures: List[Tuple[Any, Future]] = [
+                (ticket, submit(self._ticket_knowledge, ticket.key))
+                for ticket in jira_tool.iter_tickets_for_release(release_version)
+            ]
+            tickets = [ticket for ticket, _ in ticket_futures]
+            prs_by_ticket: Dict[str, list] = {}
+            decisions = []
+            for ticket, future in ticket_futures:
+                distilled, prs = future.result()
+                decisions.append((ticket, distilled))
+                prs_by_ticket[ticket.key] = prs
+            
+            doc_worthy = [
+                (ticket, distilled) for ticket, distilled in decisions if distilled.get("is_doc_worthy", False)
+            ]
+            refs = [
+                (repo_from_pr_url(pr.url), pr.number)
+                for ticket, _ in doc_worthy
+                for pr in prs_by_ticket.get(ticket.key, [])[:3]
+            ]
+            
+            # Details of every PR that will be distilled, in a few GraphQL requests
+            # (distill_pr_impact then reads them from the cache)
+            try:
+                with self._api_slots:
+                    github_tool.get_pr_details_many(refs)
+            except Exception as e:
+                logger.warning(f"Bulk PR fetch failed, falling back to per-PR requests: {e}")
+            
+            # A PR linked from several tickets is distilled once
+            pr_futures = {ref: submit(self.distill_pr_impact, *ref) for ref in dict.fromkeys(refs)}
+            impacts = {ref: future.result() for ref, future in pr_futures.items()}
+        finally:
+            executor.shutdown(cancel_futures=True)
         
         features = []
         bugfixes = []
         improvements = []
         breaking_changes = []
         
-        for ticket in tickets:
-            distilled = self.distill_ticket_decision(ticket.key)
-            
-            if not distilled.get("is_doc_worthy", False):
-                continue
-            
-            prs = github_tool.find_prs_for_ticket(ticket.key)
+        for ticket, distilled in doc_worthy:
+            prs = prs_by_ticket.get(ticket.key, [])
             pr_impacts = []
             for pr in prs[:3]:
-                impact = self.distill_pr_impact(pr.url.split('/')[-4] + '/' + pr.url.split('/')[-3], pr.number)
+                impact = impacts[(repo_from_pr_url(pr.url), pr.number)]
                 if impact.get("is_doc_worthy"):
                     pr_impacts.append(impact)
             
@@ -0,0 +1,67 @@
+"""
+Shared HTTP connection pools.
+
+Tools build one API client per thread (see BaseTool.client), but all clients of a
+service mount the same adapter, so worker threads reuse each other's open
+TCP/TLS connections instead of reconnecting.
+"""
+from typing import Callable, Dict
+import socket
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from src.config.settings import settings
+
+
+# Keep idle pooled connections alive through NATs/load balancers between bursts
+KEEPALIVE_SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+] + [
+    (socket.IPPROTO_TCP, getattr(socket, name), value)
+    for name, value in (("TCP_KEEPIDLE", 60), ("TCP_KEEPINTVL", 15), ("TCP_KEEPCNT", 4))
+    if hasattr(socket, name)
+]
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter with TCP keep-alive and a pool sized for concurrent tool calls."""
+    
+    def __init__(self, pool_size: int = None, **kwargs):
+        pool_size = pool_size or settings.http_pool_size
+        kwargs.setdefault("pool_connections", 4)
+        kwargs.setdefault("pool_maxsize", pool_size)
+        super().__init__(**kwargs)
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault("socket_options", KEEPALIVE_SOCKET_OPTIONS)
+        super().init_poolmanager(*args, **kwargs)
+
+
+_adapters: Dict[str, HTTPAdapter] = {}
+_adapters_lock = threading.Lock()
+
+
+def shared_adapter(name: str, factory: Callable[[], HTTPAdapter] = PooledHTTPAdapter) -> HTTPAdapter:
+    """
+    Process-wide adapter (and thus connection pool) registered under name.
+    
+    Args:
+        name: Pool name, e.g. "jira"
+        factory: Builds the adapter on first use
+    
+    Returns:
+        The same adapter for every call with this name
+    """
+    with _adapters_lock:
+        adapter = _adapters.get(name)
+        if adapter is None:
+            adapter = _adapters[name] = factory()
+        return adapter
+
+
+def mount_shared(session: requests.Session, name: str):
+    """Send all of session's requests through the shared pool called name."""
+    adapter = shared_adapter(name)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
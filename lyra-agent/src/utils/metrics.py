@@ -18,6 +18,9 @@ class AgentMetrics:
     estimated_cost: float = 0.0
     iterations: int = 0
     sources_consulted: list = field(default_factory=list)
+    cache_stats: dict = field(default_factory=dict)
+    repo_timings: dict = field(default_factory=dict)
+    api_quota: dict = field(default_factory=dict)
     
     def finish(self):
         """Mark execution as finished."""
@@ -31,6 +34,21 @@ class AgentMetrics:
     
     def log_summary(self):
         """Log metrics summary."""
+        cache_lines = "\n".join(
+            f"        Cache ({name}): {stats['hit_rate']:.0%} hit rate, "
+            f"{stats['hits']} hits / {stats['misses']} misses"
+            for name, stats in self.cache_stats.items() if stats
+        )
+        slow_repos = ", ".join(
+            f"{repo} {t['avg_s']:.2f}s avg ({t['errors']} errors, {t['timeouts']} timeouts)"
+            for repo, t in list(self.repo_timings.items())[:3]
+        )
+        quota = ", ".join(
+            f"{name} {q['used']} used / {q['remaining']} left"
+            for name, q in self.api_quota.get("resources", {}).items()
+        )
+        if quota:
+            quota += f" ({self.api_quota['throttled_s']:.1f}s throttled, {self.api_quota['rate_limited']} rate limited)"
         logger.info(f"""
         === Agent Execution Summary ===
         Duration: {self.duration:.2f}s
@@ -39,5 +57,8 @@ class AgentMetrics:
         Sources: {', '.join(self.sources_consulted)}
         Tokens: {self.tokens_used}
         Est. Cost: ${self.estimated_cost:.4f}
+{cache_lines}
+        Slowest repos: {slow_repos or 'n/a'}
+        GitHub quota: {quota or 'n/a'}
         """)
 
@@ -0,0 +1,279 @@
+"""
+Rate-limit-aware request scheduling.
+
+Every GitHub HTTP request passes through ``RateLimitScheduler.acquire`` (via
+``RateLimitedAdapter``). The scheduler:
+- tracks the live budget per resource (core, search, graphql) from the
+  X-RateLimit-Limit/Remaining/Reset/Resource response headers,
+- paces requests only when the recent request rate would spend the remaining
+  quota before the reset; a token bucket then spreads what is left over the
+  time until reset,
+- keeps a reserve of the quota for interactive calls: background calls (cache
+  warm, index sync, stale refreshes) wait while interactive calls are queued or
+  once the budget falls below the reserve,
+- sleeps until the reset (or Retry-After) on primary and secondary rate limits
+  and retries, instead of failing the run.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Mapping
+from urllib.parse import urlparse
+import threading
+import time
+from src.config.settings import settings
+from src.utils.http import PooledHTTPAdapter
+from src.utils.logger import logger
+
+
+INTERACTIVE = 0
+BACKGROUND = 1
+
+_priority: ContextVar[int] = ContextVar("request_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def request_priority(priority: int) -> Iterator[None]:
+    """
+    Run the enclosed API calls at the given priority (INTERACTIVE or BACKGROUND).
+    
+    The priority is a context variable: thread pools must submit work through
+    contextvars.copy_context().run to carry it into worker threads.
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+@dataclass
+class _Budget:
+    """Live rate-limit state of one API resource."""
+    limit: int = 0
+    remaining: int = 0  # optimistic: decremented on every acquire, reset from headers
+    reported: int = 0  # remaining as last reported by the server
+    reset_at: float = 0.0
+    used: int = 0
+    tokens: float = 0.0
+    refilled_at: float = 0.0
+    recent: deque = field(default_factory=deque)  # send times within BURN_WINDOW
+
+
+class RateLimitScheduler:
+    """Token-bucket scheduler driven by GitHub-style rate-limit headers."""
+    
+    # Seconds of request history used to estimate the burn rate
+    BURN_WINDOW = 60.0
+    
+    def __init__(
+        self,
+        burst: int = 10,
+        background_reserve: float = 0.2,
+        max_wait: float = 3600.0
+    ):
+        self.burst = burst
+        self.background_reserve = background_reserve
+        self.max_wait = max_wait
+        self._cond = threading.Condition()
+        self._budgets: Dict[str, _Budget] = {}
+        self._blocked_until: Dict[str, float] = {}
+        self._interactive_waiting = 0
+        self.requests = 0
+        self.rate_limited = 0
+        self.throttled_seconds = 0.0
+    
+    @staticmethod
+    def resource_for(url: str) -> str:
+        """Rate-limit resource a request URL counts against."""
+        path = urlparse(url).path
+        if path.endswith("/graphql"):
+            return "graphql"
+        if "/search/" in path:
+            return "search"
+        return "core"
+    
+    def acquire(self, resource: str):
+        """Block until a request against resource may be sent at the caller's priority."""
+        priority = _priority.get()
+        start = time.monotonic()
+        with self._cond:
+            if priority == INTERACTIVE:
+                self._interactive_waiting += 1
+            try:
+                while True:
+                    delay = self._delay(resource, priority, time.time())
+                    if delay <= 0:
+                        break
+                    # Wake up regularly: headers from other threads may change the budget
+                    self._cond.wait(min(delay, 1.0))
+            finally:
+                if priority == INTERACTIVE:
+                    self._interactive_waiting -= 1
+                    self._cond.notify_all()
+            self.requests += 1
+            self.throttled_seconds += time.monotonic() - start
+    
+    def _delay(self, resource: str, priority: int, now: float) -> float:
+        """Seconds to wait before the next request; takes a token when it returns 0."""
+        blocked = self._blocked_until.get(resource, 0.0) - now
+        if blocked > 0:
+            return blocked
+        
+        budget = self._budgets.get(resource)
+        if budget is None:
+            return 0.0  # no headers seen yet
+        if now >= budget.reset_at:
+            # New window: the server will report the refreshed budget on the next response
+            budget.remaining = budget.limit
+            budget.reset_at = now + 3600
+        
+        if priority == BACKGROUND:
+            if self._interactive_waiting:
+                return 0.05
+            if budget.remaining <= budget.limit * self.background_reserve:
+                return budget.reset_at - now
+        if budget.remaining <= 0:
+            return budget.reset_at - now
+        
+        # The pace that spends the remaining quota by the reset time
+        rate = budget.remaining / max(budget.reset_at - now, 1.0)
+        while budget.recent and budget.recent[0] <= now - self.BURN_WINDOW:
+            budget.recent.popleft()
+        burn_rate = len(budget.recent) / self.BURN_WINDOW
+        
+        if burn_rate <= rate:
+            # On track to last until the reset: no pacing, keep the bucket full
+            budget.tokens = self.burst
+        else:
+            budget.tokens = min(self.burst, budget.tokens + (now - budget.refilled_at) * rate)
+        budget.refilled_at = now
+        if budget.tokens < 1:
+            return (1 - budget.tokens) / rate
+        budget.tokens -= 1
+        budget.remaining -= 1
+        budget.recent.append(now)
+        return 0.0
+    
+    def observe(self, resource: str, status: int, headers: Mapping[str, Any], body: bytes = b"") -> float:
+        """
+        Update the budget from a response.
+        
+        Args:
+            resource: Resource the request was scheduled against
+            status: HTTP status code
+            headers: Response headers
+            body: Start of the response body (used to spot secondary rate limits)
+        
+        Returns:
+            Seconds until the request may be retried if it was rate limited, else 0.
+            Limits longer than max_wait are not retried (the error reaches the caller).
+        """
+        headers = {k.lower(): v for k, v in headers.items()}
+        now = time.time()
+        with self._cond:
+            if "x-ratelimit-remaining" in headers:
+                resource = headers.get("x-ratelimit-resource", resource)
+                self._update_budget(resource, headers, now)
+            
+            if status not in (403, 429):
+                return 0.0
+            
+            if "retry-after" in headers:
+                delay = float(headers["retry-after"])
+            elif headers.get("x-ratelimit-remaining") == "0":
+                delay = float(headers.get("x-ratelimit-reset", now)) - now + 1
+            elif b"secondary rate limit" in body.lower():
+                delay = 60.0
+            else:
+                return 0.0  # a real 403 (permissions), not a rate limit
+            
+            self.rate_limited += 1
+            if delay > self.max_wait:
+                logger.error(f"GitHub {resource} rate limit resets in {delay:.0f}s, not waiting")
+                return 0.0
+            delay = max(delay, 1.0)
+            self._blocked_until[resource] = max(self._blocked_until.get(resource, 0.0), now + delay)
+            self._cond.notify_all()
+            return delay
+    
+    def _update_budget(self, resource: str, headers: Dict[str, Any], now: float):
+        try:
+            limit = int(headers.get("x-ratelimit-limit", 0))
+            remaining = int(headers["x-ratelimit-remaining"])
+            reset_at = float(headers.get("x-ratelimit-reset", now + 3600))
+        except ValueError:
+            return
+        
+        budget = self._budgets.get(resource)
+        if budget is None:
+            budget = self._budgets[resource] = _Budget(tokens=self.burst, refilled_at=now)
+            budget.used = 1 if remaining < limit else 0
+        elif abs(reset_at - budget.reset_at) < 2:
+            budget.used += max(0, budget.reported - remaining)
+        else:
+            budget.used += max(0, limit - remaining)  # a new window started
+        
+        budget.limit = limit
+        budget.reported = remaining
+        budget.remaining = min(budget.remaining, remaining) if abs(reset_at - budget.reset_at) < 2 else remaining
+        budget.reset_at = reset_at
+    
+    def report(self) -> Dict[str, Any]:
+        """Quota used per resource this run, what is left, and time spent throttled."""
+        now = time.time()
+        with self._cond:
+            return {
+                "requests": self.requests,
+                "rate_limited": self.rate_limited,
+                "throttled_s": round(self.throttled_seconds, 1),
+                "resources": {
+                    name: {
+                        "used": budget.used,
+                        "remaining": budget.reported,
+                        "limit": budget.limit,
+                        "reset_in_s": max(0, int(budget.reset_at - now)),
+                    }
+                    for name, budget in sorted(self._budgets.items())
+                },
+            }
+
+
+class RateLimitedAdapter(PooledHTTPAdapter):
+    """Pooled requests adapter that sends every request through a RateLimitScheduler."""
+    
+    MAX_ATTEMPTS = 5
+    
+    def __init__(self, scheduler: RateLimitScheduler, **kwargs):
+        self.scheduler = scheduler
+        super().__init__(**kwargs)
+    
+    def send(self, request, **kwargs):
+        resource = self.scheduler.resource_for(request.url)
+        for attempt in range(self.MAX_ATTEMPTS):
+            self.scheduler.acquire(resource)
+            response = super().send(request, **kwargs)
+            
+            body = b""
+            if response.status_code in (403, 429) and not kwargs.get("stream"):
+                body = response.content[:2048]
+            delay = self.scheduler.observe(resource, response.status_code, response.headers, body)
+            if not delay or attempt == self.MAX_ATTEMPTS - 1:
+                return response
+            
+            # acquire() blocks until the limit resets
+            logger.warning(
+                f"GitHub {resource} rate limit hit; retrying {request.method} "
+                f"{urlparse(request.url).path} in {delay:.0f}s"
+            )
+            response.close()
+        return response
+
+
+# Global instance
+github_scheduler = RateLimitScheduler(
+    burst=settings.github_rate_burst,
+    background_reserve=settings.github_background_reserve,
+    max_wait=settings.github_max_rate_wait
+)
@@ -0,0 +1,45 @@
+"""
+SQLite helpers shared by the cache and the local indexes.
+"""
+from pathlib import Path
+from typing import Union
+import os
+import sqlite3
+import threading
+
+
+class ThreadLocalSQLite:
+    """
+    Per-thread (and per-process) connections to one SQLite file in WAL mode.
+    
+    Connections run in autocommit mode (isolation_level=None); callers group writes
+    with explicit BEGIN IMMEDIATE / COMMIT. The schema script runs once per process,
+    on the first connection.
+    """
+    
+    def __init__(self, path: Union[str, Path], schema: str = ""):
+        self.path = Path(path)
+        self.schema = schema
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_pid = None
+    
+    def conn(self) -> sqlite3.Connection:
+        """Return this thread's connection, reopening after a fork."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+            self._ensure_schema(conn)
+        return conn
+    
+    def _ensure_schema(self, conn: sqlite3.Connection):
+        with self._schema_lock:
+            if self.schema and self._schema_pid != os.getpid():
+                conn.executescript(self.schema)
+                self._schema_pid = os.getpid()
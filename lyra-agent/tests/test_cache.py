@@ -0,0 +1,440 @@
+"""
+Tool cache tests.
+"""
+import json
+import threading
+import time
+from datetime import datetime
+import pytest
+from src.cache import codec
+from src.cache.backends import JsonFileCacheBackend, SQLiteCacheBackend
+from src.cache.memory import MemoryCache
+from src.cache.singleflight import SingleFlight
+from src.config.settings import settings
+from src.schemas.data_models import JiraTicket
+from src.tools.base_tool import BaseTool, NotFoundError, OfflineError, Validated, cached_method
+
+
+class DummyTool(BaseTool):
+    """BaseTool with no API client, for exercising the cache layers."""
+    
+    def _init_client(self):
+        return None
+
+
+def make_ticket(key: str) -> JiraTicket:
+    """Build a minimal JiraTicket."""
+    return JiraTicket(
+        id=key,
+        key=key,
+        summary=f"Summary of {key}",
+        status="Done",
+        priority="Major",
+        issue_type="Story",
+        reporter="reporter",
+        created=datetime(2024, 1, 1),
+        updated=datetime(2024, 1, 2),
+        url=f"https://jira.example.com/browse/{key}"
+    )
+
+
+def test_sqlite_backend_roundtrip(tmp_path):
+    """Test that SQLite backend stores and returns entries per namespace."""
+    jira = SQLiteCacheBackend("jiratool", db_path=tmp_path / "cache.db")
+    github = SQLiteCacheBackend("githubtool", db_path=tmp_path / "cache.db")
+    
+    jira.set("k1", {"key": "DEV-1"})
+    
+    assert jira.get("k1").data == {"key": "DEV-1"}
+    assert github.get("k1") is None
+    
+    jira.delete("k1")
+    assert jira.get("k1") is None
+
+
+def test_sqlite_backend_evicts_least_recently_used(tmp_path):
+    """Test that eviction keeps the cache under its size cap and drops LRU entries first."""
+    backend = SQLiteCacheBackend("tool", db_path=tmp_path / "cache.db", max_size_bytes=1000)
+    payload = "x" * 150
+    for i in range(10):
+        backend.set(f"k{i}", payload)
+        time.sleep(0.001)
+    
+    # Touch the oldest entry so it becomes most recently used
+    backend.get("k0")
+    backend.evict()
+    
+    assert backend.total_size() <= 1000 * SQLiteCacheBackend.EVICT_TARGET
+    assert backend.get("k0") is not None
+    assert backend.get("k1") is None
+
+
+def test_sqlite_backend_purge_expired(tmp_path):
+    """Test bulk TTL purge."""
+    backend = SQLiteCacheBackend("tool", db_path=tmp_path / "cache.db")
+    backend.set("old", 1)
+    time.sleep(0.05)
+    backend.set("new", 2)
+    
+    assert backend.purge_expired(ttl=0.02) == 1
+    assert backend.get("old") is None
+    assert backend.get("new").data == 2
+
+
+def test_sqlite_backend_concurrent_writers(tmp_path):
+    """Test that several threads can write to the same cache file."""
+    backend = SQLiteCacheBackend("tool", db_path=tmp_path / "cache.db")
+    
+    def writer(n):
+        for i in range(50):
+            backend.set(f"{n}-{i}", {"n": n, "i": i})
+    
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    
+    assert backend.get("3-49").data == {"n": 3, "i": 49}
+
+
+def test_json_backend_roundtrip(tmp_path):
+    """Test that the legacy JSON-file backend is still available."""
+    backend = JsonFileCacheBackend("tool", cache_dir=str(tmp_path))
+    backend.set("k1", [1, 2, 3])
+    
+    assert (tmp_path / "tool" / "k1.json").exists()
+    assert backend.get("k1").data == [1, 2, 3]
+    assert backend.purge_expired(ttl=3600) == 0
+    
+    backend.set("get_pr.k2", {}, tags=["repo:org/app"])
+    assert [e.method for e in backend.list_entries(tag="repo:*")] == ["get_pr"]
+    assert backend.purge(tag="repo:org/app") == 1
+    assert backend.clear() == 1
+
+
+def test_sqlite_backend_tags_and_targeted_purge(tmp_path):
+    """Test that entries can be listed and purged by method and tag."""
+    backend = SQLiteCacheBackend("tool", db_path=tmp_path / "cache.db")
+    backend.set("get_ticket.a", {}, tags=["ticket:DEV-1", "release:v2.1"])
+    backend.set("get_ticket.b", {}, tags=["ticket:DEV-2", "release:v2.2"])
+    backend.set("search_tickets.c", [], tags=["release:v2.1"])
+    backend.get("get_ticket.a")
+    
+    entries = backend.list_entries(tag="release:v2.1")
+    assert sorted(e.key for e in entries) == ["get_ticket.a", "search_tickets.c"]
+    assert {e.key: e.hits for e in entries}["get_ticket.a"] == 1
+    assert [e.key for e in backend.list_entries(method="get_ticket", tag="ticket:*")] == ["get_ticket.b", "get_ticket.a"]
+    
+    assert backend.purge(tag="release:v2.1") == 2
+    assert [e.key for e in backend.list_entries()] == ["get_ticket.b"]
+    assert backend.stats()[0]["method"] == "get_ticket"
+    
+    # Tags of deleted entries go with them
+    backend.delete("get_ticket.b")
+    assert backend._conn().execute("SELECT COUNT(*) FROM cache_tags").fetchone()[0] == 0
+
+
+def test_base_tool_records_tags_and_lookups(tmp_path, monkeypatch):
+    """Test that BaseTool tags writes and counts hits and misses per method."""
+    monkeypatch.setattr(settings, "cache_dir", str(tmp_path))
+    tool = DummyTool()
+    monkeypatch.setattr(tool, "_item_tags", lambda item: [f"ticket:{item.key}"])
+    key = tool._cache_key("search_tickets", jql="x")
+    
+    tool._cached_fetch(key, lambda: [make_ticket("DEV-1")], JiraTicket, tags=["release:v2.1"])
+    tool._cached_fetch(key, lambda: [], JiraTicket)
+    
+    [info] = tool.cache.list_entries()
+    assert info.method == "search_tickets"
+    assert info.tags == ["release:v2.1", "ticket:DEV-1"]
+    assert tool.cache.lookup_history(days=1)[0] | {"day": None} == {
+        "day": None, "method": "search_tickets", "hits": 1, "misses": 1
+    }
+
+
+def test_memory_cache_limits_and_hit_rate():
+    """Test that the L1 cache enforces entry/byte limits and reports hit rate."""
+    cache = MemoryCache(max_entries=2, max_bytes=100, ttl=60)
+    cache.set("a", 1, size=10)
+    cache.set("b", 2, size=10)
+    cache.get("a")
+    cache.set("c", 3, size=10)  # evicts "b", the least recently used
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    
+    cache.set("big", 4, size=90)  # pushes total over max_bytes
+    assert cache.stats()["bytes"] <= 100
+    assert cache.hit_rate == 2 / 3
+    
+    cache.set("expired", 5, expires_at=time.time() - 1)
+    assert cache.get("expired") is None
+
+
+def test_base_tool_memory_tier_skips_disk(tmp_path, monkeypatch):
+    """Test that repeated lookups return the same built model without hitting disk."""
+    monkeypatch.setattr(settings, "cache_dir", str(tmp_path))
+    tool = DummyTool()
+    ticket = make_ticket("DEV-1")
+    tool._set_cached("k", [ticket])
+    
+    tool.memory_cache.clear()
+    first = tool._get_cached("k", JiraTicket)
+    assert first == [ticket]
+    
+    tool.cache.delete("k")
+    second = tool._get_cached("k", JiraTicket)
+    assert second[0] is first[0]
+    assert tool.cache_stats()["hits"] == 1
+
+
+def test_stale_entry_served_while_refreshing(tmp_path, monkeypatch):
+    """Test that an expired entry is returned immediately and refreshed in the background."""
+    monkeypatch.setattr(settings, "cache_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "cache_stale_while_revalidate", True)
+    tool = DummyTool()
+    tool._store_fetched("k", Validated([make_ticket("DEV-1")], "etag-1"))
+    tool.memory_cache.clear()
+    monkeypatch.setattr(settings, "cache_ttl", -1)
+    
+    calls = []
+    
+    def fetch():
+        calls.append("fetch")
+        return [make_ticket("DEV-2")]
+    
+    def revalidate(stale, validator):
+        calls.append(validator)
+        return None
+    
+    value = tool._cached_fetch("k", fetch, JiraTicket, revalidate)
+    tool._refresh_executor.shutdown(wait=True)
+    
+    assert [t.key for t in value] == ["DEV-1"]
+    assert calls == ["etag-1"]
+    assert tool.cache.get("k").meta == {"validator": "etag-1"}
+
+
+def test_stale_entry_refetched_when_changed(tmp_path, monkeypatch):
+    """Test that a changed source replaces the stale entry."""
+    monkeypatch.setattr(settings, "cache_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "cache_stale_while_revalidate", True)
+    tool = DummyTool()
+    tool._set_cached("k", [make_ticket("DEV-1")])
+    tool.memory_cache.clear()
+    monkeypatch.setattr(settings, "cache_ttl", -1)
+    
+    tool._cached_fetch("k", lambda: [make_ticket("DEV-2")], JiraTicket)
+    tool._refresh_executor.shutdown(wait=True)
+    
+    assert tool.cache.get("k").data[0]["key"] == "DEV-2"
+
+
+def test_cache_key_covers_arguments_and_schema(tmp_path, monkeypatch):
+    """Test that keys include defaulted arguments and change only with the model schema."""
+    monkeypatch.setattr(settings, "cache_dir", str(tmp_path))
+    
+    class OtherTicket(JiraTicket):
+        sprint: str = ""
+    
+    class KeyTool(DummyTool):
+        @cached_method(JiraTicket)
+        def search(self, query, max_results=50):
+            return self._call_key()
+        
+        @cached_method(OtherTicket)
+        def search_other(self, query, max_results=50):
+            return self._call_key()
+    
+    tool = KeyTool()
+    key = tool.search("x")
+    assert key == tool.search("x", 50) == tool.search(query="x", max_results=50)
+    assert key == KeyTool.search.cache_key(tool, "x")
+    assert key.startswith("search.")
+    assert key != tool.search("x", max_results=10)
+    assert key.split(".")[1] == codec.schema_hash(JiraTicket)
+    assert tool.search_other("x").split(".")[1] == codec.schema_hash(OtherTicket)
+
+
+def test_empty_result_is_cached(tmp_path, monkeypatch):
+    """Test that an empty list is a cache hit, not a miss."""
+    monkeypatch.setattr(settings, "cache_dir", str(tmp_path))
+    tool = DummyTool()
+    calls = []
+    
+    def fetch():
+        calls.append(1)
+        return []
+    
+    assert tool._cached_fetch("k", fetch, JiraTicket) == []
+    tool.memory_cache.clear()
+    assert tool._cached_fetch("k", fetch, JiraTicket) == []
+    assert len(calls) == 1
+
+
+class HTTPError(Exception):
+    """Stand-in for a client library error carrying an HTTP status."""
+    
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+
+def test_not_found_is_negatively_cached(tmp_path, monkeypatch):
+    """Test that 404s are cached with their own TTL and other errors are not cached."""
+    monkeypatch.setattr(settings, "cache_dir", str(tmp_path))
+    tool = DummyTool()
+    calls = []
+    
+    def fetch():
+        calls.append(1)
+        raise HTTPError(404)
+    
+    for _ in range(2):
+        with pytest.raises(NotFoundError):
+            tool._cached_fetch("k", fetch, JiraTicket)
+    tool.memory_cache.clear()
+    with pytest.raises(NotFoundError):
+        tool._cached_fetch("k", fetch, JiraTicket)
+    assert len(calls) == 1
+    assert tool.cache.list_entries(tag="not-found")[0].key == "k"
+    
+    # Expired negative entries are refetched
+    tool.memory_cache.clear()
+    monkeypatch.setattr(settings, "cache_negative_ttl", -1)
+    assert tool._cached_fetch("k", lambda: [make_ticket("DEV-1")], JiraTicket)[0].key == "DEV-1"
+    
+    with pytest.raises(HTTPError):
+        tool._cached_fetch("other", lambda: (_ for _ in ()).throw(HTTPError(500)))
+    assert tool._lookup("other") is None
+
+
+def test_offline_mode_serves_cache_only(tmp_path, monkeypatch):
+    """Test that offline mode ignores TTL, never builds a client and names missing calls."""
+    monkeypatch.setattr(settings, "cache_dir", str(tmp_path))
+    
+    class OfflineTool(DummyTool):
+        def _init_client(self):
+            raise AssertionError("client built in offline mode")
+        
+        @cached_method(JiraTicket)
+        def get(self, ticket_id):
+            return self._cached_fetch(self._call_key(), lambda: self.client, JiraTicket)
+    
+    tool = OfflineTool()
+    tool._set_cached(OfflineTool.get.cache_key(tool, "DEV-1"), make_ticket("DEV-1"))
+    tool.memory_cache.clear()
+    monkeypatch.setattr(settings, "cache_ttl", -1)
+    monkeypatch.setattr(settings, "offline", True)
+    
+    assert tool.get("DEV-1").key == "DEV-1"
+    assert tool._refresh_executor is None
+    with pytest.raises(OfflineError, match=r"get\(ticket_id='DEV-2'\)"):
+        tool.get("DEV-2")
+    with pytest.raises(OfflineError):
+        tool.client
+
+
+def test_clients_are_per_thread_with_memoized_handles(tmp_path, monkeypatch):
+    """Test that each thread builds one client and handles are memoized per client."""
+    monkeypatch.setattr(settings, "cache_dir", str(tmp_path))
+    
+    class PooledTool(DummyTool):
+        def _init_client(self):
+            return object()
+    
+    tool = PooledTool()
+    handles = []
+    
+    def work():
+        client = tool.client
+        assert tool.client is client
+        first = tool._handle("repo:org/app", lambda: (client, object()))
+        assert tool._handle("repo:org/app", lambda: pytest.fail("handle rebuilt")) is first
+        handles.append(first)
+    
+    threads = [threading.Thread(target=work) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    
+    assert len({id(client) for client, _ in handles}) == 3
+    shared = object()
+    tool.client = shared
+    assert tool.client is shared
+    assert tool._handle("repo:org/app", lambda: "rebuilt") == "rebuilt"
+
+
+def test_single_flight_coalesces_threads():
+    """Test that concurrent identical calls share one fetch."""
+    flight = SingleFlight()
+    calls = []
+    gate = threading.Event()
+    
+    def fetch():
+        calls.append(1)
+        gate.wait(1)
+        return "result"
+    
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.do("k", fetch)))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    while flight.coalesced < 4:
+        time.sleep(0.001)
+    gate.set()
+    for t in threads:
+        t.join()
+    
+    assert calls == [1]
+    assert results == ["result"] * 5
+
+
+def test_single_flight_propagates_errors():
+    """Test that a failed fetch raises for the caller and clears the key."""
+    flight = SingleFlight()
+    
+    def fail():
+        raise ValueError("boom")
+    
+    with pytest.raises(ValueError):
+        flight.do("k", fail)
+    assert flight.do("k", lambda: 1) == 1
+
+
+def test_codec_roundtrip_and_compression():
+    """Test that encoded entries decode back and large payloads are compressed."""
+    data = [make_ticket(f"DEV-{i}").model_dump(mode='json') for i in range(50)]
+    blob = codec.encode(data)
+    
+    assert blob[:2] == bytes((codec.MARKER, ord("j")))
+    assert len(blob) < len(json.dumps(data))
+    assert codec.decode(blob) == data
+
+
+def test_codec_stdlib_fallback(monkeypatch):
+    """Test the zlib path used when zstandard is not installed."""
+    monkeypatch.setattr(codec, "zstandard", None)
+    data = {"body": "x" * 2000}
+    
+    blob = codec.encode(data)
+    assert blob[1:3] == b"jz"
+    assert codec.decode(blob) == data
+
+
+def test_rehydrate_matches_validation():
+    """Test that bulk rehydration builds the same models as per-item validation."""
+    tickets = [make_ticket(f"DEV-{i}") for i in range(3)]
+    data = [t.model_dump(mode='json') for t in tickets]
+    
+    assert codec.rehydrate(JiraTicket, data) == tickets
+    assert codec.rehydrate(JiraTicket, data[0]) == tickets[0]
+    
+    # Straight from stored bytes, compressed and uncompressed
+    assert codec.decode_models(codec.encode(data * 10), JiraTicket) == tickets * 10
+    assert codec.decode_models(codec.encode(data[0]), JiraTicket) == tickets[0]
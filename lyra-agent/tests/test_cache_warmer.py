@@ -0,0 +1,131 @@
+"""
+Cache warmer tests, with fake Jira/GitHub tools that stand in for the tool caches.
+"""
+import pytest
+
+pytest.importorskip("langchain")
+pytest.importorskip("langchain_mistralai")
+
+from src.config.settings import settings
+from src.operations.cache_warmer import CacheWarmer
+from src.schemas.data_models import PRDiff
+from src.tools import smart_tools
+from src.tools.base_tool import OfflineError
+from src.tools.smart_tools import SmartToolOrchestrator
+from tests.test_smart_tools import FakeLLM, make_pr, make_ticket
+
+
+class FakeCache:
+    """Stores what is fetched online; offline, anything not stored is a recorded miss."""
+    
+    def __init__(self):
+        self.entries = set()
+        self.misses = []
+    
+    def fetch(self, key: tuple, value):
+        if not settings.offline:
+            self.entries.add(key)
+        elif key not in self.entries:
+            self.misses.append(key)
+            raise OfflineError(f"Offline cache miss: {key}")
+        return value
+
+
+class PromptLLM(FakeLLM):
+    """FakeLLM that keeps the prompts it was given."""
+    
+    def __init__(self):
+        super().__init__()
+        self.prompts = []
+    
+    def invoke(self, prompt: str):
+        self.prompts.append(prompt)
+        return super().invoke(prompt)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """Fake Jira/GitHub tools with the cache-sharing contracts of the real ones. Tickets 0-5; ticket n links PR n+100."""
+    monkeypatch.setattr(settings, "distill_cache_enabled", False)
+    cache = FakeCache()
+    jira, github = smart_tools.jira_tool, smart_tools.github_tool
+    
+    def release(version, profile="summary"):
+        return cache.fetch(("release", version, profile), [make_ticket(i) for i in range(6)])
+    
+    def ticket(key, profile="release"):
+        return cache.fetch(("ticket", key, profile), make_ticket(int(key.split("-")[1])))
+    
+    def comments(key):
+        return cache.fetch(("comments", key), [])
+    
+    def pr(ref):
+        return cache.fetch(("pr",) + tuple(ref), make_pr(ref[1]))
+    
+    def diff(repo, number, max_files=None, max_bytes=None):
+        return cache.fetch(("diff", repo, number), PRDiff(
+            repo=repo, number=number, files_total=1, files_inspected=1, additions=1, deletions=0
+        ))
+    
+    monkeypatch.setattr(jira, "get_tickets_for_release", release)
+    monkeypatch.setattr(
+        jira, "iter_tickets_for_release", lambda version, profile="summary": iter(release(version, profile))
+    )
+    monkeypatch.setattr(jira, "get_ticket_details", ticket)
+    monkeypatch.setattr(jira, "load_comments", lambda keys: {key: comments(key) for key in keys})
+    monkeypatch.setattr(jira, "with_comments", lambda t: t.model_copy(update={"comments": comments(t.key)}))
+    monkeypatch.setattr(
+        jira, "crawl_links", lambda keys, depth=1, max_nodes=None: [ticket(key, "summary") for key in keys]
+    )
+    monkeypatch.setattr(
+        github, "find_prs_for_tickets",
+        lambda keys: {key: cache.fetch(("prs", key), [make_pr(int(key.split("-")[1]) + 100)]) for key in keys}
+    )
+    # Bulk PR details fill the per-PR entries read by get_pr_details
+    monkeypatch.setattr(github, "get_pr_details_many", lambda refs: {ref: pr(ref) for ref in refs})
+    monkeypatch.setattr(github, "get_pr_details", lambda repo, number: pr((repo, number)))
+    monkeypatch.setattr(github, "get_pr_diff", diff)
+    return cache
+
+
+def test_warmed_pr_impacts_distill_offline_from_the_diff(cache, monkeypatch):
+    """Test that PR diffs are warmed, so an offline distillation needs no API call and no fallback."""
+    report = CacheWarmer(max_workers=4).warm_release("v2.1")
+    assert (report.tickets, report.prs, report.errors) == (6, 6, [])
+    
+    monkeypatch.setattr(settings, "offline", True)
+    orchestrator = SmartToolOrchestrator()
+    orchestrator.llm = PromptLLM()
+    for number in range(100, 106):
+        assert orchestrator.distill_pr_impact("org/app", number)["impact"] == f"Impact {number}"
+    
+    assert cache.misses == []
+    assert all("+1/-0" in prompt for prompt in orchestrator.llm.prompts)
+
+
+def test_warm_fills_every_key_the_release_pipeline_reads(cache, monkeypatch):
+    """Test that an offline release run after warming finds everything it reads in the caches."""
+    report = CacheWarmer(max_workers=4).warm_release("v2.1")
+    assert report.linked_tickets == 0 and report.errors == []
+    
+    orchestrator = SmartToolOrchestrator()
+    orchestrator.llm = FakeLLM()
+    monkeypatch.setattr(settings, "offline", True)
+    offline = orchestrator.get_release_knowledge("v2.1", "Lyra")
+    assert cache.misses == []
+    
+    monkeypatch.setattr(settings, "offline", False)
+    assert orchestrator.get_release_knowledge("v2.1", "Lyra") == offline
+    assert offline["total_tickets"] == 6 and offline["doc_worthy_items"] == 4
+
+
+def test_cache_warm_command(cache):
+    """Test that `lyra cache warm` warms the release and reports it."""
+    pytest.importorskip("langgraph")
+    from typer.testing import CliRunner
+    from src.main import app
+    
+    result = CliRunner().invoke(app, ["cache", "warm", "v2.1", "--workers", "2"])
+    assert result.exit_code == 0, result.output
+    assert "Cached 6 tickets, 0 linked tickets and 6 PRs" in result.output
+    assert ("diff", "org/app", 105) in cache.entries
@@ -0,0 +1,106 @@
+"""
+Local git mirror tests against a file:// origin.
+"""
+import base64
+import subprocess
+import time
+import pytest
+from src.config.settings import settings
+from src.services import git_mirror as git_mirror_module
+from src.services.git_mirror import GitMirror, GitMirrorError
+
+
+def git(cwd, *args) -> str:
+    """Run git in cwd with a fixed identity."""
+    return subprocess.run(
+        ["git", "-c", "user.name=dev", "-c", "user.email=dev@example.com", *args],
+        cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def commit(origin, files: dict, message: str) -> str:
+    """Write files into origin and commit them. Returns the commit SHA."""
+    for path, content in files.items():
+        target = origin / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content)
+    git(origin, "add", "-A")
+    git(origin, "commit", "-q", "-m", message)
+    return git(origin, "rev-parse", "HEAD")
+
+
+@pytest.fixture
+def origin(tmp_path):
+    """A work tree at tmp_path/origin/org/app, used as the remote of org/app."""
+    repo = tmp_path / "origin" / "org" / "app"
+    repo.mkdir(parents=True)
+    git(repo, "init", "-q", "-b", "main")
+    return repo
+
+
+def test_exists_and_read_at_any_ref(tmp_path, origin):
+    """Test batched existence checks and reads at branches, tags and SHAs, fetching new refs."""
+    first = commit(origin, {"docs/guide.md": "v1", "src/app.py": "print()"}, "first")
+    git(origin, "tag", "v1.0")
+    mirror = GitMirror(
+        mirror_dir=str(tmp_path / "mirrors"),
+        url_template=f"file://{tmp_path}/origin/{{repo}}",
+        fetch_interval=3600
+    )
+    
+    assert mirror.exists("org/app", ["docs/guide.md", "/src/app.py", "docs", "missing.md"]) == {
+        "docs/guide.md": True, "/src/app.py": True, "docs": True, "missing.md": False
+    }
+    assert mirror.read("org/app", "docs/guide.md") == b"v1"
+    
+    # New branch: unknown locally, found after one fetch
+    git(origin, "checkout", "-q", "-b", "feature")
+    commit(origin, {"docs/guide.md": "v2", "docs/new.md": "new"}, "second")
+    assert mirror.exists("org/app", ["docs/new.md"], ref="feature") == {"docs/new.md": True}
+    assert mirror.read("org/app", "docs/guide.md", ref="feature") == b"v2"
+    assert mirror.read("org/app", "docs/guide.md", ref="v1.0") == b"v1"
+    assert mirror.exists("org/app", ["docs/new.md"], ref=first) == {"docs/new.md": False}
+    assert mirror.exists("org/app", ["docs/guide.md"], ref="no-such-branch") == {"docs/guide.md": False}
+    assert mirror.read("org/app", "missing.md") is None
+    
+    # Hundreds of checks in one git process
+    paths = [f"docs/page-{i}.md" for i in range(500)] + ["docs/guide.md"]
+    start = time.monotonic()
+    found = mirror.exists("org/app", paths)
+    assert time.monotonic() - start < 2
+    assert [p for p, ok in found.items() if ok] == ["docs/guide.md"]
+
+
+def test_clone_failure_is_remembered(tmp_path):
+    """Test that an unreachable remote fails fast on repeated calls and leaves no mirror behind."""
+    mirror = GitMirror(
+        mirror_dir=str(tmp_path / "mirrors"),
+        url_template=f"file://{tmp_path}/nowhere/{{repo}}",
+        fetch_interval=3600
+    )
+    with pytest.raises(GitMirrorError, match="clone"):
+        mirror.exists("org/app", ["README.md"])
+    assert not mirror.path("org/app").exists()
+    
+    mirror._clone = lambda repo, path: pytest.fail("clone retried")
+    with pytest.raises(GitMirrorError):
+        mirror.read("org/app", "README.md")
+
+
+def test_token_is_passed_in_the_environment(tmp_path, monkeypatch):
+    """Test that clones of HTTPS remotes get the token via GIT_CONFIG_* and never on the command line."""
+    monkeypatch.setattr(settings, "github_token", "secret-token")
+    calls = []
+    
+    def run(args, **kwargs):
+        calls.append((args, kwargs["env"]))
+        return subprocess.CompletedProcess(args, 1, "", "unreachable")
+    monkeypatch.setattr(git_mirror_module.subprocess, "run", run)
+    mirror = GitMirror(mirror_dir=str(tmp_path), url_template="https://github.com/{repo}.git")
+    
+    with pytest.raises(GitMirrorError):
+        mirror.exists("org/app", ["README.md"])
+    args, env = calls[0]
+    assert "clone" in args and not any("Authorization" in arg for arg in args)
+    assert env["GIT_CONFIG_KEY_0"] == "http.extraHeader"
+    assert base64.b64decode(env["GIT_CONFIG_VALUE_0"].split()[-1]) == b"x-access-token:secret-token"
@@ -0,0 +1,151 @@
+"""
+GitHubTool tests that need no network access.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import re
+import threading
+import time
+import pytest
+
+pytest.importorskip("langchain")
+
+from github import Github
+from src.config.settings import settings
+from src.services.pr_index import PRIndex
+from src.tools import github_tool as github_tool_module
+from src.tools.base_tool import NotFoundError, OfflineError
+from src.tools.github_tool import GitHubTool
+
+
+def graphql_pr(repo: str, number: int) -> dict:
+    """A PRFields node as GitHub's GraphQL API returns it."""
+    return {
+        "databaseId": 1000 + number, "number": number, "title": f"DEV-{number} change", "body": "",
+        "state": "MERGED", "url": f"https://github.com/{repo}/pull/{number}",
+        "author": {"login": "dev"}, "createdAt": "2024-01-01T00:00:00Z", "updatedAt": "2024-01-02T00:00:00Z",
+        "mergedAt": "2024-01-02T00:00:00Z", "mergedBy": None, "baseRefName": "main", "headRefName": "fix",
+        "changedFiles": 12, "additions": 5, "deletions": 1,
+        "labels": {"nodes": [{"name": "bug"}]}, "files": {"nodes": [{"path": "src/app.py"}]},
+    }
+
+
+@pytest.fixture
+def graphql_server():
+    """Local stub of the GraphQL endpoint: answers aliased pullRequest selections."""
+    queries = []
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            query = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["query"]
+            queries.append(query)
+            data, errors = {}, []
+            for alias, owner, name, pulls in re.findall(
+                r'(repo\d+): repository\(owner: "([^"]+)", name: "([^"]+)"\) \{ (.*?) \}(?= repo\d+:| \})', query
+            ):
+                data[alias] = {}
+                for pr_alias, number in re.findall(r'(pr\d+): pullRequest\(number: (\d+)\)', pulls):
+                    if number == "404":
+                        data[alias][pr_alias] = None
+                        errors.append({"type": "NOT_FOUND", "path": [alias, pr_alias], "message": "missing"})
+                    else:
+                        data[alias][pr_alias] = graphql_pr(f"{owner}/{name}", int(number))
+            body = json.dumps({"data": data, "errors": errors} if errors else {"data": data}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", queries
+    server.shutdown()
+
+
+def test_fan_out_isolates_slow_and_failing_repos(monkeypatch):
+    """Test that one slow or forbidden repo neither fails nor stalls the others."""
+    monkeypatch.setattr(settings, "github_repo_timeout", 0.3)
+    tool = GitHubTool()
+    
+    def fn(repo):
+        if repo == "org/slow":
+            time.sleep(2)
+        if repo == "org/forbidden":
+            raise PermissionError("403 Forbidden")
+        return repo.upper()
+    
+    start = time.monotonic()
+    results, errors = tool._fan_out(["org/a", "org/slow", "org/forbidden", "org/b"], fn, "test")
+    
+    assert time.monotonic() - start < 1.5
+    assert list(results) == ["org/a", "org/b"]
+    assert set(errors) == {"org/slow", "org/forbidden"}
+    timings = tool.repo_timings()
+    assert timings["org/slow"]["timeouts"] == 1
+    assert timings["org/forbidden"]["errors"] == 1
+
+
+def test_pr_index_is_never_first_synced_inline(tmp_path, monkeypatch):
+    """Test that unsynced repos go to the API and due updates run to completion, past the repo timeout."""
+    index = PRIndex(tmp_path / "prs.db")
+    monkeypatch.setattr(github_tool_module, "pr_index", index)
+    monkeypatch.setattr(settings, "pr_index_enabled", True)
+    monkeypatch.setattr(settings, "github_repos", "org/app")
+    monkeypatch.setattr(settings, "github_repo_timeout", 0.1)
+    monkeypatch.setattr(settings, "pr_index_sync_interval", 60)
+    tool = GitHubTool()
+    syncs = []
+    
+    def sync(repo, full=False):
+        time.sleep(0.3)
+        syncs.append(repo)
+        index.mark_synced(repo, None)
+    monkeypatch.setattr(tool, "_sync_repo_prs", sync)
+    monkeypatch.setattr(tool, "search_prs", lambda query: [f"API result for {query}"])
+    
+    assert tool.find_prs_for_tickets(["DEV-1"]) == {"DEV-1": ["API result for DEV-1"]}
+    assert syncs == []
+    
+    index.mark_synced("org/app", None)
+    with index._db.conn() as conn:
+        conn.execute("UPDATE pr_sync SET synced_at = synced_at - 120")
+    assert tool.find_prs_for_tickets(["DEV-1"]) == {"DEV-1": []}
+    assert syncs == ["org/app"]
+
+
+def test_file_content_offline_is_an_error_not_an_empty_file(monkeypatch):
+    """Test that get_file_content raises OfflineError instead of returning an empty file."""
+    monkeypatch.setattr(settings, "git_mirror_enabled", False)
+    monkeypatch.setattr(settings, "offline", True)
+    with pytest.raises(OfflineError):
+        GitHubTool().get_file_content("org/app", "README.md")
+
+
+def test_get_pr_details_many_batches_and_fills_per_pr_cache(tmp_path, monkeypatch, graphql_server):
+    """Test that bulk PR fetches batch GraphQL requests and serve later single lookups from cache."""
+    base_url, queries = graphql_server
+    monkeypatch.setattr(settings, "cache_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "pr_index_enabled", False)
+    monkeypatch.setattr(settings, "github_graphql_batch_size", 3)
+    tool = GitHubTool()
+    tool.client = Github(base_url=base_url, seconds_between_requests=None)
+    refs = [("org/app", 1), ("org/app", 2), ("org/lib", 3), ("org/app", 404), ("org/lib", 5)]
+    
+    prs = tool.get_pr_details_many(refs)
+    
+    assert list(prs) == [("org/app", 1), ("org/app", 2), ("org/lib", 3), ("org/lib", 5)]
+    assert len(queries) == 2
+    pr = prs[("org/lib", 3)]
+    assert (pr.state, pr.labels, pr.linked_issues, pr.body) == ("closed", ["bug"], ["DEV-3"], None)
+    assert pr.diff_summary == "Changed files: src/app.py (and 2 more)"
+    
+    # Single lookups and repeated bulk lookups are cache hits, 404s included
+    assert tool.get_pr_details("org/app", 2) == prs[("org/app", 2)]
+    with pytest.raises(NotFoundError):
+        tool.get_pr_details("org/app", 404)
+    assert tool.get_pr_details_many(refs) == prs
+    assert len(queries) == 2
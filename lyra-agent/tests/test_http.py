@@ -0,0 +1,47 @@
+"""
+Shared HTTP connection pool tests.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import socket
+import threading
+import requests
+from src.utils.http import KEEPALIVE_SOCKET_OPTIONS, mount_shared, shared_adapter
+
+
+def test_sessions_of_all_threads_reuse_pooled_connections():
+    """Test that per-thread sessions on one shared pool reuse a keep-alive connection."""
+    connections = set()
+    
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        
+        def do_GET(self):
+            connections.add(self.client_address)
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/"
+    
+    def call():
+        session = requests.Session()
+        mount_shared(session, "test-pool")
+        assert session.get(url).text == "ok"
+    
+    try:
+        for _ in range(3):
+            thread = threading.Thread(target=call)
+            thread.start()
+            thread.join()
+    finally:
+        server.shutdown()
+    
+    assert len(connections) == 1
+    assert shared_adapter("test-pool") is shared_adapter("test-pool")
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in KEEPALIVE_SOCKET_OPTIONS
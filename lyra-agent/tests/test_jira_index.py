@@ -0,0 +1,88 @@
+"""
+Local Jira mirror tests.
+"""
+from datetime import datetime, timezone
+from src.schemas.data_models import JiraTicket
+from src.services.jira_index import JiraIndex, translate_jql
+
+
+def make_ticket(
+    number: int,
+    status: str = "Done",
+    versions: tuple = ("v2.1",),
+    labels: tuple = (),
+    day: int = 1
+) -> JiraTicket:
+    """Build a minimal JiraTicket."""
+    return JiraTicket(
+        id=str(number),
+        key=f"DEV-{number}",
+        summary=f"Ticket {number}",
+        status=status,
+        priority="Major",
+        issue_type="Story",
+        reporter="dev",
+        created=datetime(2024, 1, day, tzinfo=timezone.utc),
+        updated=datetime(2024, 2, day, tzinfo=timezone.utc),
+        fix_versions=list(versions),
+        labels=list(labels),
+        url=f"https://jira.example.com/browse/DEV-{number}"
+    )
+
+
+def test_search_answers_common_jql_shapes(tmp_path):
+    """Test fixVersion/labels/status filters, ordering and the project restriction."""
+    index = JiraIndex(db_path=tmp_path / "jira.db")
+    index.upsert([
+        make_ticket(1, day=3, labels=("api",)),
+        make_ticket(2, status="In Progress", day=1, labels=("docs", "api")),
+        make_ticket(10, versions=("v2.2",), day=2),
+        make_ticket(3, day=2),
+    ])
+    
+    def keys(jql, **kwargs):
+        tickets = index.search(jql, ["DEV"], **kwargs)
+        return None if tickets is None else [t.key for t in tickets]
+    
+    assert keys('project = DEV AND fixVersion = "v2.1" ORDER BY created DESC') == ["DEV-1", "DEV-3", "DEV-2"]
+    assert keys('project = dev AND fixVersion = "v2.1"') == ["DEV-3", "DEV-2", "DEV-1"]
+    assert keys('project = DEV AND labels in (api, "docs") AND status != done ORDER BY key') == ["DEV-2"]
+    assert keys("project = DEV AND status in ('Done') ORDER BY key ASC", limit=2) == ["DEV-1", "DEV-3"]
+    assert keys('project = DEV AND fixVersion in ("v2.1", "v2.2") ORDER BY key DESC')[0] == "DEV-10"
+    
+    # Other projects, other fields and other operators go to live Jira
+    assert keys('fixVersion = "v2.1"') is None
+    assert keys('project = OPS AND fixVersion = "v2.1"') is None
+    assert keys('project = DEV AND summary ~ "login"') is None
+    assert keys('project = DEV OR labels = api') is None
+    assert keys('project = DEV AND fixVersion = EMPTY') is None
+    assert keys('project = DEV AND labels != api') is None
+    assert keys('project = DEV AND status = Done ORDER BY rank') is None
+
+
+def test_translate_jql_quoting():
+    """Test quoted values with separators and escapes, and malformed lists."""
+    where, params, order, projects = translate_jql(
+        'project in (DEV, OPS) AND fixVersion = "Release, \\"Q1\\" AND more" AND labels in ("a b", c)'
+    )
+    assert params == ["DEV", "OPS", "fixVersion", 'Release, "Q1" AND more', "label", "a b", "c"]
+    assert projects == {"DEV", "OPS"}
+    assert translate_jql("project = DEV AND labels in ()") is None
+    assert translate_jql("project = DEV AND") is None
+    assert translate_jql("project in DEV") is None
+
+
+def test_prune_and_watermark(tmp_path):
+    """Test that a full sync drops tickets it did not see and the watermark round-trips."""
+    index = JiraIndex(db_path=tmp_path / "jira.db")
+    index.upsert([make_ticket(1), make_ticket(2)])
+    
+    assert index.prune("DEV", ["DEV-2"]) == 1
+    assert index.stats() == {"DEV": 1}
+    
+    assert index.watermark("DEV") is None and index.last_synced("DEV") is None
+    started = datetime(2024, 3, 1, 12, 30, tzinfo=timezone.utc)
+    index.mark_synced("DEV", started)
+    assert index.watermark("DEV") == started
+    index.reset("DEV")
+    assert index.watermark("DEV") is None
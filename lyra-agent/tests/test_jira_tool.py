@@ -0,0 +1,221 @@
+"""
+JiraTool tests against an in-memory fake Jira client.
+"""
+from types import SimpleNamespace
+import threading
+import pytest
+
+pytest.importorskip("langchain")
+
+from jira import JIRAError
+from jira.client import ResultList
+from src.config.settings import settings
+from src.services.jira_index import JiraIndex
+from src.tools import jira_tool as jira_tool_module
+from src.tools.jira_tool import FIELD_PROFILES, JiraTool, field_profile
+
+
+def fake_issue(number: int) -> SimpleNamespace:
+    """An issue as the jira library returns it, with the fields JiraTool reads."""
+    fields = SimpleNamespace(
+        summary=f"Ticket {number}", description="", status=SimpleNamespace(name="Done"),
+        priority=None, issuetype=SimpleNamespace(name="Story"), assignee=None, reporter=None,
+        created="2024-01-01T00:00:00+00:00", updated="2024-01-02T00:00:00+00:00",
+        resolutiondate=None, fixVersions=[], components=[], labels=[], issuelinks=[]
+    )
+    return SimpleNamespace(id=str(number), key=f"DEV-{number}", fields=fields)
+
+
+class FakeJira:
+    """search_issues/enhanced_search_issues over a fixed list of issues."""
+    
+    def __init__(self, count: int, cloud: bool = False):
+        self.issues = [fake_issue(i) for i in range(count)]
+        self.deploymentType = "Cloud" if cloud else "Server"
+        self.requests = []
+        self.projections = []
+        self.queries = []
+        self.comments = {}
+        self.gate = threading.Event()
+        self.gate.set()
+    
+    def search_issues(self, jql, startAt=0, maxResults=50, validate_query=True, fields=None, expand=None):
+        self.requests.append(startAt)
+        self.queries.append(jql)
+        self.projections.append((fields, expand))
+        if startAt:
+            assert self.gate.wait(5)
+        page = self.issues[startAt:startAt + maxResults]
+        return ResultList(page, _startAt=startAt, _maxResults=maxResults, _total=len(self.issues))
+    
+    def enhanced_search_issues(self, jql, nextPageToken=None, maxResults=50, fields=None, expand=None):
+        start = int(nextPageToken or 0)
+        self.requests.append(start)
+        end = start + maxResults
+        token = str(end) if end < len(self.issues) else None
+        return ResultList(self.issues[start:end], _nextPageToken=token)
+    
+    def _get_json(self, path, params=None):
+        key = path.split("/")[1]
+        self.requests.append((key, params["startAt"]))
+        if key not in self.comments:
+            raise JIRAError("Issue does not exist", status_code=404)
+        comments = self.comments[key]
+        page = comments[params["startAt"]:params["startAt"] + params["maxResults"]]
+        return {"startAt": params["startAt"], "total": len(comments), "comments": page}
+    
+    def issue(self, key, fields=None, expand=None):
+        self.projections.append((fields, expand))
+        return self.issues[int(key.split("-")[1])]
+
+
+def test_iter_tickets_streams_first_page_and_fetches_rest_in_parallel(tmp_path, monkeypatch):
+    """Test that the first page is yielded while later pages are in flight, and the result is cached."""
+    monkeypatch.setattr(settings, "cache_dir", str(tmp_path))
+    tool = JiraTool()
+    tool.client = fake = FakeJira(250)
+    fake.gate.clear()
+    
+    stream = tool.iter_tickets("project = DEV", page_size=100)
+    first_page = [next(stream).key for _ in range(100)]
+    assert first_page[:2] == ["DEV-0", "DEV-1"]
+    assert sorted(fake.requests) == [0, 100, 200]  # later pages requested, still blocked
+    fake.gate.set()
+    rest = [ticket.key for ticket in stream]
+    
+    assert first_page + rest == [f"DEV-{i}" for i in range(250)]
+    fake.requests.clear()
+    assert len(tool.search_tickets("project = DEV", max_results=None)) == 250
+    assert len(list(tool.iter_tickets("project = DEV"))) == 250
+    assert fake.requests == []
+
+
+def test_search_tickets_limit_and_cloud_cursor_paging(tmp_path, monkeypatch):
+    """Test that limits only request the pages needed, also with Cloud cursor paging."""
+    monkeypatch.setattr(settings, "cache_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "jira_page_size", 20)
+    tool = JiraTool()
+    
+    tool.client = server = FakeJira(100)
+    assert [t.key for t in tool.search_tickets("a", max_results=30)] == [f"DEV-{i}" for i in range(30)]
+    assert sorted(server.requests) == [0, 20]
+    
+    tool.client = cloud = FakeJira(100, cloud=True)
+    assert len(tool.search_tickets("b", max_results=None)) == 100
+    assert cloud.requests == [0, 20, 40, 60, 80]
+
+
+def test_field_profiles_select_fields_and_cache_separately(tmp_path, monkeypatch):
+    """Test that profiles map to fields=/expand= and are part of the cache key."""
+    monkeypatch.setattr(settings, "cache_dir", str(tmp_path))
+    tool = JiraTool()
+    tool.client = fake = FakeJira(3)
+    
+    tool.search_tickets("a")
+    tool.get_ticket_details("DEV-1")
+    tool.get_ticket_details("DEV-1", profile="full")
+    tool.get_ticket_details("DEV-1", profile="release")  # cache hit
+    
+    assert fake.projections == [
+        (FIELD_PROFILES["summary"][0], None),
+        (FIELD_PROFILES["release"][0], None),
+        ("*all", None),
+    ]
+    assert "description" in FIELD_PROFILES["release"][0] and "comment" not in FIELD_PROFILES["release"][0]
+    with pytest.raises(ValueError):
+        field_profile("everything")
+
+
+def test_crawl_links_resolves_each_level_in_one_search(tmp_path, monkeypatch):
+    """Test breadth-first crawling with batched key searches, limits and per-ticket caching."""
+    monkeypatch.setattr(settings, "cache_dir", str(tmp_path))
+    tool = JiraTool()
+    tool.client = fake = FakeJira(40)
+    # DEV-0 links to DEV-1..3, each of those to four more (one link back to DEV-0)
+    links = {0: [1, 2, 3], 1: [0, 4, 5, 6], 2: [7, 8, 9, 99], 3: [10, 11, 12, 4]}
+    for number, targets in links.items():
+        fake.issues[number].fields.issuelinks = [
+            SimpleNamespace(outwardIssue=SimpleNamespace(key=f"DEV-{target}")) for target in targets
+        ]
+    
+    def search_issues(jql, **kwargs):
+        keys = jql[len("key in ("):-1].split(", ")
+        fake.requests.append(keys)
+        assert kwargs["validate_query"] is False
+        found = [fake.issues[int(k.split("-")[1])] for k in keys if int(k.split("-")[1]) < len(fake.issues)]
+        return ResultList(found, _startAt=0, _maxResults=len(found), _total=len(found))
+    fake.search_issues = search_issues
+    
+    crawled = [t.key for t in tool.crawl_links(["DEV-0"], depth=2)]
+    assert crawled == ["DEV-0", "DEV-1", "DEV-2", "DEV-3"] + [f"DEV-{i}" for i in (4, 5, 6, 7, 8, 9, 10, 11, 12)]
+    assert [len(keys) for keys in fake.requests] == [1, 3, 10]  # DEV-99 requested once, missing
+    
+    fake.requests.clear()
+    assert tool.get_ticket_details("DEV-7", profile="summary").key == "DEV-7"
+    assert [t.key for t in tool.crawl_links(["DEV-0"], depth=1, max_nodes=3)] == ["DEV-0", "DEV-1", "DEV-2"]
+    assert [t.key for t in tool.follow_linked_issues("DEV-2")] == ["DEV-7", "DEV-8", "DEV-9"]
+    assert fake.requests == []
+
+
+def test_sync_mirror_and_answer_searches_from_it(tmp_path, monkeypatch):
+    """Test full then incremental syncs, and that translatable searches skip Jira."""
+    monkeypatch.setattr(settings, "cache_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "project_key", "DEV")
+    monkeypatch.setattr(settings, "jira_index_enabled", True)
+    monkeypatch.setattr(jira_tool_module, "jira_index", JiraIndex(tmp_path / "jira.db"))
+    tool = JiraTool()
+    tool.client = fake = FakeJira(5)
+    fake.issues[1].fields.description = "Details"
+    fake.issues[1].fields.fixVersions = [SimpleNamespace(name="v2.1")]
+    
+    # Never synced: searches go to Jira, the first sync is left to `lyra sync jira`
+    tool.search_tickets('project = DEV AND fixVersion = "v2.1"', max_results=10)
+    assert fake.queries == ['project = DEV AND fixVersion = "v2.1"']
+    
+    fake.queries.clear()
+    fake.projections.clear()
+    assert tool.sync_jira_index() == 5
+    assert fake.queries == ['project = "DEV" ORDER BY updated ASC']
+    assert fake.projections[0] == (FIELD_PROFILES["release"][0] + ",comment", None)
+    
+    fake.queries.clear()
+    assert tool.sync_jira_index() == 5
+    assert 'AND updated >= "-6m"' in fake.queries[0]
+    
+    fake.queries.clear()
+    release = tool.search_tickets('project = DEV AND fixVersion = "v2.1" ORDER BY created DESC')
+    assert [t.key for t in release] == ["DEV-1"] and release[0].description == ""
+    assert tool.search_tickets('project = DEV AND fixVersion = "v2.1"', profile="release")[0].description == "Details"
+    assert [t.key for t in tool.iter_tickets_for_release("v2.1")] == ["DEV-1"]
+    assert fake.queries == []
+    
+    tool.search_tickets('project = DEV AND summary ~ "ticket"')
+    assert fake.queries == ['project = DEV AND summary ~ "ticket"']
+
+
+def test_load_comments_pages_and_caches_per_ticket(tmp_path, monkeypatch):
+    """Test bulk comment loading: paging, missing tickets and a separate per-ticket cache."""
+    monkeypatch.setattr(settings, "cache_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "jira_comment_page_size", 100)
+    tool = JiraTool()
+    tool.client = fake = FakeJira(3)
+    fake.comments = {
+        "DEV-1": [
+            {"id": str(i), "author": {"displayName": "dev"}, "body": f"Comment {i}",
+             "created": "2024-01-01T00:00:00.000+0000", "updated": None}
+            for i in range(250)
+        ],
+        "DEV-2": [],
+    }
+    
+    comments = tool.load_comments(["DEV-1", "DEV-2", "DEV-99"])
+    executor = tool._comment_executor
+    assert list(comments) == ["DEV-1", "DEV-2"]
+    assert [c.body for c in comments["DEV-1"]][::100] == ["Comment 0", "Comment 100", "Comment 200"]
+    assert sorted(fake.requests) == [("DEV-1", 0), ("DEV-1", 100), ("DEV-1", 200), ("DEV-2", 0), ("DEV-99", 0)]
+    
+    fake.requests.clear()
+    ticket = tool.with_comments(tool.get_ticket_details("DEV-1"))
+    assert len(ticket.comments) == 250 and tool.get_ticket_details("DEV-1").comments == []
+    assert tool.load_comments(["DEV-2", "DEV-99"]) == {"DEV-2": []}
+    assert fake.requests == [] and tool._comment_executor is executor
@@ -0,0 +1,62 @@
+"""
+PR diff summary tests.
+"""
+from types import SimpleNamespace
+from src.config.settings import settings
+from src.services.pr_diff import format_pr_diff, is_public_api, summarize_files
+
+
+def changed_file(path: str, additions: int = 1, deletions: int = 0, patch: str = "@@ -1 +1 @@\n+x"):
+    """A stand-in for PyGithub's File."""
+    return SimpleNamespace(filename=path, status="modified", additions=additions, deletions=deletions, patch=patch)
+
+
+def test_stats_and_public_api_hunks(monkeypatch):
+    """Test per-directory/extension stats and that only public-API patches are kept, capped."""
+    monkeypatch.setattr(settings, "pr_diff_max_hunk_bytes", 10)
+    files = [
+        changed_file("src/api/users.py", 10, 2, patch="+def get_user(id):" * 3),
+        changed_file("src/api/v2/orders.py", 5, 1),
+        changed_file("src/core/db.py", 3, 3),
+        changed_file("README", 1, 0),
+    ]
+    
+    diff = summarize_files(files, "org/app", 7, files_total=4, additions=19, deletions=6)
+    
+    assert (diff.files_inspected, diff.truncated) == (4, False)
+    assert diff.by_directory["src/api"].model_dump() == {"files": 2, "additions": 15, "deletions": 3}
+    assert diff.by_directory["."].files == 1
+    assert diff.by_extension[".py"].additions == 18 and diff.by_extension["(none)"].files == 1
+    assert [h.path for h in diff.api_hunks] == ["src/api/users.py", "src/api/v2/orders.py"]
+    assert diff.api_hunks[0].truncated and len(diff.api_hunks[0].patch) == 10
+    
+    text = format_pr_diff(diff)
+    assert text.startswith("Files: 4 of 4 inspected, +19/-6 lines in total")
+    assert "--- src/api/users.py (modified)" in text
+
+
+def test_budgets_stop_iteration():
+    """Test that file and byte budgets stop consuming the (lazy) file stream."""
+    consumed = []
+    
+    def stream():
+        for i in range(1000):
+            consumed.append(i)
+            yield changed_file(f"pkg/f{i}.go", patch="x" * 100)
+    
+    diff = summarize_files(stream(), "org/app", 1, files_total=1000, additions=1000, deletions=0, max_files=50)
+    assert (diff.files_inspected, diff.truncated, len(consumed)) == (50, True, 50)
+    
+    consumed.clear()
+    diff = summarize_files(stream(), "org/app", 1, files_total=1000, additions=1000, deletions=0, max_bytes=1000)
+    assert (diff.files_inspected, diff.truncated) == (10, True)
+    assert diff.additions == 1000  # totals cover the whole PR
+
+
+def test_public_api_patterns():
+    """Test the default public-API globs."""
+    assert is_public_api("proto/user.proto")
+    assert is_public_api("web/types/index.d.ts")
+    assert is_public_api("lyra/__init__.py")
+    assert not is_public_api("src/core/db.py")
+    assert is_public_api("src/core/db.py", patterns=["src/core/*"])
@@ -0,0 +1,88 @@
+"""
+Local PR index tests.
+"""
+from datetime import datetime, timezone
+from src.schemas.data_models import GitHubPR
+from src.services.pr_index import PRIndex
+
+
+def make_pr(
+    number: int,
+    title: str,
+    state: str = "closed",
+    day: int = 1,
+    repo: str = "org/app",
+    linked: tuple = ()
+) -> GitHubPR:
+    """Build a minimal GitHubPR."""
+    return GitHubPR(
+        id=number,
+        number=number,
+        title=title,
+        body=f"Body of PR {number}",
+        state=state,
+        author="dev",
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        updated_at=datetime(2024, 1, day, tzinfo=timezone.utc),
+        base_branch="main",
+        head_branch=f"branch-{number}",
+        files_changed=1,
+        additions=1,
+        deletions=0,
+        labels=["backend"],
+        linked_issues=list(linked),
+        url=f"https://github.com/{repo}/pull/{number}"
+    )
+
+
+def test_search_matches_ticket_keys_as_phrases(tmp_path):
+    """Test that searches match whole ticket keys, filter by repo/state and sort by update time."""
+    index = PRIndex(db_path=tmp_path / "prs.db")
+    index.upsert("org/app", [
+        make_pr(1, "DEV-12 fix login", day=2),
+        make_pr(2, "DEV-123 add export", day=3),
+        make_pr(3, "Refactor (DEV-12)", state="open", day=4),
+    ])
+    index.upsert("org/other", [make_pr(4, "DEV-12 docs", repo="org/other")])
+    
+    assert [pr.number for pr in index.search("DEV-12", ["org/app"])] == [3, 1]
+    assert [pr.number for pr in index.search("DEV-12", ["org/app"], state="closed")] == [1]
+    assert [pr.number for pr in index.search("dev-12", ["org/app", "org/other"], limit=2)] == [3, 1]
+    assert [pr.number for pr in index.search("backend", ["org/other"])] == [4]
+    assert index.search('quote " query', ["org/app"]) == []
+
+
+def test_upsert_replaces_indexed_text_and_tracks_watermark(tmp_path):
+    """Test that re-synced PRs replace their old text and the watermark round-trips."""
+    index = PRIndex(db_path=tmp_path / "prs.db")
+    index.upsert("org/app", [make_pr(1, "DEV-1 first title")])
+    index.upsert("org/app", [make_pr(1, "DEV-2 second title", day=5)])
+    
+    assert index.search("DEV-1", ["org/app"]) == []
+    assert index.search("DEV-2", ["org/app"])[0].updated_at.day == 5
+    assert index.stats() == {"org/app": 1}
+    
+    assert index.last_synced("org/app") is None
+    watermark = datetime(2024, 1, 5, tzinfo=timezone.utc)
+    index.mark_synced("org/app", watermark)
+    assert index.watermark("org/app") == watermark
+    
+    index.reset("org/app")
+    assert index.watermark("org/app") is None
+
+
+def test_ticket_links_bulk_lookup(tmp_path):
+    """Test that ticket-to-PR links follow PR updates and resolve in bulk."""
+    index = PRIndex(db_path=tmp_path / "prs.db")
+    index.upsert("org/app", [
+        make_pr(1, "a", linked=("DEV-1",), day=2),
+        make_pr(2, "b", linked=("DEV-1", "DEV-2"), day=3),
+    ])
+    index.upsert("org/other", [make_pr(3, "c", linked=("DEV-2",), repo="org/other")])
+    index.upsert("org/app", [make_pr(1, "a", linked=("DEV-3",), day=4)])  # PR 1 relinked
+    
+    found = index.prs_for_tickets(["DEV-1", "DEV-2", "DEV-3", "DEV-9"])
+    assert {t: [pr.number for pr in prs] for t, prs in found.items()} == {
+        "DEV-1": [2], "DEV-2": [2, 3], "DEV-3": [1], "DEV-9": []
+    }
+    assert [pr.number for pr in index.prs_for_tickets(["DEV-2"], repos=["org/other"])["DEV-2"]] == [3]
@@ -0,0 +1,102 @@
+"""
+GitHub rate-limit scheduler tests (no network access).
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+import requests
+from src.utils.rate_limit import (
+    BACKGROUND, RateLimitScheduler, RateLimitedAdapter, request_priority
+)
+
+
+def headers(remaining: int, limit: int = 5000, reset_in: float = 3600, resource: str = "core") -> dict:
+    """Build GitHub rate-limit response headers."""
+    return {
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(int(time.time() + reset_in)),
+        "X-RateLimit-Resource": resource,
+    }
+
+
+def test_budget_tracking_and_background_reserve():
+    """Test that quota use is counted and background calls keep off the interactive reserve."""
+    scheduler = RateLimitScheduler(burst=5, background_reserve=0.2)
+    scheduler.observe("core", 200, headers(4990))
+    scheduler.observe("core", 200, headers(4985))
+    scheduler.observe("search", 200, headers(29, limit=30, resource="search"))
+    
+    report = scheduler.report()
+    assert report["resources"]["core"]["used"] == 6
+    assert report["resources"]["core"]["remaining"] == 4985
+    assert report["resources"]["search"]["used"] == 1
+    
+    # Below the reserve: interactive calls go through, background calls wait for the reset
+    scheduler.observe("core", 200, headers(900))
+    now = time.time()
+    assert scheduler._delay("core", 0, now) == 0
+    assert scheduler._delay("core", BACKGROUND, now) > 3000
+
+
+def test_token_bucket_paces_after_burst():
+    """Test that pacing only starts once the burn rate would exhaust the quota before reset."""
+    scheduler = RateLimitScheduler(burst=2)
+    scheduler.observe("core", 200, headers(4999, limit=5000, reset_in=3600))
+    now = time.time()
+    assert [scheduler._delay("core", 0, now) for _ in range(50)] == [0] * 50
+    
+    scheduler.observe("search", 200, headers(10, limit=10, reset_in=100, resource="search"))
+    delays = [scheduler._delay("search", 0, now) for _ in range(6)]
+    # Unpaced until the burn rate outruns what is left, then the bucket runs dry and requests wait
+    assert delays[:5] == [0] * 5 and delays[5] > 5
+
+
+def test_rate_limit_responses_block_until_reset():
+    """Test primary, secondary and Retry-After limits, and that plain 403s are not retried."""
+    scheduler = RateLimitScheduler(max_wait=120)
+    
+    assert scheduler.observe("core", 403, {"content-type": "application/json"}, b"Resource not accessible") == 0
+    assert scheduler.observe("search", 429, {"Retry-After": "7"}) == 7
+    assert 50 < scheduler.observe("core", 403, headers(0, reset_in=60)) <= 61
+    assert scheduler.observe("graphql", 403, {}, b'{"message": "You have exceeded a secondary rate limit"}') == 60
+    assert scheduler.observe("core", 403, headers(0, reset_in=7200)) == 0  # longer than max_wait
+    
+    assert scheduler._delay("search", 0, time.time()) > 5
+    assert scheduler.report()["rate_limited"] == 4
+
+
+def test_adapter_sleeps_and_retries_on_429():
+    """Test that a rate-limited request is retried after Retry-After instead of failing."""
+    calls = []
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            calls.append(time.monotonic())
+            status = 429 if len(calls) == 1 else 200
+            self.send_response(status)
+            if status == 429:
+                self.send_header("Retry-After", "1")
+            for name, value in headers(4999 - len(calls)).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        scheduler = RateLimitScheduler()
+        session = requests.Session()
+        session.mount("http://", RateLimitedAdapter(scheduler))
+        with request_priority(BACKGROUND):
+            response = session.get(f"http://127.0.0.1:{server.server_port}/repos/org/app")
+    finally:
+        server.shutdown()
+    
+    assert response.status_code == 200
+    assert len(calls) == 2 and calls[1] - calls[0] >= 0.9
+    assert scheduler.report()["resources"]["core"]["used"] == 2
@@ -0,0 +1,155 @@
+"""
+Release knowledge pipeline tests, with fake Jira/GitHub tools and LLM.
+"""
+from datetime import datetime, timezone
+from types import SimpleNamespace
+import json
+import threading
+import time
+import pytest
+
+pytest.importorskip("langchain")
+pytest.importorskip("langchain_mistralai")
+
+from src.cache.backends import SQLiteCacheBackend
+from src.cache.distillations import DistillationCache
+from src.config.settings import settings
+from src.schemas.data_models import GitHubPR, JiraTicket
+from src.tools import smart_tools
+from src.tools.smart_tools import SmartToolOrchestrator
+
+
+def make_ticket(number: int) -> JiraTicket:
+    return JiraTicket(
+        id=str(number), key=f"DEV-{number}", summary=f"Ticket {number}", status="Done",
+        priority="Major", issue_type="Story", reporter="dev",
+        created=datetime(2024, 1, 1, tzinfo=timezone.utc), updated=datetime(2024, 1, 2, tzinfo=timezone.utc),
+        url=f"https://jira.example.com/browse/DEV-{number}"
+    )
+
+
+def make_pr(number: int) -> GitHubPR:
+    return GitHubPR(
+        id=number, number=number, title=f"PR {number}", state="closed", author="dev",
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc), updated_at=datetime(2024, 1, 2, tzinfo=timezone.utc),
+        base_branch="main", head_branch="feature", files_changed=1, additions=1, deletions=0,
+        url=f"https://github.com/org/app/pull/{number}"
+    )
+
+
+class FakeLLM:
+    """Answers from the ticket/PR number in the prompt, after a delay; tracks concurrency."""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+        self.calls = 0
+    
+    def invoke(self, prompt: str):
+        with self.lock:
+            self.calls += 1
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(0.02)
+        with self.lock:
+            self.running -= 1
+        if prompt.startswith("You are analyzing a Jira ticket"):
+            number = int(prompt.split("Ticket: DEV-")[1].split(" ")[0])
+            answer = {
+                "decision": f"Decision {number}", "rationale": "Because", "decided_by": "dev",
+                "is_doc_worthy": number % 3 != 2, "category": ["feature", "bugfix", "improvement"][number % 3],
+                "confidence": 0.9
+            }
+        else:
+            number = int(prompt.split("PR #")[1].split(":")[0])
+            answer = {"impact": f"Impact {number}", "is_breaking": number == 7, "is_doc_worthy": True, "confidence": 0.8}
+        return SimpleNamespace(content=json.dumps(answer))
+
+
+@pytest.fixture
+def fake_tools(tmp_path, monkeypatch):
+    """
+    Replace the Jira/GitHub calls of the pipeline with fakes. Tickets 0-19; every ticket links PRs n and 7.
+    
+    Returns the ticket keys passed to PR lookups.
+    """
+    monkeypatch.setattr(settings, "distill_cache_enabled", False)
+    backend = SQLiteCacheBackend("distillations", db_path=tmp_path / "cache.db")
+    monkeypatch.setattr(smart_tools, "distillation_cache", DistillationCache(backend=backend))
+    jira, github = smart_tools.jira_tool, smart_tools.github_tool
+    monkeypatch.setattr(jira, "iter_tickets_for_release", lambda version: iter(make_ticket(i) for i in range(20)))
+    monkeypatch.setattr(jira, "get_ticket_details", lambda key, profile="release": make_ticket(int(key.split("-")[1])))
+    monkeypatch.setattr(jira, "with_comments", lambda ticket: ticket)
+    lookups = []
+    
+    def find_prs_for_tickets(keys):
+        lookups.extend(keys)
+        return {key: [make_pr(int(key.split("-")[1]) + 100), make_pr(7)] for key in keys}
+    monkeypatch.setattr(github, "find_prs_for_tickets", find_prs_for_tickets)
+    monkeypatch.setattr(github, "get_pr_details_many", lambda refs: {})
+    monkeypatch.setattr(github, "get_pr_details", lambda repo, number: make_pr(number))
+    monkeypatch.setattr(github, "get_pr_diff", lambda repo, number: (_ for _ in ()).throw(RuntimeError("no diff")))
+    return lookups
+
+
+def release_knowledge(monkeypatch, api_workers: int, llm_workers: int):
+    monkeypatch.setattr(settings, "distill_api_workers", api_workers)
+    monkeypatch.setattr(settings, "distill_llm_workers", llm_workers)
+    orchestrator = SmartToolOrchestrator()
+    orchestrator.llm = FakeLLM()
+    started = time.monotonic()
+    knowledge = orchestrator.get_release_knowledge("v2.1", "Lyra")
+    return knowledge, orchestrator.llm, time.monotonic() - started
+
+
+def test_parallel_pipeline_matches_sequential_run(fake_tools, monkeypatch):
+    """Test that the concurrent pipeline gives the sequential result within its LLM limit."""
+    sequential, sequential_llm, sequential_s = release_knowledge(monkeypatch, 1, 1)
+    parallel, parallel_llm, parallel_s = release_knowledge(monkeypatch, 4, 4)
+    
+    assert parallel == sequential
+    assert (sequential_llm.peak, parallel_llm.peak) == (1, 4)
+    assert parallel_s < sequential_s / 2
+    assert [entry["ticket"] for entry in parallel["features"]] == [f"DEV-{i}" for i in range(0, 20, 3)]
+    assert parallel["total_tickets"] == 20 and len(parallel["breaking_changes"]) == 14
+    # PRs are only looked up for the 14 doc-worthy tickets
+    assert sorted(fake_tools) == sorted([f"DEV-{i}" for i in range(20) if i % 3 != 2] * 2)
+
+
+def test_unchanged_tickets_and_prs_reuse_cached_verdicts(fake_tools, monkeypatch):
+    """Test that a re-run only calls the LLM for items whose prompt input changed."""
+    monkeypatch.setattr(settings, "distill_cache_enabled", True)
+    first, first_llm, _ = release_knowledge(monkeypatch, 4, 4)
+    assert first_llm.calls == 20 + 14 + 1  # tickets, their own PRs, shared PR 7
+    
+    again, again_llm, _ = release_knowledge(monkeypatch, 4, 4)
+    assert again == first and again_llm.calls == 0
+    
+    def late_edit(key, profile="release"):
+        ticket = make_ticket(int(key.split("-")[1]))
+        return ticket.model_copy(update={"description": "Late change"}) if key == "DEV-4" else ticket
+    monkeypatch.setattr(smart_tools.jira_tool, "get_ticket_details", late_edit)
+    _, edited_llm, _ = release_knowledge(monkeypatch, 4, 4)
+    assert edited_llm.calls == 1
+    
+    monkeypatch.setattr(settings, "mistral_model", "another-model")
+    _, other_model_llm, _ = release_knowledge(monkeypatch, 4, 4)
+    assert other_model_llm.calls == first_llm.calls
+
+
+def test_incomplete_verdicts_are_not_cached(fake_tools, monkeypatch):
+    """Test that verdicts without their required keys are failures, retried on the next run."""
+    monkeypatch.setattr(settings, "distill_cache_enabled", True)
+    orchestrator = SmartToolOrchestrator()
+    answers = [{"impact": "No breaking flag"}, ["not", "an", "object"], {"impact": "Complete", "is_breaking": False}]
+    
+    def invoke(prompt):
+        return SimpleNamespace(content=json.dumps(answers.pop(0)))
+    orchestrator.llm = SimpleNamespace(invoke=invoke)
+    
+    assert orchestrator.distill_pr_impact("org/app", 1)["impact"] == "Error processing PR 1"
+    assert orchestrator.distill_pr_impact("org/app", 1)["impact"] == "Error processing PR 1"
+    assert orchestrator.distill_pr_impact("org/app", 1)["impact"] == "Complete"
+    assert orchestrator.distill_pr_impact("org/app", 1)["impact"] == "Complete"  # cached, no answer left
+    assert answers == []